@@ -0,0 +1,206 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import math
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+
+from django.conf import settings
+
+from bazis.contrib.async_background.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionError(Exception):
+    """The task was rejected without trying to enqueue it; retry after `retry_after_sec`."""
+
+    status_code = 503
+    code = "ERR_UNAVAILABLE"
+
+    def __init__(self, message: str, retry_after_sec: float) -> None:
+        super().__init__(message)
+        self.retry_after_sec = retry_after_sec
+
+    def to_http_exception(self):
+        """The JSON API error of the rejection, with the Retry-After header."""
+        from bazis.core.errors import JsonApiHttpException
+
+        return JsonApiHttpException(
+            status_code=self.status_code,
+            detail=str(self),
+            code=self.code,
+            headers={"Retry-After": str(max(1, math.ceil(self.retry_after_sec)))},
+        )
+
+
+class OverloadedError(AdmissionError):
+    """The process already enqueues the maximum number of tasks."""
+
+    status_code = 429
+    code = "ERR_TOO_MANY_REQUESTS"
+
+
+class CircuitOpenError(AdmissionError):
+    """Kafka or Redis has been failing or slow: calls are not attempted until the circuit is reset."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive calls failed or took longer than `slow_call_sec`,
+    rejecting calls for `reset_sec`. Then a single probe call is let through: its success closes
+    the circuit, its failure opens it again. Shared by all event loops of the process.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, slow_call_sec: float, reset_sec: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_sec = slow_call_sec
+        self.reset_sec = reset_sec
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        metrics.set_gauge("async_bg_circuit_open", 0, name=name)
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def check(self) -> None:
+        """Raises CircuitOpenError if a call would be rejected now."""
+        with self._lock:
+            self._check()
+
+    def before_call(self) -> None:
+        """Raises CircuitOpenError if the call must not be attempted, otherwise lets it through."""
+        with self._lock:
+            self._check()
+            if self._opened_at is not None:
+                self._probing = True
+
+    def _check(self) -> None:
+        if self._opened_at is None:
+            return
+        retry_after_sec = self._opened_at + self.reset_sec - time.monotonic()
+        if retry_after_sec > 0 or self._probing:
+            metrics.inc("async_bg_enqueue_rejected_total", reason=f"{self.name}_circuit_open")
+            raise CircuitOpenError(f"{self.name} circuit is open", max(retry_after_sec, 0))
+
+    def after_call(self, duration_sec: float, failed: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if not failed and duration_sec <= self.slow_call_sec:
+                if self._opened_at is not None:
+                    logger.info("%s circuit is closed", self.name)
+                self._failures = 0
+                self._opened_at = None
+                metrics.set_gauge("async_bg_circuit_open", 0, name=self.name)
+                return
+            self._failures += 1
+            metrics.inc("async_bg_circuit_failed_calls_total", name=self.name)
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        "%s circuit is open after %s failed or slow calls", self.name, self._failures
+                    )
+                self._opened_at = time.monotonic()
+                metrics.set_gauge("async_bg_circuit_open", 1, name=self.name)
+
+    def abandon_call(self) -> None:
+        """The call let through by `before_call` will not be made: another call may probe."""
+        with self._lock:
+            self._probing = False
+
+    @asynccontextmanager
+    async def guard(self, admitted: bool = False) -> AsyncIterator[None]:
+        """Runs the enclosed call through the breaker; `admitted` if `before_call` was done already."""
+        if not admitted:
+            self.before_call()
+        started = time.monotonic()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.after_call(time.monotonic() - started, failed)
+
+
+class InFlightLimiter:
+    """Limits the number of tasks enqueued at once by the process, across all event loops."""
+
+    def __init__(self, limit: int, retry_after_sec: float) -> None:
+        self.limit = limit
+        self.retry_after_sec = retry_after_sec
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        with self._lock:
+            if self._in_flight >= self.limit:
+                metrics.inc("async_bg_enqueue_rejected_total", reason="in_flight_limit")
+                raise OverloadedError(
+                    f"Too many tasks are being enqueued ({self._in_flight})", self.retry_after_sec
+                )
+            self._in_flight += 1
+            metrics.set_gauge("async_bg_enqueue_in_flight", self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                metrics.set_gauge("async_bg_enqueue_in_flight", self._in_flight)
+
+
+def _build_breaker(name: str) -> CircuitBreaker | None:
+    if settings.KAFKA_BREAKER_FAILURE_THRESHOLD is None:
+        return None
+    return CircuitBreaker(
+        name,
+        settings.KAFKA_BREAKER_FAILURE_THRESHOLD,
+        settings.KAFKA_BREAKER_SLOW_CALL_SEC,
+        settings.KAFKA_BREAKER_RESET_SEC,
+    )
+
+
+in_flight_limiter = (
+    InFlightLimiter(settings.KAFKA_ENQUEUE_MAX_IN_FLIGHT, settings.KAFKA_ENQUEUE_RETRY_AFTER_SEC)
+    if settings.KAFKA_ENQUEUE_MAX_IN_FLIGHT
+    else None
+)
+kafka_breaker = _build_breaker("kafka")
+redis_breaker = _build_breaker("redis")
+
+
+def guarded(breaker: CircuitBreaker | None, admitted: bool = False) -> AbstractAsyncContextManager[None]:
+    """Runs the enclosed call through the breaker, if it is enabled."""
+    return breaker.guard(admitted) if breaker is not None else nullcontext()
+
+
+@asynccontextmanager
+async def admit_enqueue() -> AsyncIterator[None]:
+    """Admits an enqueue: fails fast above the in-flight limit or while a circuit is open."""
+    for breaker in (kafka_breaker, redis_breaker):
+        if breaker is not None:
+            breaker.check()
+    if in_flight_limiter is None:
+        yield
+        return
+    async with in_flight_limiter.admit():
+        yield
@@ -0,0 +1,95 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+from bazis.contrib.async_background.registry import loop_clients
+
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_TIMEOUT_SEC = 5
+
+
+class BackgroundLoop:
+    """
+    An event loop running in a daemon thread, shared by the whole process: sync code (WSGI
+    views, admin actions, management commands) submits coroutines to it instead of spinning a
+    loop per call, so all threads share the loop's Kafka and Redis connections.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+        logger.debug("Started background event loop %s", self.name)
+        return loop
+
+    def submit[Result](self, coro: Coroutine[Any, Any, Result]) -> Future[Result]:
+        """Schedules the coroutine on the loop, starting the loop thread on first use."""
+        loop = self._loop
+        if loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._loop = self._start()
+                loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def stop(self) -> None:
+        """Closes the clients of the loop and stops its thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(loop_clients.aclose(), loop).result(SHUTDOWN_TIMEOUT_SEC)
+        except Exception:
+            logger.warning("Failed to close clients of background loop %s", self.name, exc_info=True)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(SHUTDOWN_TIMEOUT_SEC)
+        if not thread.is_alive():
+            loop.close()
+
+    def _forget(self) -> None:
+        # A forked child inherits the loop object but not the thread running it
+        self._lock = threading.Lock()
+        self._loop = self._thread = None
+
+
+producer_loop = BackgroundLoop("async-background-producer")
+
+atexit.register(producer_loop.stop)
+os.register_at_fork(after_in_child=producer_loop._forget)
@@ -0,0 +1,103 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import logging
+import sys
+import time
+from importlib.machinery import (
+    ExtensionFileLoader,
+    ModuleSpec,
+    SourceFileLoader,
+    SourcelessFileLoader,
+)
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+#: loaders created per module: their `exec_module` can be timed without affecting other modules
+_TIMED_LOADERS = (SourceFileLoader, SourcelessFileLoader, ExtensionFileLoader)
+
+
+def bootstrap_consumer(slim: bool) -> None:
+    """
+    Imports what the consumer needs before it subscribes: the task modules of KAFKA_TASKS and,
+    unless `slim`, the whole API application (routes, schemas) for task modules relying on it.
+    """
+    if not slim:
+        from bazis.core.app import app  # noqa: F401
+        from bazis.core.router import router  # noqa: F401
+
+    for task_path in settings.KAFKA_TASKS:
+        importlib.import_module(task_path)
+
+
+class ImportProfiler:
+    """
+    Measures the time modules take to import while it is active: the total time of a module
+    includes the modules it imports, the self time does not. Modules imported before are not
+    measured, neither are built-in and frozen ones.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, tuple[float, float]] = {}
+        self.elapsed = 0.0
+        self._children: list[float] = []
+        self._started = 0.0
+
+    def __enter__(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed = time.perf_counter() - self._started
+        sys.meta_path.remove(self)
+
+    def find_spec(self, fullname: str, path, target=None) -> ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if isinstance(spec.loader, _TIMED_LOADERS):
+            spec.loader.exec_module = self._timed(fullname, spec.loader.exec_module)
+        return spec
+
+    def _timed(self, fullname: str, exec_module):
+        def timed_exec_module(module) -> None:
+            self._children.append(0.0)
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                total = time.perf_counter() - started
+                self.timings[fullname] = (total, total - self._children.pop())
+                if self._children:
+                    self._children[-1] += total
+
+        return timed_exec_module
+
+    def report(self, limit: int | None = None) -> list[str]:
+        """Report lines of the modules slowest to import by self time, the total time first."""
+        lines = [f"Imported {len(self.timings)} modules in {self.elapsed:.3f}s", f"{'self':>9} {'total':>9}  module"]
+        ranked = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (total, own) in ranked[:limit or None]:
+            lines.append(f"{own:>8.3f}s {total:>8.3f}s  {name}")
+        return lines
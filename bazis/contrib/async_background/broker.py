@@ -18,27 +18,62 @@ from contextlib import asynccontextmanager
 
 from django.conf import settings
 
+from aiokafka import AIOKafkaProducer
 from faststream import FastStream
 from faststream.kafka import KafkaBroker
 
+from bazis.contrib.async_background.loop_monitor import start_loop_monitor
+from bazis.contrib.async_background.metrics import start_metrics_log
+from bazis.contrib.async_background.offsets import close_offset_committers
+from bazis.contrib.async_background.profiling import profile_running_loop
+from bazis.contrib.async_background.registry import loop_clients
+
 
-_brokers_by_loop_id: dict[int, KafkaBroker] = {}
 _consumer_broker: KafkaBroker | None = None
 
 
 def _new_broker() -> KafkaBroker:
-    return KafkaBroker(settings.KAFKA_BOOTSTRAP_SERVERS)
+    return KafkaBroker(settings.KAFKA_BOOTSTRAP_SERVERS, linger_ms=settings.KAFKA_PRODUCER_LINGER_MS)
+
+
+async def _close_broker(broker: KafkaBroker) -> None:
+    await broker.close()
+
+
+async def _cancel_start(start: asyncio.Future) -> None:
+    start.cancel()
 
 
 def get_broker_for_async() -> KafkaBroker:
-    loop_id = id(asyncio.get_running_loop())
-    broker = _brokers_by_loop_id.get(loop_id)
-    if broker is None:
-        broker = _new_broker()
-        _brokers_by_loop_id[loop_id] = broker
+    """The producer broker of the running event loop (not necessarily connected yet)."""
+    return loop_clients.get("kafka_broker", _new_broker, closer=_close_broker)
+
+
+async def start_broker_for_async() -> KafkaBroker:
+    """The producer broker of the running event loop, connected once by the first caller."""
+    broker = get_broker_for_async()
+    start = loop_clients.get(
+        "kafka_broker_start", lambda: asyncio.ensure_future(broker.start()), closer=_cancel_start
+    )
+    try:
+        # Concurrent callers share one connection attempt; a cancelled caller does not cancel it
+        await asyncio.shield(start)
+    except Exception:
+        loop_clients.discard("kafka_broker_start", start)
+        raise
     return broker
 
 
+def get_aiokafka_producer(broker: KafkaBroker) -> AIOKafkaProducer | None:
+    """
+    The aiokafka producer of a connected broker, for what FastStream does not expose (the topic
+    metadata). The only place relying on FastStream internals (`KafkaBroker._producer._producer`
+    of FastStream 0.5); None if the broker is not connected or the internals have changed.
+    """
+    producer = getattr(getattr(broker, "_producer", None), "_producer", None)
+    return producer if isinstance(producer, AIOKafkaProducer) else None
+
+
 def get_broker_for_consumer() -> KafkaBroker:
     global _consumer_broker
     if _consumer_broker is None:
@@ -48,6 +83,9 @@ def get_broker_for_consumer() -> KafkaBroker:
 
 @asynccontextmanager
 async def lifespan_handler(app: FastStream | None = None):
+    loop_monitor = start_loop_monitor()
+    metrics_log = start_metrics_log(settings.KAFKA_METRICS_LOG_INTERVAL_SEC)
+    profile_running_loop()
     stop_task = asyncio.create_task(
         asyncio.sleep(
             settings.KAFKA_CONSUMER_LIFETIME_SEC +
@@ -56,7 +94,14 @@ async def lifespan_handler(app: FastStream | None = None):
     )
     yield
     stop_task.cancel()
+    if loop_monitor is not None:
+        loop_monitor.stop()
+    if metrics_log is not None:
+        metrics_log.cancel()
 
 
 def build_app() -> FastStream:
-    return FastStream(get_broker_for_consumer(), lifespan=lifespan_handler)
+    # Offsets are flushed before the subscribers and their Kafka consumers stop
+    return FastStream(
+        get_broker_for_consumer(), lifespan=lifespan_handler, on_shutdown=[close_offset_committers]
+    )
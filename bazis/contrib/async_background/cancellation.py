@@ -0,0 +1,149 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable
+
+from django.conf import settings
+
+from bazis.contrib.async_background.context import current_task_id
+from bazis.contrib.async_background.registry import loop_clients
+from bazis.contrib.async_background.schemas import TERMINAL_STATUSES, TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+
+
+logger = logging.getLogger(__name__)
+
+#: pub/sub channel broadcasting the ids of cancelled tasks to the consumers
+CANCEL_CHANNEL = "async_bg:cancel"
+RECONNECT_DELAY_SEC = 1
+MAX_REMEMBERED_TASKS = 10000
+
+#: stored statuses a task can be cancelled in (None - no record)
+CANCELLABLE_STATUSES = (None, *(status for status in TaskStatus if status not in TERMINAL_STATUSES))
+
+# Tasks cancelled while this process was listening, checked by `is_cancelled`
+_cancelled_task_ids: OrderedDict[str, None] = OrderedDict()
+
+
+def _remember(task_id: str) -> None:
+    _cancelled_task_ids[task_id] = None
+    if len(_cancelled_task_ids) > MAX_REMEMBERED_TASKS:
+        _cancelled_task_ids.popitem(last=False)
+
+
+def is_cancelled() -> bool:
+    """
+    Whether the task of the running handler has been cancelled: a cheap in-memory check for
+    handlers to call between steps and stop early.
+    """
+    task_id = current_task_id.get()
+    return task_id is not None and task_id in _cancelled_task_ids
+
+
+async def cancel_task_async(task_id: str, channel_name: str, task_type: str | None = None) -> bool:
+    """
+    Marks the task as cancelled and notifies the consumers, one of which may be running it.
+    Returns False if the task has already finished: it is left as it is.
+    """
+    from bazis.contrib.async_background.utils import set_and_publish_status_async, status_in
+
+    if not await set_and_publish_status_async(
+        task_id,
+        channel_name,
+        TaskStatus.CANCELLED,
+        task_type=task_type,
+        condition=status_in(*CANCELLABLE_STATUSES),
+    ):
+        return False
+    await task_storage.for_channel_async(CANCEL_CHANNEL).publish(CANCEL_CHANNEL, task_id)
+    return True
+
+
+async def is_task_cancelled_async(task_id: str) -> bool:
+    """Whether the stored status of the task is CANCELLED."""
+    record = await task_storage.for_task_async(task_id).get(task_id)
+    return bool(record) and json.loads(record)["status"] == TaskStatus.CANCELLED.value
+
+
+class CancellationListener:
+    """
+    Listens to the cancellations of the consumer event loop. Every cancelled task is remembered
+    for `is_cancelled`; with KAFKA_CANCEL_INTERRUPTS_HANDLERS the handler running it is also
+    interrupted with asyncio cancellation.
+    """
+
+    def __init__(self) -> None:
+        self._running: dict[str, asyncio.Task] = {}
+        #: set while the listener is subscribed: cancellations published before are missed
+        self.subscribed = asyncio.Event()
+        self._listener = asyncio.ensure_future(self._listen())
+
+    async def run(self, task_id: str, handler_call: Awaitable[None]) -> bool:
+        """Runs the handler of the task; returns False if it was interrupted by a cancellation."""
+        handler_task = asyncio.ensure_future(handler_call)
+        self._running[task_id] = handler_task
+        try:
+            await handler_task
+        except asyncio.CancelledError:
+            # The consumer itself is stopping: propagate, otherwise the task has been cancelled
+            if not handler_task.cancelled() or asyncio.current_task().cancelling():
+                raise
+            return False
+        finally:
+            self._running.pop(task_id, None)
+        return True
+
+    async def _listen(self) -> None:
+        client = task_storage.for_channel_async(CANCEL_CHANNEL)
+        while True:
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CANCEL_CHANNEL)
+                    self.subscribed.set()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._on_cancelled(message["data"].decode("utf-8"))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.subscribed.clear()
+                logger.warning("Task cancellation listener failed, reconnecting", exc_info=True)
+                await asyncio.sleep(RECONNECT_DELAY_SEC)
+
+    def _on_cancelled(self, task_id: str) -> None:
+        _remember(task_id)
+        handler_task = self._running.get(task_id)
+        if handler_task is not None and settings.KAFKA_CANCEL_INTERRUPTS_HANDLERS:
+            logger.info("Interrupting the handler of cancelled task %s", task_id)
+            handler_task.cancel()
+
+    async def aclose(self) -> None:
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+
+
+async def _close_listener(listener: CancellationListener) -> None:
+    await listener.aclose()
+
+
+def get_cancellation_listener() -> CancellationListener:
+    """The cancellation listener of the running event loop, started on first use."""
+    return loop_clients.get("cancellation_listener", CancellationListener, closer=_close_listener)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Literal
+
 from pydantic import Field, computed_field
 
 from bazis.core.utils.schemas import BazisSettings
@@ -35,10 +37,103 @@ class Settings(BazisSettings):
         description="Maximum random lifetime shift (jitter) in seconds. For example, 300.",
     )
 
+    KAFKA_CONSUMER_SLIM_BOOTSTRAP: bool = Field(
+        default=False,
+        description="Start consumers importing only KAFKA_TASKS modules, without building the API application.",
+    )  # Task modules must not rely on the routes and schemas registered by the application
+
+    KAFKA_PROFILE_DURATION_SEC: float = Field(
+        default=30, gt=0, description="Time (in seconds) a consumer is profiled for after receiving SIGUSR1."
+    )
+
+    KAFKA_PROFILE_INTERVAL_MS: float = Field(
+        default=10, gt=0, description="Interval (in ms) of sampling the stacks of a profiled consumer."
+    )
+
+    KAFKA_PROFILE_DIR: str | None = Field(
+        default=None, description="Directory consumer profiles are written to. Empty - the temporary directory."
+    )
+
+    KAFKA_CANCEL_INTERRUPTS_HANDLERS: bool = Field(
+        default=False,
+        description="Interrupt the handler of a cancelled task with asyncio cancellation instead of relying on is_cancelled().",
+    )  # Handlers must tolerate being interrupted at any await
+
+    KAFKA_METRICS_LOG_INTERVAL_SEC: float | None = Field(
+        default=60, gt=0,
+        description="Interval (in seconds) at which consumers log their metrics. None disables it.",
+    )
+
+    KAFKA_LOOP_MONITOR_INTERVAL_SEC: float | None = Field(
+        default=0.5, gt=0,
+        description="Interval (in seconds) at which consumers measure the lag of their event loop. None disables it.",
+    )
+
+    KAFKA_LOOP_BLOCK_THRESHOLD_SEC: float | None = Field(
+        default=1, gt=0,
+        description="Time (in seconds) the event loop of a consumer may be blocked before its stack is logged.",
+    )  # None disables the watchdog thread and the warnings of blocking handlers
+
     KAFKA_RESPONSE_HOLD_SEC: int = Field(
         default=86400, description="Time to hold the response for async requests (in seconds)."
     )
 
+    KAFKA_STATUS_HOLD_SEC: dict[str, int] = Field(
+        default={},
+        description=(
+            "Time to hold task records by status (in seconds), for example {'created': 600, 'failed': 3600}. "
+            "Statuses not listed are held for KAFKA_RESPONSE_HOLD_SEC."
+        ),
+    )
+
+    KAFKA_LARGE_RECORD_BYTES: int | None = Field(
+        default=None, gt=0, description="Size of a task record (in bytes) above which it is held for KAFKA_LARGE_RECORD_HOLD_SEC."
+    )
+
+    KAFKA_LARGE_RECORD_HOLD_SEC: int = Field(
+        default=3600, gt=0, description="Time to hold a large task record (in seconds)."
+    )
+
+    KAFKA_UNREAD_HOLD_SEC: int | None = Field(
+        default=None, gt=0,
+        description=(
+            "Time to hold a completed or failed task record when no one was subscribed to its channel. "
+            "Clients polling the result over HTTP are not subscribers: it must exceed their polling delay."
+        ),
+    )  # Only applies to statuses published at once, not to coalesced notifications
+
+    KAFKA_STATUS_COALESCE_MS: int = Field(
+        default=0, ge=0,
+        description="Buffer status notifications of a channel for this time (in ms) and publish them as one message.",
+    )  # 0 publishes every status change at once
+
+    KAFKA_STATUS_COALESCE_MAX_EVENTS: int = Field(
+        default=500, gt=0, description="Number of buffered events that triggers publishing of a channel at once."
+    )
+
+    KAFKA_INLINE_RESPONSE_MAX_BYTES: int = Field(
+        default=1024, ge=0,
+        description="Maximum size of a response (in bytes) sent in the completed or failed notification itself. 0 disables it.",
+    )  # Pub/sub messages reach every subscriber of the channel: keep it small
+
+    KAFKA_REDIS_NODES: list[str] = Field(
+        default=[],
+        description="Redis URLs task records are sharded across by task_id. Empty - the default cache of CACHES.",
+    )  # Changing the list remaps a part of the stored tasks: change it between deploys only
+
+    KAFKA_REDIS_PUBSUB_NODES: list[str] = Field(
+        default=[],
+        description="Redis URLs status notifications are published to, by channel. Empty - the default cache of CACHES.",
+    )  # With several nodes WebSocket gateways must subscribe to a channel on its node
+
+    KAFKA_RESULT_STREAM_MAXLEN: int = Field(
+        default=1000, gt=0, description="Number of entries kept in the partial result stream of a task."
+    )
+
+    KAFKA_RESULT_STREAM_TTL_SEC: int = Field(
+        default=3600, gt=0, description="Time to hold the partial result stream after its last entry (in seconds)."
+    )
+
     KAFKA_BOOTSTRAP_SERVERS: str | None = Field(
         default=None, description="List of Kafka brokers separated by commas (for example, 'kafka1:9092,kafka2:9092')."
     )  # List of brokers polled to obtain the topic owner
@@ -70,10 +165,105 @@ class Settings(BazisSettings):
         default=10000, description="Interval for auto-committing the offset if enable.auto.commit is enabled."
     )  # If KAFKA_ENABLE_AUTO_COMMIT is enabled
 
+    KAFKA_COMMIT_BATCH_SIZE: int = Field(
+        default=1, gt=0,
+        description="Number of processed messages after which offsets are committed when auto-commit is disabled.",
+    )  # 1 commits after every message; offsets are always flushed on rebalance and at shutdown
+
+    KAFKA_COMMIT_INTERVAL_MS: int = Field(
+        default=1000, gt=0,
+        description="Maximum time (in ms) offsets of processed messages stay uncommitted when KAFKA_COMMIT_BATCH_SIZE > 1.",
+    )
+
     KAFKA_PUBLISH_TIMEOUT_SEC: int = Field(
         default=10, description="Timeout in seconds for producing a message to Kafka."
     )
 
+    KAFKA_TASK_DEADLINE_SEC: float | None = Field(
+        default=None, gt=0,
+        description="Time (in seconds) a task may wait in the queue; later it is marked expired instead of run.",
+    )  # enqueue_task_async(deadline_sec=...) overrides it per task
+
+    KAFKA_ENQUEUE_MAX_IN_FLIGHT: int | None = Field(
+        default=None, gt=0,
+        description="Maximum number of tasks enqueued at once by a process; above it enqueue fails at once.",
+    )
+
+    KAFKA_ENQUEUE_RETRY_AFTER_SEC: float = Field(
+        default=1, gt=0, description="Retry-After suggested when the in-flight limit of enqueue is reached."
+    )
+
+    KAFKA_BREAKER_FAILURE_THRESHOLD: int | None = Field(
+        default=None, gt=0,
+        description="Consecutive failed or slow Kafka (Redis) calls of enqueue that open its circuit breaker.",
+    )  # None disables the breakers
+
+    KAFKA_BREAKER_SLOW_CALL_SEC: float = Field(
+        default=2, gt=0, description="Duration (in seconds) above which a call counts as failed by the circuit breaker."
+    )
+
+    KAFKA_BREAKER_RESET_SEC: float = Field(
+        default=10, gt=0, description="Time (in seconds) an open circuit rejects calls before probing again."
+    )
+
+    KAFKA_PRODUCER_LINGER_MS: int = Field(
+        default=5, ge=0, description="Time the producer waits to batch messages sent concurrently (in ms)."
+    )  # Messages of all threads using enqueue_task share the producer and are batched together
+
+    KAFKA_FAIR_SCHEDULING: bool = Field(
+        default=False,
+        description="Process tasks round-robin across channels instead of strict offset order.",
+    )
+
+    KAFKA_FAIR_WINDOW: int = Field(
+        default=100, gt=0,
+        description="Maximum number of messages reordered together when fair scheduling is enabled.",
+    )  # The window is committed only after all of its tasks are processed
+
+    KAFKA_FAIR_CONCURRENCY: int = Field(
+        default=4, gt=0,
+        description="Number of tasks of a fair scheduling window processed concurrently.",
+    )
+
+    KAFKA_CHANNEL_RATE_PER_SEC: float | None = Field(
+        default=None, gt=0,
+        description="Maximum number of tasks per second processed for one channel by a consumer.",
+    )
+
+    KAFKA_CHANNEL_RATE_BURST: int = Field(
+        default=10, gt=0,
+        description="Number of tasks a channel may run above KAFKA_CHANNEL_RATE_PER_SEC in a burst.",
+    )
+
+    KAFKA_CHANNEL_RATE_MAX_DEFERRED: int = Field(
+        default=1000, gt=0,
+        description="Maximum number of tasks over their channel rate deferred at a time by a consumer.",
+    )
+
+    KAFKA_PARTITIONER: Literal["hash", "sticky", "hot_key"] = Field(
+        default="hash",
+        description=(
+            "Partitioning of produced tasks: hash - by partition_marker; sticky - as hash, keyless tasks "
+            "are sent to one partition per batch; hot_key - as sticky, hot markers are split into sub-keys."
+        ),
+    )
+
+    KAFKA_STICKY_BATCH_SIZE: int = Field(
+        default=100, gt=0, description="Number of keyless tasks sent to one partition before switching."
+    )
+
+    KAFKA_HOT_KEY_THRESHOLD: int = Field(
+        default=1000, gt=0, description="Tasks of one partition_marker per window that make it hot."
+    )
+
+    KAFKA_HOT_KEY_WINDOW_SEC: float = Field(
+        default=10, gt=0, description="Sliding window (in seconds) for hot partition_marker detection."
+    )
+
+    KAFKA_HOT_KEY_SALTS: int = Field(
+        default=8, gt=0, description="Number of sub-keys a hot partition_marker is spread over."
+    )
+
     @computed_field
     @property
     def KAFKA_ENABLED(self) -> bool: # noqa: N802
@@ -0,0 +1,384 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+import logging
+import math
+import time
+import typing
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+
+from asgiref.sync import sync_to_async
+from faststream.kafka.annotations import KafkaMessage
+
+from bazis.contrib.async_background.broker import get_broker_for_consumer
+from bazis.contrib.async_background.cancellation import (
+    get_cancellation_listener,
+    is_cancelled,
+    is_task_cancelled_async,
+)
+from bazis.contrib.async_background.context import (
+    DEADLINE_HEADER,
+    TASK_TYPE_HEADER,
+    current_deadline,
+    current_group,
+    current_task_id,
+    current_task_type,
+    get_task_type,
+    task_type_of,
+)
+from bazis.contrib.async_background.groups import finish_subtask
+from bazis.contrib.async_background.loop_monitor import run_measured
+from bazis.contrib.async_background.metrics import metrics
+from bazis.contrib.async_background.offsets import (
+    CommitOnRevokeListener,
+    batched_commits_enabled,
+    build_offset_committer,
+)
+from bazis.contrib.async_background.scheduling import (
+    ChannelRateLimiter,
+    FairScheduler,
+    Job,
+    ThrottledTasks,
+)
+from bazis.contrib.async_background.schemas import KafkaTask, TaskEnvelope, TaskStatus
+from bazis.contrib.async_background.utils import (
+    RecordCondition,
+    set_and_publish_status_async,
+    status_in,
+)
+
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[KafkaTask], Awaitable[Any]]
+
+#: stored statuses a task expires in (None - no record): it has not been started yet
+EXPIRABLE_STATUSES = (None, TaskStatus.CREATED, TaskStatus.PENDING)
+
+
+def default_subscriber_kwargs() -> dict[str, object]:
+    """Subscriber options shared by all task consumers of the service."""
+    kwargs: dict[str, object] = {
+        "auto_offset_reset": settings.KAFKA_AUTO_OFFSET_RESET,
+        "auto_commit": settings.KAFKA_ENABLE_AUTO_COMMIT,
+        "auto_commit_interval_ms": settings.KAFKA_AUTO_COMMIT_INTERVAL_MS,
+    }
+    if settings.KAFKA_GROUP_ID:
+        kwargs["group_id"] = settings.KAFKA_GROUP_ID
+    return kwargs
+
+
+def _get_task_model(handler: TaskHandler) -> type[KafkaTask]:
+    first_param = next(iter(inspect.signature(handler).parameters))
+    return typing.get_type_hints(handler)[first_param]
+
+
+def _get_rate_limiter() -> ChannelRateLimiter | None:
+    if not settings.KAFKA_CHANNEL_RATE_PER_SEC:
+        return None
+    return ChannelRateLimiter(settings.KAFKA_CHANNEL_RATE_PER_SEC, settings.KAFKA_CHANNEL_RATE_BURST)
+
+
+async def _raw_body_decoder(message: Any) -> Any:
+    # Tasks are validated straight from the raw bytes, skipping the intermediate JSON decoding
+    return message.body
+
+
+def _records(message: Any) -> tuple:
+    raw_message = message.raw_message
+    return raw_message if isinstance(raw_message, tuple) else (raw_message,)
+
+
+def _record_header(record: Any, name: str) -> str | None:
+    for key, value in record.headers or ():
+        if key == name and value is not None:
+            # A malformed header reads as an unknown value, not as an error failing the message over and over
+            return value.decode("utf-8", errors="replace")
+    return None
+
+
+async def _finish_unhandled(
+    envelope: TaskEnvelope,
+    status: TaskStatus,
+    error: str,
+    task_type: str | None,
+    condition: RecordCondition | None = None,
+) -> bool:
+    """
+    Sets the final status of a task not given to a handler; a subtask counts in its group.
+    Returns whether the status was written (see `condition` of `set_and_publish_status_async`).
+    """
+    # Statuses are recorded with this task, never with the type or group of one processed before
+    task_type_token = current_task_type.set(task_type)
+    task_id_token = current_task_id.set(envelope.task_id)
+    group_token = current_group.set(_task_group(envelope))
+    try:
+        return await set_and_publish_status_async(
+            task_id=envelope.task_id,
+            channel_name=envelope.channel_name,
+            status=status,
+            response={"error": error},
+            task_type=task_type,
+            condition=condition,
+        )
+    finally:
+        current_task_type.reset(task_type_token)
+        current_task_id.reset(task_id_token)
+        current_group.reset(group_token)
+
+
+def _record_deadline(record: Any) -> float | None:
+    try:
+        deadline = _record_header(record, DEADLINE_HEADER)
+        if deadline is None:
+            return None
+        deadline_ts = float(deadline)
+        if not math.isfinite(deadline_ts):
+            raise ValueError(deadline)
+    except ValueError:
+        # A broken header must not make the message fail over and over
+        logger.warning(
+            "Ignoring the malformed deadline of message %s:%s", record.partition, record.offset, exc_info=True
+        )
+        return None
+    return deadline_ts
+
+
+async def _expire_if_late(record: Any) -> bool:
+    """Marks the task of the record EXPIRED if its deadline has passed, without parsing the payload."""
+    deadline = _record_deadline(record)
+    if deadline is None or deadline > time.time():
+        return False
+    envelope = TaskEnvelope.model_validate_json(record.value)
+    logger.info("Task %s expired %.1fs ago, skipping it", envelope.task_id, time.time() - deadline)
+    # A task cancelled or finished meanwhile (a redelivered message) keeps its status
+    if await _finish_unhandled(
+        envelope,
+        TaskStatus.EXPIRED,
+        "The task was not started before its deadline",
+        _record_header(record, TASK_TYPE_HEADER),
+        condition=status_in(*EXPIRABLE_STATUSES),
+    ):
+        metrics.inc("async_bg_tasks_expired_total")
+    elif envelope.group_id is not None and await is_task_cancelled_async(envelope.task_id):
+        # The cancelled status was set by the client: count it in the group here, as `_run_task` does
+        await sync_to_async(finish_subtask, thread_sensitive=False)(
+            envelope.group_id, envelope.group_index, TaskStatus.CANCELLED, None
+        )
+    return True
+
+
+def _task_group(task: KafkaTask | TaskEnvelope) -> tuple[str, int] | None:
+    return (task.group_id, task.group_index) if task.group_id is not None else None
+
+
+async def _run_task(handler: TaskHandler, task: KafkaTask) -> None:
+    # Statuses set by the handler are recorded with the type of its task
+    task_type_token = current_task_type.set(get_task_type(task.payload))
+    task_id_token = current_task_id.set(task.task_id)
+    deadline_token = current_deadline.set(task.deadline)
+    group_token = current_group.set(_task_group(task))
+    try:
+        await _run_in_context(handler, task)
+    finally:
+        # The context outlives the task: the next message may be processed in it
+        current_task_type.reset(task_type_token)
+        current_task_id.reset(task_id_token)
+        current_deadline.reset(deadline_token)
+        current_group.reset(group_token)
+
+
+async def _run_in_context(handler: TaskHandler, task: KafkaTask) -> None:
+    if await is_task_cancelled_async(task.task_id):
+        logger.info("Skipping cancelled task %s", task.task_id)
+    elif not await get_cancellation_listener().run(
+        task.task_id, run_measured(handler.__qualname__, handler(task))
+    ):
+        logger.info("Handler of task %s was interrupted by its cancellation", task.task_id)
+    elif is_cancelled() or (task.group_id is not None and await is_task_cancelled_async(task.task_id)):
+        # The handler has finished after the cancellation (possibly missed by the listener): its
+        # final status was not written
+        logger.info("Handler of task %s finished after its cancellation", task.task_id)
+    else:
+        return
+    if task.group_id is not None:
+        # The cancelled status was set by the client: count it in the group here
+        await sync_to_async(finish_subtask, thread_sensitive=False)(
+            task.group_id, task.group_index, TaskStatus.CANCELLED, None
+        )
+
+
+#: resolves a consumed record into its handler and task; None skips the record
+TaskResolver = Callable[[Any], Awaitable[tuple[TaskHandler, KafkaTask] | None]]
+
+
+def _subscribe(topic_name: str, name: str, resolve: TaskResolver, **subscriber_kwargs) -> None:
+    """
+    Subscribes the consumer broker to the topic. With KAFKA_FAIR_SCHEDULING the topic is read in
+    windows of KAFKA_FAIR_WINDOW messages which are processed round-robin across channels;
+    KAFKA_CHANNEL_RATE_PER_SEC limits the processing rate of every channel in both modes: tasks
+    over the rate are deferred until their channel has a token, not waited for.
+    """
+    rate_limiter = _get_rate_limiter()
+    throttled = ThrottledTasks(rate_limiter, settings.KAFKA_CHANNEL_RATE_MAX_DEFERRED) if rate_limiter else None
+    kwargs = {**default_subscriber_kwargs(), "decoder": _raw_body_decoder, **subscriber_kwargs}
+    broker = get_broker_for_consumer()
+    committer = None
+    # A deferred task keeps its offset uncommitted, which FastStream's per-message commit cannot do
+    if batched_commits_enabled() or (throttled is not None and not settings.KAFKA_ENABLE_AUTO_COMMIT):
+        committer = build_offset_committer(name)
+        kwargs["listener"] = CommitOnRevokeListener(committer, kwargs.get("listener"))
+
+    async def submit(channel_name: str, job: Job, record: Any) -> None:
+        if throttled is None:
+            await job()
+            return
+        await throttled.submit(
+            channel_name,
+            job,
+            hold=partial(committer.hold, record) if committer is not None else None,
+            release=partial(committer.release, record) if committer is not None else None,
+        )
+
+    if settings.KAFKA_FAIR_SCHEDULING:
+        scheduler = FairScheduler(settings.KAFKA_FAIR_CONCURRENCY, rate_limiter)
+
+        async def consume_window(body: Any, message: KafkaMessage) -> None:
+            records = [record for record in _records(message) if not await _expire_if_late(record)]
+            jobs: dict[Job, Any] = {}
+            channels: list[tuple[str, Job]] = []
+            for record in records:
+                if (resolved := await resolve(record)) is not None:
+                    handler, task = resolved
+                    job = partial(_run_task, handler, task)
+                    jobs[job] = record
+                    channels.append((task.channel_name, job))
+            # The jobs of channels over their rate are deferred, the window does not wait for them
+            for channel_name, job in await scheduler.run(channels):
+                await submit(channel_name, job, jobs[job])
+            if committer is not None:
+                await committer.processed(message)
+
+        consume_window.__name__ = name
+        broker.subscriber(
+            topic_name, batch=True, max_records=settings.KAFKA_FAIR_WINDOW, **kwargs
+        )(consume_window)
+    else:
+
+        async def consume_record(record: Any) -> None:
+            if await _expire_if_late(record):
+                return
+            resolved = await resolve(record)
+            if resolved is None:
+                return
+            handler, task = resolved
+            await submit(task.channel_name, partial(_run_task, handler, task), record)
+
+        async def consume(body: Any, message: KafkaMessage) -> None:
+            await consume_record(message.raw_message)
+            if committer is not None:
+                await committer.processed(message)
+
+        consume.__name__ = name
+        broker.subscriber(topic_name, **kwargs)(consume)
+
+
+def task_subscriber(topic_name: str, **subscriber_kwargs):
+    """
+    Registers a task handler `async def handler(task: KafkaTask[Payload])` on the consumer
+    broker: every message of the topic is validated as the task of the handler.
+    """
+
+    def decorator(handler: TaskHandler) -> TaskHandler:
+        task_model = _get_task_model(handler)
+
+        async def resolve(record: Any) -> tuple[TaskHandler, KafkaTask]:
+            return handler, task_model.model_validate_json(record.value)
+
+        _subscribe(topic_name, handler.__name__, resolve, **subscriber_kwargs)
+        logger.debug("Registered task handler %s for topic %s", handler.__qualname__, topic_name)
+        return handler
+
+    return decorator
+
+
+class TaskDispatcher:
+    """
+    Serves several task types on one topic with one subscriber: a message is routed by its
+    task type header before the payload is parsed, so each handler validates only its own
+    tasks. Messages without the header go to the `default` handler, if there is one; tasks
+    nobody handles are marked FAILED.
+
+        dispatcher = TaskDispatcher(settings.KAFKA_TOPIC_ASYNC_BG)
+
+        @dispatcher.handler
+        async def consume_report(task: KafkaTask[ReportPayload]): ...
+    """
+
+    def __init__(self, topic_name: str, **subscriber_kwargs) -> None:
+        self.topic_name = topic_name
+        self._handlers: dict[str, tuple[TaskHandler, type[KafkaTask]]] = {}
+        # Messages sent before task types were module-qualified carry the bare schema name
+        self._legacy_handlers: dict[str, tuple[TaskHandler, type[KafkaTask]] | None] = {}
+        self._default: tuple[TaskHandler, type[KafkaTask]] | None = None
+        _subscribe(topic_name, f"dispatch_{topic_name}", self._resolve, **subscriber_kwargs)
+
+    def handler(self, handler: TaskHandler | None = None, *, default: bool = False):
+        """Registers a handler for the task type of its `KafkaTask[Payload]` parameter."""
+
+        def decorator(handler: TaskHandler) -> TaskHandler:
+            task_model = _get_task_model(handler)
+            payload_model = task_model.model_fields["payload"].annotation
+            task_type = task_type_of(payload_model)
+            if task_type in self._handlers:
+                raise ValueError(f"Task type {task_type} of topic {self.topic_name} already has a handler")
+            self._handlers[task_type] = (handler, task_model)
+            # An ambiguous bare name routes nowhere
+            legacy_type = payload_model.__name__
+            self._legacy_handlers[legacy_type] = (
+                None if legacy_type in self._legacy_handlers else (handler, task_model)
+            )
+            if default:
+                self._default = (handler, task_model)
+            logger.debug("Registered %s handler %s for topic %s", task_type, handler.__qualname__, self.topic_name)
+            return handler
+
+        return decorator(handler) if handler is not None else decorator
+
+    async def _resolve(self, record: Any) -> tuple[TaskHandler, KafkaTask] | None:
+        task_type = _record_header(record, TASK_TYPE_HEADER)
+        if task_type:
+            entry = self._handlers.get(task_type) or self._legacy_handlers.get(task_type)
+        else:
+            entry = self._default
+        if entry is None:
+            logger.warning(
+                "Failing message %s:%s of topic %s: no handler for task type %s",
+                record.partition, record.offset, self.topic_name, task_type,
+            )
+            # Skipped silently, the task would stay pending for good
+            await _finish_unhandled(
+                TaskEnvelope.model_validate_json(record.value),
+                TaskStatus.FAILED,
+                f"Unknown task type: {task_type}",
+                task_type,
+            )
+            return None
+        handler, task_model = entry
+        return handler, task_model.model_validate_json(record.value)
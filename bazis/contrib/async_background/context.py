@@ -0,0 +1,77 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from pydantic import BaseModel
+
+
+#: Kafka header carrying the task type, read by `consumer.TaskDispatcher` before the payload is parsed
+TASK_TYPE_HEADER = "task_type"
+
+#: Kafka header carrying the deadline of the task (Unix time), checked before the message is parsed
+DEADLINE_HEADER = "deadline"
+
+#: id of the task processed by the current handler
+current_task_id: ContextVar[str | None] = ContextVar("current_task_id", default=None)
+
+#: type of the task processed by the current handler, recorded with its statuses
+current_task_type: ContextVar[str | None] = ContextVar("current_task_type", default=None)
+
+#: `(group_id, group_index)` of the subtask processed by the current handler
+current_group: ContextVar[tuple[str, int] | None] = ContextVar("current_group", default=None)
+
+#: deadline of the task processed by the current handler
+current_deadline: ContextVar[float | None] = ContextVar("current_deadline", default=None)
+
+
+def task_type_of(payload_model: type[BaseModel]) -> str:
+    """
+    Task type of a payload schema: its `__task_type__` attribute if it sets one, otherwise its
+    module-qualified name, so that schemas of the same name in different apps do not collide.
+    """
+    return payload_model.__dict__.get("__task_type__") or f"{payload_model.__module__}.{payload_model.__qualname__}"
+
+
+def get_task_type(payload: BaseModel) -> str:
+    """Task type reported in the task records and sent in the task type header."""
+    return task_type_of(type(payload))
+
+
+def get_deadline(deadline_sec: float | None) -> float | None:
+    """Deadline (Unix time) of a task enqueued now, KAFKA_TASK_DEADLINE_SEC from now by default."""
+    deadline_sec = settings.KAFKA_TASK_DEADLINE_SEC if deadline_sec is None else deadline_sec
+    return None if deadline_sec is None else time.time() + deadline_sec
+
+
+def task_headers(task_type: str | None, deadline: float | None) -> dict[str, str] | None:
+    """Kafka headers of a task message."""
+    headers = {}
+    if task_type:
+        headers[TASK_TYPE_HEADER] = task_type
+    if deadline is not None:
+        headers[DEADLINE_HEADER] = repr(deadline)
+    return headers or None
+
+
+def remaining_time() -> float | None:
+    """
+    Seconds left until the deadline of the task of the running handler, None without a deadline:
+    the budget to bound timeouts of the calls the handler makes.
+    """
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.time()
@@ -0,0 +1,256 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import logging
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from django.conf import settings
+
+from pydantic import BaseModel
+
+from asgiref.sync import sync_to_async
+
+from bazis.contrib.async_background.admission import admit_enqueue
+from bazis.contrib.async_background.context import get_deadline
+from bazis.contrib.async_background.schemas import GroupResults, KafkaTask, TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+
+
+if TYPE_CHECKING:
+    from redis.client import Pipeline
+
+    from bazis.contrib.async_background.utils import RecordCondition
+
+
+logger = logging.getLogger(__name__)
+
+GROUP_KEY_PREFIX = "async_bg:group:"
+
+#: task type of the parent record of a group
+GROUP_TASK_TYPE = "group"
+
+# Records the outcome of a subtask once, even if it is redelivered, and counts the finished ones.
+# The last subtask marks the group as completing; until the completion is done, a redelivered
+# subtask returns the count again, so that a failed completion is retried.
+# KEYS: group hash, results hash; ARGV: subtask index, outcome, failed flag, TTL.
+# Returns the number of finished subtasks, -1 for an outcome already recorded
+_FINISH_SUBTASK_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'finished') then
+    return -1
+end
+if redis.call('HSETNX', KEYS[2], ARGV[1], ARGV[2]) == 0 then
+    if redis.call('HGET', KEYS[1], 'completing') then
+        return tonumber(redis.call('HGET', KEYS[1], 'done'))
+    end
+    return -1
+end
+if ARGV[3] == '1' then
+    redis.call('HINCRBY', KEYS[1], 'failed', 1)
+end
+local done = redis.call('HINCRBY', KEYS[1], 'done', 1)
+if done >= tonumber(redis.call('HGET', KEYS[1], 'total')) then
+    redis.call('HSET', KEYS[1], 'completing', 1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return done
+"""
+
+
+def _group_key(group_id: str) -> str:
+    return f"{GROUP_KEY_PREFIX}{group_id}"
+
+
+def _results_key(group_id: str) -> str:
+    return f"{GROUP_KEY_PREFIX}{group_id}:results"
+
+
+def _progress(total: int, done: int, failed: int) -> dict:
+    return {"total": total, "done": done, "failed": failed}
+
+
+def _progress_advances(done: int) -> "RecordCondition":
+    """Condition of a progress write: the group is running and has not reported more progress."""
+    from bazis.contrib.async_background.utils import status_in
+
+    running = status_in(TaskStatus.PENDING, TaskStatus.PROCESSING)
+
+    def condition(pipeline: "Pipeline", record: dict | None) -> bool:
+        return running(pipeline, record) and (record["response"] or {}).get("done", 0) <= done
+
+    return condition
+
+
+async def enqueue_group_async[Payload: BaseModel](
+    *,
+    topic_name: str,
+    channel_name: str,
+    payloads: Sequence[Payload],
+    reducer_topic_name: str | None = None,
+    reducer_params: dict | None = None,
+    deadline_sec: float | None = None,
+) -> str:
+    """
+    Enqueues a subtask per payload, spread over the partitions of the topic so that all consumers
+    work on them, and returns the task ID of the group. The group record reports the progress of
+    the subtasks; when the last one finishes, a `KafkaTask[GroupResults]` reducer task with the
+    task ID of the group is sent to `reducer_topic_name`. Without a reducer the group completes
+    with the results of the subtasks itself.
+    """
+    from bazis.contrib.async_background.producer import send_task_async
+
+    if not payloads:
+        raise ValueError("A task group needs at least one subtask")
+    group_id = str(uuid4())
+    deadline = get_deadline(deadline_sec)
+    messages = [
+        KafkaTask[Payload](
+            task_id=str(uuid4()),
+            channel_name=channel_name,
+            deadline=deadline,
+            group_id=group_id,
+            group_index=index,
+            payload=payload,
+        )
+        for index, payload in enumerate(payloads)
+    ]
+
+    async with admit_enqueue():
+        await sync_to_async(_create_group, thread_sensitive=False)(
+            group_id, channel_name, len(messages), reducer_topic_name, reducer_params
+        )
+        errors = await asyncio.gather(
+            # Keyed by the subtask, the subtasks are hashed over all partitions
+            *(send_task_async(topic_name, message, partition_marker=message.task_id) for message in messages),
+            return_exceptions=True,
+        )
+
+    for message, error in zip(messages, errors, strict=True):
+        if error is not None:
+            # A subtask that was never sent is counted as failed, or the group would never finish
+            logger.warning("Failed to send subtask %s of group %s: %s", message.group_index, group_id, error)
+            await sync_to_async(finish_subtask, thread_sensitive=False)(
+                group_id, message.group_index, TaskStatus.FAILED, {"error": str(error)}
+            )
+    return group_id
+
+
+def _create_group(
+    group_id: str, channel_name: str, total: int, reducer_topic_name: str | None, reducer_params: dict | None
+) -> None:
+    from bazis.contrib.async_background.utils import set_and_publish_status
+
+    task_storage.for_task(group_id).hset(
+        _group_key(group_id),
+        mapping={
+            "total": total,
+            "done": 0,
+            "failed": 0,
+            "channel_name": channel_name,
+            "reducer_topic_name": reducer_topic_name or "",
+            "reducer_params": json.dumps(reducer_params or {}, ensure_ascii=False),
+        },
+    )
+    task_storage.for_task(group_id).expire(_group_key(group_id), settings.KAFKA_RESPONSE_HOLD_SEC)
+    set_and_publish_status(
+        group_id, channel_name, TaskStatus.PENDING, response=_progress(total, 0, 0), task_type=GROUP_TASK_TYPE
+    )
+
+
+def finish_subtask(group_id: str, group_index: int, status: TaskStatus, response: dict | None) -> None:
+    """
+    Records the final status of a subtask and updates the progress of its group; the last
+    subtask to finish completes the group or sends its reducer. If that fails, the subtask is
+    retried and its redelivery completes the group.
+    """
+    from bazis.contrib.async_background.utils import set_and_publish_status
+
+    client = task_storage.for_task(group_id)
+    finish_script = client.register_script(_FINISH_SUBTASK_SCRIPT)
+    done = finish_script(
+        keys=[_group_key(group_id), _results_key(group_id)],
+        args=[
+            group_index,
+            json.dumps({"status": status.value, "response": response}, ensure_ascii=False),
+            int(status != TaskStatus.COMPLETED),
+            settings.KAFKA_RESPONSE_HOLD_SEC,
+        ],
+    )
+    if done < 0:
+        logger.debug("Subtask %s of group %s has already been counted", group_index, group_id)
+        return
+
+    group = {key.decode("utf-8"): value.decode("utf-8") for key, value in client.hgetall(_group_key(group_id)).items()}
+    if "total" not in group:
+        logger.warning("Group %s of a finished subtask has expired", group_id)
+        return
+    total, failed = int(group["total"]), int(group["failed"])
+    if done < total:
+        # Subtasks finishing at once write their progress in any order, possibly after the group
+        # has been completed
+        set_and_publish_status(
+            group_id,
+            group["channel_name"],
+            TaskStatus.PROCESSING,
+            response=_progress(total, done, failed),
+            task_type=GROUP_TASK_TYPE,
+            condition=_progress_advances(done),
+        )
+        return
+    _complete_group(group_id, group, total, failed)
+
+
+def _complete_group(group_id: str, group: dict[str, str], total: int, failed: int) -> None:
+    from bazis.contrib.async_background.background_loop import producer_loop
+    from bazis.contrib.async_background.producer import send_task_async
+    from bazis.contrib.async_background.utils import set_and_publish_status
+
+    client = task_storage.for_task(group_id)
+    outcomes = {int(index): json.loads(outcome) for index, outcome in client.hgetall(_results_key(group_id)).items()}
+    if len(outcomes) < total:
+        # A concurrent redelivery has completed the group and handed the outcomes over
+        logger.debug("Group %s has already been completed", group_id)
+        return
+    results = GroupResults(
+        params=json.loads(group["reducer_params"]),
+        statuses=[outcomes[index]["status"] for index in range(total)],
+        results=[outcomes[index]["response"] for index in range(total)],
+    )
+
+    if group["reducer_topic_name"]:
+        reducer = KafkaTask[GroupResults](task_id=group_id, channel_name=group["channel_name"], payload=results)
+        # Called from a handler thread: the reducer is sent by the shared producer loop. It runs on
+        # the record of the group, which keeps reporting the progress until the reducer starts
+        producer_loop.submit(
+            send_task_async(group["reducer_topic_name"], reducer, partition_marker=group_id, register=False)
+        ).result()
+    else:
+        set_and_publish_status(
+            group_id,
+            group["channel_name"],
+            TaskStatus.FAILED if failed else TaskStatus.COMPLETED,
+            response={**_progress(total, total, failed), **results.model_dump(mode="json", exclude={"params"})},
+            task_type=GROUP_TASK_TYPE,
+        )
+
+    # The outcomes have been handed over: late duplicates of the subtasks are ignored
+    pipeline = client.pipeline(transaction=True)
+    pipeline.hset(_group_key(group_id), "finished", 1)
+    pipeline.delete(_results_key(group_id))
+    pipeline.execute()
+    logger.info("Group %s finished: %s of %s subtasks failed", group_id, failed, total)
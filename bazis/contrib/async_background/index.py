@@ -0,0 +1,159 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import time
+from typing import Any
+
+from redis.client import Pipeline
+
+from bazis.contrib.async_background.retention import record_hold_sec
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY_PREFIX = "async_bg:index:"
+
+#: statuses of unfinished tasks, indexed by the time of the transition to them
+INDEXED_STATUSES = (TaskStatus.CREATED, TaskStatus.PENDING, TaskStatus.PROCESSING)
+
+AGE_PERCENTILES = (50, 90, 99)
+
+
+def index_key(status: TaskStatus) -> str:
+    return f"{INDEX_KEY_PREFIX}{status.value}"
+
+
+def index_status(pipeline: Pipeline, task_id: str, status: TaskStatus, now: float | None = None) -> None:
+    """
+    Queues the move of the task to the index of its new status on a pipeline of the task node.
+    Finished tasks leave the index; members of records that expired without finishing are
+    trimmed as the index is written.
+    """
+    now = time.time() if now is None else now
+    for indexed_status in INDEXED_STATUSES:
+        if indexed_status != status:
+            pipeline.zrem(index_key(indexed_status), task_id)
+    if status in INDEXED_STATUSES:
+        pipeline.zadd(index_key(status), {task_id: now})
+        pipeline.zremrangebyscore(index_key(status), "-inf", now - record_hold_sec(status, 0))
+
+
+def _percentile_rank(count: int, percentile: int) -> int:
+    # Members are sorted oldest first: the p-th percentile age is counted from the newest one
+    return max(0, count - 1 - (count - 1) * percentile // 100)
+
+
+def index_stats(percentiles: tuple[int, ...] = AGE_PERCENTILES) -> dict[str, dict[str, Any]]:
+    """
+    Number of unfinished tasks by status and the percentiles of the time they have been in it
+    (in seconds). With several Redis nodes a percentile is the highest one of the nodes.
+    """
+    now = time.time()
+    stats: dict[str, dict[str, Any]] = {
+        status.value: {"depth": 0, "age_sec": {f"p{percentile}": 0.0 for percentile in percentiles}}
+        for status in INDEXED_STATUSES
+    }
+    for client in task_storage.nodes():
+        pipeline = client.pipeline(transaction=False)
+        for status in INDEXED_STATUSES:
+            pipeline.zcard(index_key(status))
+        counts = pipeline.execute()
+
+        pipeline = client.pipeline(transaction=False)
+        for status, count in zip(INDEXED_STATUSES, counts, strict=True):
+            for percentile in percentiles:
+                rank = _percentile_rank(count, percentile)
+                pipeline.zrange(index_key(status), rank, rank, withscores=True)
+        ranked = iter(pipeline.execute())
+
+        for status, count in zip(INDEXED_STATUSES, counts, strict=True):
+            status_stats = stats[status.value]
+            status_stats["depth"] += count
+            for percentile in percentiles:
+                members = next(ranked)
+                if members:
+                    age_sec = round(now - members[0][1], 3)
+                    key = f"p{percentile}"
+                    status_stats["age_sec"][key] = max(status_stats["age_sec"][key], age_sec)
+    return stats
+
+
+def stuck_tasks(status: TaskStatus, older_than_sec: float, limit: int = 100) -> list[tuple[str, float]]:
+    """`(task_id, age_sec)` of tasks in the status for longer than `older_than_sec`, the oldest first."""
+    now = time.time()
+    found: list[tuple[str, float]] = []
+    for client in task_storage.nodes():
+        members = client.zrangebyscore(
+            index_key(status), "-inf", now - older_than_sec, start=0, num=limit, withscores=True
+        )
+        found.extend((task_id.decode("utf-8"), round(now - score, 3)) for task_id, score in members)
+    found.sort(key=lambda item: item[1], reverse=True)
+    return found[:limit]
+
+
+def reap_stuck_task(task_id: str, status: TaskStatus, older_than_sec: float) -> bool:
+    """
+    Marks the task FAILED if it is still in the status since over `older_than_sec` ago. The check
+    and the write are one transaction, so a task moving on meanwhile is not failed. Returns
+    whether the task was reaped.
+    """
+    from bazis.contrib.async_background.utils import set_and_publish_status
+
+    client = task_storage.for_task(task_id)
+    pipeline = client.pipeline(transaction=False)
+    pipeline.get(task_id)
+    pipeline.zscore(index_key(status), task_id)
+    raw_record, listed_since = pipeline.execute()
+    if raw_record is None:
+        # Expired without finishing: only the index entry is stale
+        client.zrem(index_key(status), task_id)
+        return False
+    record = json.loads(raw_record)
+    now = time.time()
+    stuck_before = now - older_than_sec
+
+    def still_stuck(pipeline: Pipeline, stored_record: dict | None) -> bool:
+        # The index changes in the transactions of the record, which is watched
+        if stored_record is None or stored_record.get("status") != status.value:
+            return False
+        since = pipeline.zscore(index_key(status), task_id)
+        return since is not None and since <= stuck_before
+
+    age_sec = int(now - listed_since) if listed_since is not None else 0
+    if not set_and_publish_status(
+        task_id,
+        record["channel_name"],
+        TaskStatus.FAILED,
+        response={"error": f"Task has been {status.value} for {age_sec} seconds"},
+        task_type=record.get("task_type"),
+        condition=still_stuck,
+    ):
+        return False
+    logger.warning("Reaped task %s stuck in %s for %s seconds", task_id, status.value, age_sec)
+    return True
+
+
+def reap_stuck_tasks(status: TaskStatus, older_than_sec: float, limit: int = 100) -> int:
+    """
+    Marks tasks in the status for longer than `older_than_sec` as FAILED, e.g. tasks of a consumer
+    that died while processing them. Returns the number of reaped tasks.
+    """
+    return sum(
+        reap_stuck_task(task_id, status, older_than_sec)
+        for task_id, _ in stuck_tasks(status, older_than_sec, limit)
+    )
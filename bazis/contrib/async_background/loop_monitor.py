@@ -0,0 +1,145 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Coroutine, Generator
+from typing import Any
+
+from django.conf import settings
+
+from bazis.contrib.async_background.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class SteppedCoroutine:
+    """
+    Awaits a coroutine measuring the time its steps run on the event loop between awaits: for a
+    handler, the time it kept the loop busy (CPU work and blocking calls), as opposed to its wall time.
+    """
+
+    def __init__(self, coro: Coroutine) -> None:
+        self._coro = coro
+        self.busy_sec = 0.0
+        self.longest_step_sec = 0.0
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        send_value, error = None, None
+        while True:
+            started = time.perf_counter()
+            try:
+                if error is not None:
+                    signal = self._coro.throw(error)
+                else:
+                    signal = self._coro.send(send_value)
+            except StopIteration as stop:
+                self._add_step(time.perf_counter() - started)
+                return stop.value
+            except BaseException:
+                self._add_step(time.perf_counter() - started)
+                raise
+            self._add_step(time.perf_counter() - started)
+            try:
+                send_value, error = (yield signal), None
+            except GeneratorExit:
+                self._coro.close()
+                raise
+            except BaseException as exc:
+                send_value, error = None, exc
+
+    def _add_step(self, duration_sec: float) -> None:
+        self.busy_sec += duration_sec
+        self.longest_step_sec = max(self.longest_step_sec, duration_sec)
+
+
+async def run_measured(name: str, coro: Coroutine) -> Any:
+    """Runs a handler coroutine, recording its wall time and the time it blocked the loop."""
+    stepped = SteppedCoroutine(coro)
+    started = time.perf_counter()
+    try:
+        return await stepped
+    finally:
+        metrics.observe("async_bg_handler_wall_sec", time.perf_counter() - started, handler=name)
+        metrics.observe("async_bg_handler_blocked_sec", stepped.busy_sec, handler=name)
+        threshold_sec = settings.KAFKA_LOOP_BLOCK_THRESHOLD_SEC
+        if threshold_sec is not None and stepped.longest_step_sec > threshold_sec:
+            logger.warning(
+                "Handler %s blocked the event loop for %.3fs without awaiting", name, stepped.longest_step_sec
+            )
+
+
+class LoopMonitor:
+    """
+    Measures the lag of the event loop (how late a timer fires) and, from a watchdog thread,
+    logs the stack of the loop thread when the loop has not run for `block_threshold_sec`, which
+    points at the blocking call.
+    """
+
+    def __init__(self, interval_sec: float, block_threshold_sec: float | None) -> None:
+        self.interval_sec = interval_sec
+        self.block_threshold_sec = block_threshold_sec
+        self._heartbeat = time.monotonic()
+        self._stopped = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._loop_thread_id: int | None = None
+
+    def start(self) -> "LoopMonitor":
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.ensure_future(self._measure())
+        if self.block_threshold_sec is not None:
+            threading.Thread(target=self._watch, name="async-background-loop-watchdog", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _measure(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval_sec)
+            self._heartbeat = now = time.monotonic()
+            lag_sec = max(0.0, now - started - self.interval_sec)
+            # The gauge cannot share the name of the summary in the exposition
+            metrics.set_gauge("async_bg_loop_lag_last_sec", lag_sec)
+            metrics.observe("async_bg_loop_lag_sec", lag_sec)
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stopped.wait(self.block_threshold_sec / 2):
+            heartbeat = self._heartbeat
+            blocked_sec = time.monotonic() - heartbeat - self.interval_sec
+            if blocked_sec < self.block_threshold_sec or heartbeat == reported_heartbeat:
+                continue
+            # Reported once per stall
+            reported_heartbeat = heartbeat
+            metrics.inc("async_bg_loop_blocked_total")
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "unavailable"
+            logger.warning("Event loop has been blocked for %.3fs at:\n%s", blocked_sec, stack)
+
+
+def start_loop_monitor() -> LoopMonitor | None:
+    """Starts monitoring the running event loop, unless disabled by KAFKA_LOOP_MONITOR_INTERVAL_SEC."""
+    if settings.KAFKA_LOOP_MONITOR_INTERVAL_SEC is None:
+        return None
+    return LoopMonitor(settings.KAFKA_LOOP_MONITOR_INTERVAL_SEC, settings.KAFKA_LOOP_BLOCK_THRESHOLD_SEC).start()
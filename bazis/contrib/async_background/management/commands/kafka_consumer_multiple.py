@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import logging
 import os
 import sys
@@ -21,6 +22,8 @@ from django.core.management.base import BaseCommand, CommandParser
 
 import psutil
 
+from bazis.contrib.async_background.recycling import ChildResources, RecyclePolicy
+
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,122 @@ SHUTDOWN_POLL_INTERVAL_SEC = 0.1
 SHUTDOWN_TIMEOUT_SEC = 5
 
 
+class ConsumerSupervisor:
+    """Keeps `consumers_count` consumer processes running, replacing those the policy says leak."""
+
+    def __init__(self, options: dict, policy: RecyclePolicy) -> None:
+        self.consumers_count = options["consumers_count"]
+        self.restart_delay_sec = options["restart_delay_sec"]
+        self.max_restarts = options["max_restarts"]
+        self.drain_timeout_sec = options["drain_timeout_sec"]
+        self.rss_warmup_sec = options["rss_warmup_sec"]
+        self.pid_file = options["pid_file"]
+        self.policy = policy
+        self.processes: dict[int, psutil.Popen] = {}
+        self.resources: dict[int, ChildResources] = {}
+        self.restart_counts: dict[int, int] = {}
+        # Replaced consumers finishing their tasks, with the time they are killed at
+        self.draining: list[tuple[psutil.Popen, float]] = []
+        self._written_pids: dict[int, int] = {}
+
+    def start_all(self) -> None:
+        for index in range(1, self.consumers_count + 1):
+            self.processes[index] = self.start_consumer_process(index)
+            self.restart_counts[index] = 0
+        self.update_pid_file()
+
+    def start_consumer_process(self, index: int) -> psutil.Popen:
+        env = os.environ.copy()
+        process = psutil.Popen(
+            [str(sys.executable), "manage.py", "kafka_consumer_single"],
+            env=env,
+        )
+        logger.info("Started consumer process %s with index %s", process.pid, index)
+        self.resources[index] = ChildResources(process, warmup_sec=self.rss_warmup_sec)
+        return process
+
+    def update_pid_file(self) -> None:
+        pids = {index: process.pid for index, process in self.processes.items()}
+        if not self.pid_file or pids == self._written_pids:
+            return
+        try:
+            with open(self.pid_file, "w") as file:
+                json.dump(pids, file)
+        except OSError:
+            logger.warning("Failed to write the PID file %s", self.pid_file, exc_info=True)
+        else:
+            self._written_pids = pids
+
+    def restart_exited(self) -> None:
+        for index, process in list(self.processes.items()):
+            if process.poll() is None:
+                continue
+            logger.warning(
+                "Consumer process %s (index=%s) exited with code %s",
+                process.pid,
+                index,
+                process.returncode,
+            )
+            self.restart_counts[index] += 1
+            if self.max_restarts is not None and self.restart_counts[index] > self.max_restarts:
+                logger.error(
+                    "Consumer %s exceeded max restarts (%s).",
+                    index,
+                    self.max_restarts,
+                )
+                continue
+            time.sleep(self.restart_delay_sec)
+            logger.info("Restarting consumer process with index %s", index)
+            self.processes[index] = self.start_consumer_process(index)
+
+    def recycle_leaking(self) -> None:
+        for index, child in list(self.resources.items()):
+            if self.processes[index].poll() is None and child.sample() is not None and self.policy.enabled:
+                reason = self.policy.reason(child)
+                if reason is not None:
+                    self.recycle_consumer_process(index, reason)
+
+    def recycle_consumer_process(self, index: int, reason: str) -> None:
+        # The replacement starts first, so that the partitions of the old one are taken over at once
+        process = self.processes[index]
+        logger.warning("Replacing consumer process %s (index=%s): %s", process.pid, index, reason)
+        self.processes[index] = self.start_consumer_process(index)
+        process.terminate()
+        self.draining.append((process, time.monotonic() + self.drain_timeout_sec))
+
+    def reap_draining(self) -> None:
+        for process, kill_at in list(self.draining):
+            if process.poll() is not None:
+                logger.info("Replaced consumer process %s exited with code %s", process.pid, process.returncode)
+                self.draining.remove((process, kill_at))
+            elif time.monotonic() > kill_at:
+                logger.warning("Replaced consumer process %s did not stop in time, killing it", process.pid)
+                process.kill()
+
+    def log_resources(self) -> None:
+        for index, child in self.resources.items():
+            if child.last is not None and self.processes[index].poll() is None:
+                logger.info(
+                    "Consumer process %s (index=%s): rss=%.1fMB cpu=%.1f%%",
+                    child.process.pid,
+                    index,
+                    child.last.rss_mb,
+                    child.last.cpu_percent,
+                )
+
+    def shutdown(self) -> None:
+        start_time = time.time()
+        all_processes = [*self.processes.values(), *(process for process, _ in self.draining)]
+        while (time.time() - start_time) < SHUTDOWN_TIMEOUT_SEC:
+            for process in all_processes:
+                process.poll()
+            time.sleep(SHUTDOWN_POLL_INTERVAL_SEC)
+
+        for process in all_processes:
+            if process.poll() is None:
+                process.terminate()
+
+
 class Command(BaseCommand):
     help = "Starts Kafka consumers in separate processes."
 
@@ -51,63 +170,77 @@ class Command(BaseCommand):
             default=None,
             help="Maximum restarts per consumer. Omit for unlimited.",
         )
+        parser.add_argument(
+            "--pid-file",
+            default=None,
+            help="File the PIDs of the consumers are written to by index, for kafka_consumer_profile --index.",
+        )
+        parser.add_argument(
+            "--max-rss-mb",
+            type=float,
+            default=None,
+            help="Replace a consumer whose resident memory exceeds this size in MB. Omit for no limit.",
+        )
+        parser.add_argument(
+            "--max-rss-growth-mb-per-hour",
+            type=float,
+            default=None,
+            help="Replace a consumer whose resident memory grows faster than this after its warm-up.",
+        )
+        parser.add_argument(
+            "--rss-warmup-sec",
+            type=float,
+            default=300,
+            help="Time after the start of a consumer not counted in its memory growth (default: 300).",
+        )
+        parser.add_argument(
+            "--rss-growth-window-sec",
+            type=float,
+            default=600,
+            help="Minimum time the memory growth of a consumer is measured over (default: 600).",
+        )
+        parser.add_argument(
+            "--drain-timeout-sec",
+            type=float,
+            default=30,
+            help="Time a replaced consumer has to finish its tasks before it is killed (default: 30).",
+        )
+        parser.add_argument(
+            "--resource-log-interval-sec",
+            type=float,
+            default=60,
+            help="Interval of logging the memory and CPU usage of every consumer, 0 to disable (default: 60).",
+        )
 
     def handle(self, *args, **options) -> None:
         """Starts Kafka consumers and monitors their completion."""
         logger.info("Starting Kafka consumers...")
-        consumers_count = options["consumers_count"]
-        restart_delay_sec = options["restart_delay_sec"]
-        max_restarts = options["max_restarts"]
-        processes: dict[int, psutil.Popen] = {}
-
-        def start_consumer_process(index: int) -> psutil.Popen:
-            env = os.environ.copy()
-            process = psutil.Popen(
-                [str(sys.executable), "manage.py", "kafka_consumer_single"],
-                env=env,
-            )
-            logger.info("Started consumer process %s with index %s", process.pid, index)
-            return process
+        resource_log_interval_sec = options["resource_log_interval_sec"]
+        supervisor = ConsumerSupervisor(
+            options,
+            RecyclePolicy(
+                max_rss_mb=options["max_rss_mb"],
+                max_growth_mb_per_hour=options["max_rss_growth_mb_per_hour"],
+                growth_window_sec=options["rss_growth_window_sec"],
+            ),
+        )
 
         try:
-            for i in range(1, consumers_count + 1):
-                processes[i] = start_consumer_process(i)
-
-            restart_counts: dict[int, int] = {i: 0 for i in processes}
+            supervisor.start_all()
+            resources_logged_at = time.monotonic()
 
             while True:
                 time.sleep(POLL_INTERVAL_SEC)
+                supervisor.restart_exited()
+                supervisor.recycle_leaking()
+                supervisor.reap_draining()
+                supervisor.update_pid_file()
 
-                for index, process in list(processes.items()):
-                    if process.poll() is not None:
-                        exit_code = process.returncode
-                        logger.warning(
-                            "Consumer process %s (index=%s) exited with code %s",
-                            process.pid,
-                            index,
-                            exit_code,
-                        )
-                        restart_counts[index] += 1
-                        if max_restarts is not None and restart_counts[index] > max_restarts:
-                            logger.error(
-                                "Consumer %s exceeded max restarts (%s).",
-                                index,
-                                max_restarts,
-                            )
-                            continue
-                        time.sleep(restart_delay_sec)
-                        logger.info("Restarting consumer process with index %s", index)
-                        processes[index] = start_consumer_process(index)
+                if resource_log_interval_sec and time.monotonic() - resources_logged_at >= resource_log_interval_sec:
+                    resources_logged_at = time.monotonic()
+                    supervisor.log_resources()
 
         except KeyboardInterrupt:
             logger.warning("Received KeyboardInterrupt. Shutting down...")
-            start_time = time.time()
-            while (time.time() - start_time) < SHUTDOWN_TIMEOUT_SEC:
-                for process in processes.values():
-                    process.poll()
-                time.sleep(SHUTDOWN_POLL_INTERVAL_SEC)
-
-            for process in processes.values():
-                if process.poll() is None:
-                    process.terminate()
+            supervisor.shutdown()
             logger.info("All consumer processes terminated.")
@@ -0,0 +1,106 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+import psutil
+
+from bazis.contrib.async_background.profiling import PROFILE_SIGNAL
+
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_COMMAND = "kafka_consumer_single"
+SUPERVISOR_COMMAND = "kafka_consumer_multiple"
+
+
+def _runs_command(process: psutil.Process, command: str) -> bool:
+    try:
+        return command in process.cmdline()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def consumer_process(pid: int, supervised: bool) -> psutil.Process:
+    """
+    Returns the running consumer process `pid`, a child of kafka_consumer_multiple if `supervised`.
+    A PID file outlives its consumers, so its PIDs may have been reused by other processes.
+    """
+    try:
+        process = psutil.Process(pid)
+        alive = process.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess as err:
+        raise CommandError(f"No consumer process {pid}") from err
+    except psutil.AccessDenied as err:
+        raise CommandError(f"Process {pid} is not accessible") from err
+    if not alive:
+        raise CommandError(f"Consumer process {pid} has exited")
+    if not _runs_command(process, CONSUMER_COMMAND):
+        raise CommandError(f"Process {pid} is not a consumer ({CONSUMER_COMMAND})")
+    if supervised:
+        parent = process.parent()
+        if parent is None or not _runs_command(parent, SUPERVISOR_COMMAND):
+            raise CommandError(f"Process {pid} is not a consumer of {SUPERVISOR_COMMAND}")
+    return process
+
+
+class Command(BaseCommand):
+    help = "Makes a running consumer profile itself for KAFKA_PROFILE_DURATION_SEC."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--pid", type=int, help="PID of the consumer process.")
+        target.add_argument(
+            "--index",
+            type=int,
+            help="Index of a consumer of kafka_consumer_multiple, looked up in its --pid-file.",
+        )
+        parser.add_argument(
+            "--pid-file",
+            default=None,
+            help="PID file written by kafka_consumer_multiple --pid-file (required with --index).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        pid = options["pid"]
+        supervised = pid is None
+        if supervised:
+            pid = self._pid_of_index(options["index"], options["pid_file"])
+        process = consumer_process(pid, supervised)
+        try:
+            # Checks that the PID has not been reused since `process` was looked up
+            process.send_signal(PROFILE_SIGNAL)
+        except psutil.NoSuchProcess as err:
+            raise CommandError(f"No consumer process {pid}") from err
+        self.stdout.write(
+            f"Consumer process {pid} is profiled for {settings.KAFKA_PROFILE_DURATION_SEC}s, "
+            f"see consumer-{pid}-*.collapsed in {settings.KAFKA_PROFILE_DIR or tempfile.gettempdir()}"
+        )
+
+    def _pid_of_index(self, index: int, pid_file: str | None) -> int:
+        if not pid_file:
+            raise CommandError("--index requires --pid-file")
+        try:
+            with open(pid_file) as file:
+                pids = json.load(file)
+        except (OSError, ValueError) as err:
+            raise CommandError(f"Failed to read the PID file {pid_file}: {err}") from err
+        if str(index) not in pids:
+            raise CommandError(f"No consumer with index {index} in {pid_file}")
+        return pids[str(index)]
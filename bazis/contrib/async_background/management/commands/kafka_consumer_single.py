@@ -19,11 +19,13 @@ import sys
 import time
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandParser
 
 from aiokafka.errors import KafkaConnectionError
 
+from bazis.contrib.async_background.bootstrap import ImportProfiler, bootstrap_consumer
 from bazis.contrib.async_background.broker import build_app
+from bazis.contrib.async_background.profiling import install_profile_signal
 
 
 logger = logging.getLogger(__name__)
@@ -43,16 +45,12 @@ def _get_consumer_logger(consumer_id: int) -> logging.Logger:
     return consumer_logger
 
 
-def run_consumer(consumer_id: int) -> None:
-    from bazis.core.app import app  # noqa: F401
-    from bazis.core.router import router  # noqa: F401
-
+def run_consumer(consumer_id: int, slim: bool | None = None) -> None:
     if not settings.KAFKA_TASKS:
         logger.warning("No Kafka tasks configured in settings.KAFKA_TASKS.")
         return
 
-    for task_path in settings.KAFKA_TASKS:
-        __import__(task_path)
+    bootstrap_consumer(settings.KAFKA_CONSUMER_SLIM_BOOTSTRAP if slim is None else slim)
 
     consumer_logger = _get_consumer_logger(consumer_id)
     consumer_logger.info("Starting consumer process", extra={"consumer_id": consumer_id})
@@ -85,7 +83,36 @@ def run_consumer(consumer_id: int) -> None:
 class Command(BaseCommand):
     help = "Starts a single Kafka consumer (one process)."
 
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--slim-bootstrap",
+            action="store_true",
+            default=None,
+            help="Import only KAFKA_TASKS modules, without the API application (default: KAFKA_CONSUMER_SLIM_BOOTSTRAP).",
+        )
+        parser.add_argument(
+            "--profile-startup",
+            action="store_true",
+            help="Report the import time of the modules loaded at startup and exit without consuming.",
+        )
+        parser.add_argument(
+            "--profile-limit",
+            type=int,
+            default=30,
+            help="Number of the slowest modules reported by --profile-startup, 0 for all (default: 30).",
+        )
+
     def handle(self, *args, **options) -> None:
         """Entry point of the Django command."""
+        slim = options["slim_bootstrap"]
+        if options["profile_startup"]:
+            with ImportProfiler() as profiler:
+                bootstrap_consumer(settings.KAFKA_CONSUMER_SLIM_BOOTSTRAP if slim is None else slim)
+            for line in profiler.report(options["profile_limit"]):
+                self.stdout.write(line)
+            return
+
+        # Before the slow bootstrap: until then SIGUSR1 would terminate the consumer
+        install_profile_signal()
         logger.info("Starting a single Kafka consumer...")
-        run_consumer(consumer_id=1)
+        run_consumer(consumer_id=1, slim=slim)
@@ -0,0 +1,66 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from bazis.contrib.async_background.outbox import relay_outbox_batch
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Publishes tasks of the transactional outbox to Kafka."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of outbox tasks locked and published at once (default: 500).",
+        )
+        parser.add_argument(
+            "--poll-interval-sec",
+            type=float,
+            default=0.5,
+            help="Delay before polling an empty outbox again (default: 0.5).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox and exit.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Tails the outbox until interrupted."""
+        batch_size = options["batch_size"]
+        logger.info("Starting Kafka outbox relay...")
+        try:
+            while True:
+                try:
+                    published = relay_outbox_batch(batch_size)
+                except Exception:
+                    logger.exception("Outbox relay batch failed")
+                    published = 0
+                if published:
+                    logger.info("Published %s outbox tasks", published)
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval_sec"])
+        except KeyboardInterrupt:
+            logger.warning("Received KeyboardInterrupt. Shutting down...")
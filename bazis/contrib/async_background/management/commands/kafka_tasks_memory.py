@@ -0,0 +1,118 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from redis import Redis
+
+from bazis.contrib.async_background.storage import task_storage
+
+
+logger = logging.getLogger(__name__)
+
+#: task records are keyed by a UUID4 task_id
+TASK_KEY_PATTERN = "????????-????-????-????-????????????"
+UNKNOWN = "-"
+
+
+class _Usage:
+    def __init__(self) -> None:
+        self.keys = 0
+        self.bytes = 0
+
+    def add(self, size: int) -> None:
+        self.keys += 1
+        self.bytes += size
+
+
+class Command(BaseCommand):
+    help = "Samples task records with SCAN and reports their Redis memory usage by status and task type."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=10000,
+            help="Maximum number of task records sampled per Redis node (default: 10000).",
+        )
+        parser.add_argument(
+            "--scan-count",
+            type=int,
+            default=500,
+            help="COUNT hint of SCAN, also the size of a MEMORY USAGE pipeline (default: 500).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        by_status: dict[str, _Usage] = defaultdict(_Usage)
+        by_type: dict[str, _Usage] = defaultdict(_Usage)
+        total_keys = 0
+
+        for client in task_storage.nodes():
+            sampled = self._sample_node(client, options["sample"], options["scan_count"])
+            for status, task_type, size in sampled:
+                by_status[status].add(size)
+                by_type[task_type].add(size)
+            total_keys += client.dbsize()
+
+        sampled_keys = sum(usage.keys for usage in by_status.values())
+        self.stdout.write(f"Sampled {sampled_keys} task records of {total_keys} keys")
+        self._write_table("status", by_status)
+        self._write_table("task type", by_type)
+
+    def _sample_node(self, client: Redis, sample: int, scan_count: int) -> list[tuple[str, str, int]]:
+        """Status, task type and memory usage of up to `sample` task records of the node."""
+        result: list[tuple[str, str, int]] = []
+        keys: list[bytes] = []
+        for key in client.scan_iter(match=TASK_KEY_PATTERN, count=scan_count, _type="string"):
+            keys.append(key)
+            if len(keys) >= scan_count or len(result) + len(keys) >= sample:
+                result.extend(self._measure(client, keys))
+                keys = []
+            if len(result) >= sample:
+                return result
+        return result + self._measure(client, keys)
+
+    def _measure(self, client: Redis, keys: list[bytes]) -> list[tuple[str, str, int]]:
+        if not keys:
+            return []
+        pipeline = client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.memory_usage(key)
+            pipeline.get(key)
+        replies = pipeline.execute()
+
+        measured = []
+        for size, raw_record in zip(replies[::2], replies[1::2], strict=True):
+            if size is None or raw_record is None:
+                # Expired between SCAN and the pipeline
+                continue
+            try:
+                record = json.loads(raw_record)
+            except ValueError:
+                logger.debug("Skipping a key which is not a task record")
+                continue
+            if not isinstance(record, dict) or "status" not in record:
+                continue
+            measured.append((record["status"], record.get("task_type") or UNKNOWN, size))
+        return measured
+
+    def _write_table(self, title: str, usage: dict[str, _Usage]) -> None:
+        self.stdout.write("")
+        self.stdout.write(f"{title:<32} {'keys':>10} {'bytes':>14} {'avg bytes':>10}")
+        for name, item in sorted(usage.items(), key=lambda entry: entry[1].bytes, reverse=True):
+            self.stdout.write(f"{name:<32} {item.keys:>10} {item.bytes:>14} {item.bytes // item.keys:>10}")
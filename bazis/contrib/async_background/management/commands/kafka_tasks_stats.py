@@ -0,0 +1,79 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from bazis.contrib.async_background.index import (
+    AGE_PERCENTILES,
+    INDEXED_STATUSES,
+    index_stats,
+    reap_stuck_tasks,
+    stuck_tasks,
+)
+from bazis.contrib.async_background.schemas import TaskStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Reports the number and age of unfinished background tasks and lists or fails stuck ones."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--stuck-sec",
+            type=float,
+            default=None,
+            help="List tasks in a status for longer than this (in seconds).",
+        )
+        parser.add_argument(
+            "--status",
+            choices=[status.value for status in INDEXED_STATUSES],
+            default=None,
+            help="Status of the stuck tasks to list or reap. Omit for all unfinished statuses.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Maximum number of stuck tasks listed or reaped per status (default: 100).",
+        )
+        parser.add_argument(
+            "--reap",
+            action="store_true",
+            help="Mark the stuck tasks as failed.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f"{'status':<12} {'depth':>10} " + " ".join(f"{f'p{p} age':>12}" for p in AGE_PERCENTILES))
+        for status, stats in index_stats().items():
+            ages = " ".join(f"{stats['age_sec'][f'p{p}']:>12.1f}" for p in AGE_PERCENTILES)
+            self.stdout.write(f"{status:<12} {stats['depth']:>10} {ages}")
+
+        stuck_sec = options["stuck_sec"]
+        if stuck_sec is None:
+            if options["reap"]:
+                self.stderr.write("--reap requires --stuck-sec")
+            return
+
+        statuses = [TaskStatus(options["status"])] if options["status"] else INDEXED_STATUSES
+        for status in statuses:
+            if options["reap"]:
+                reaped = reap_stuck_tasks(status, stuck_sec, options["limit"])
+                self.stdout.write(f"Marked {reaped} tasks stuck in {status.value} as failed")
+                continue
+            for task_id, age_sec in stuck_tasks(status, stuck_sec, options["limit"]):
+                self.stdout.write(f"{task_id} {status.value} {age_sec:.1f}s")
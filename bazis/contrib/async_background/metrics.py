@@ -0,0 +1,131 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+#: content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict[str, object]) -> _MetricKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_key(key: _MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+def _prometheus_key(key: _MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    escaped = (
+        (label, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for label, value in labels
+    )
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process gauges, counters and timing summaries of the background machinery. The metric name
+    is positional-only, so any keyword (`name` included) is a label.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._gauges: dict[_MetricKey, float] = {}
+        self._counters: dict[_MetricKey, float] = {}
+        self._summaries: dict[_MetricKey, list[float]] = {}  # [count, sum, max]
+
+    def set_gauge(self, name: str, value: float, /, **labels: object) -> None:
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def clear_gauge(self, name: str, /, **labels: object) -> None:
+        with self._lock:
+            self._gauges.pop(_key(name, labels), None)
+
+    def inc(self, name: str, value: float = 1, /, **labels: object) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, /, **labels: object) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.setdefault(key, [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+
+    def snapshot(self) -> dict[str, float]:
+        """Returns all metrics as a flat `name{label="value"}` mapping."""
+        with self._lock:
+            result = {_format_key(key): value for key, value in self._gauges.items()}
+            result.update({_format_key(key): value for key, value in self._counters.items()})
+            for (name, labels), (count, total, maximum) in self._summaries.items():
+                result[_format_key((f"{name}_count", labels))] = count
+                result[_format_key((f"{name}_sum", labels))] = total
+                result[_format_key((f"{name}_max", labels))] = maximum
+        return result
+
+    def render_prometheus(self) -> str:
+        """Returns all metrics in the Prometheus text format; the maximum of a summary is a gauge."""
+        families: dict[str, tuple[str, list[str]]] = {}
+
+        def add(name: str, kind: str, key: _MetricKey, value: float) -> None:
+            families.setdefault(name, (kind, []))[1].append(f"{_prometheus_key(key)} {value}")
+
+        with self._lock:
+            for key, value in self._gauges.items():
+                add(key[0], "gauge", key, value)
+            for key, value in self._counters.items():
+                add(key[0], "counter", key, value)
+            for (name, labels), (count, total, maximum) in self._summaries.items():
+                add(name, "summary", (f"{name}_count", labels), count)
+                add(name, "summary", (f"{name}_sum", labels), total)
+                add(f"{name}_max", "gauge", (f"{name}_max", labels), maximum)
+        lines = []
+        for name, (kind, samples) in sorted(families.items()):
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+async def _log_metrics(interval_sec: float) -> None:
+    while True:
+        await asyncio.sleep(interval_sec)
+        snapshot = metrics.snapshot()
+        if snapshot:
+            logger.info("Metrics: %s", " ".join(f"{key}={value:g}" for key, value in sorted(snapshot.items())))
+
+
+def start_metrics_log(interval_sec: float | None) -> asyncio.Task | None:
+    """Logs the metrics of the process every `interval_sec` on the running loop; None disables it."""
+    if interval_sec is None:
+        return None
+    return asyncio.ensure_future(_log_metrics(interval_sec))
@@ -0,0 +1,42 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxTask',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('task_id', models.CharField(max_length=36, unique=True, verbose_name='Task ID')),
+                ('topic_name', models.CharField(max_length=255, verbose_name='Topic')),
+                ('channel_name', models.CharField(max_length=255, verbose_name='Channel name')),
+                ('partition_marker', models.CharField(blank=True, max_length=255, null=True, verbose_name='Partition marker')),
+                ('message', models.JSONField(verbose_name='Message')),
+                ('dt_created', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+            ],
+            options={
+                'verbose_name': 'Outbox task',
+                'verbose_name_plural': 'Outbox tasks',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxTask(models.Model):
+    """A task written in the transactional outbox, waiting to be published by kafka_outbox_relay."""
+
+    id = models.BigAutoField(primary_key=True)
+    task_id = models.CharField(_("Task ID"), max_length=36, unique=True)
+    topic_name = models.CharField(_("Topic"), max_length=255)
+    channel_name = models.CharField(_("Channel name"), max_length=255)
+    partition_marker = models.CharField(_("Partition marker"), max_length=255, null=True, blank=True)
+    task_type = models.CharField(_("Task type"), max_length=255, blank=True, default="")
+    message = models.JSONField(_("Message"))
+    dt_created = models.DateTimeField(_("Created at"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Outbox task")
+        verbose_name_plural = _("Outbox tasks")
+
+    def __str__(self) -> str:
+        return self.task_id
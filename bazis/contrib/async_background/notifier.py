@@ -0,0 +1,133 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from bazis.contrib.async_background.schemas import TERMINAL_STATUSES, TaskStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ChannelBuffer:
+    def __init__(self, flush_at: float) -> None:
+        self.flush_at = flush_at
+        self.events: list[dict | None] = []
+        self.pending_by_task: dict[str, int] = {}  # position of the task's non-terminal event
+
+    def add(self, task_id: str, status: TaskStatus, response: dict | None = None) -> None:
+        position = self.pending_by_task.pop(task_id, None)
+        if position is not None:
+            # A later status supersedes the pending one, which is dropped
+            self.events[position] = None
+        if status not in TERMINAL_STATUSES:
+            self.pending_by_task[task_id] = len(self.events)
+        event = {"task_id": task_id, "status": status.value}
+        if response is not None:
+            event["response"] = response
+        self.events.append(event)
+
+    def message(self) -> str:
+        events = [event for event in self.events if event is not None]
+        return json.dumps({"action": "async_bg_batch", "events": events}, ensure_ascii=False)
+
+
+class StatusNotifier:
+    """
+    Coalesces status notifications: events of a channel are buffered for `delay_sec` and
+    published as one `{"action": "async_bg_batch", "events": [{task_id, status}, ...]}`
+    message (an event of a finished task may also carry its small `response`). A status
+    superseded within the buffer is dropped; terminal statuses are always published, in the
+    order they were set.
+    """
+
+    def __init__(
+        self,
+        publish_many: Callable[[list[tuple[str, str]]], None],
+        delay_sec: float,
+        max_events: int,
+    ) -> None:
+        self.publish_many = publish_many
+        self.delay_sec = delay_sec
+        self.max_events = max_events
+        self._condition = threading.Condition()
+        self._buffers: dict[str, _ChannelBuffer] = {}
+        self._thread: threading.Thread | None = None
+
+    def notify(
+        self, channel_name: str, task_id: str, status: TaskStatus, response: dict | None = None
+    ) -> None:
+        with self._condition:
+            buffer = self._buffers.get(channel_name)
+            if buffer is None:
+                flush_at = time.monotonic() + self.delay_sec
+                buffer = self._buffers[channel_name] = _ChannelBuffer(flush_at)
+            buffer.add(task_id, status, response)
+            if len(buffer.events) >= self.max_events:
+                buffer.flush_at = 0
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="async-background-notifier", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _take_due(self, now: float | None) -> list[tuple[str, str]]:
+        due = [
+            channel_name
+            for channel_name, buffer in self._buffers.items()
+            if now is None or buffer.flush_at <= now
+        ]
+        return [(channel_name, self._buffers.pop(channel_name).message()) for channel_name in due]
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._buffers:
+                    self._condition.wait()
+                next_flush_at = min(buffer.flush_at for buffer in self._buffers.values())
+                self._condition.wait(max(next_flush_at - time.monotonic(), 0))
+                messages = self._take_due(time.monotonic())
+            self._publish(messages)
+
+    def _publish(self, messages: list[tuple[str, str]]) -> None:
+        if not messages:
+            return
+        try:
+            self.publish_many(messages)
+        except Exception:
+            logger.exception("Failed to publish %s coalesced status messages", len(messages))
+
+    def flush(self) -> None:
+        """Publishes everything buffered right away."""
+        with self._condition:
+            messages = self._take_due(None)
+        self._publish(messages)
+
+    def _forget(self) -> None:
+        # A forked child inherits the buffers but not the thread flushing them
+        self._condition = threading.Condition()
+        self._buffers = {}
+        self._thread = None
+
+    def install(self) -> "StatusNotifier":
+        atexit.register(self.flush)
+        os.register_at_fork(after_in_child=self._forget)
+        return self
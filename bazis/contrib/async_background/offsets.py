@@ -0,0 +1,172 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from django.conf import settings
+
+from aiokafka import ConsumerRebalanceListener, TopicPartition
+from faststream.broker.message import AckStatus
+from faststream.kafka.annotations import KafkaMessage
+
+from bazis.contrib.async_background.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+def batched_commits_enabled() -> bool:
+    return not settings.KAFKA_ENABLE_AUTO_COMMIT and settings.KAFKA_COMMIT_BATCH_SIZE > 1
+
+
+class OffsetCommitter:
+    """
+    Commits the offsets of processed messages of a manual-commit subscriber every `batch_size`
+    messages or `interval_sec` after the first uncommitted one, instead of after every message.
+    Only offsets of processed messages are committed, so delivery stays at-least-once: a crash
+    redelivers at most the uncommitted batch. A held record (a task deferred by the rate limit)
+    keeps the offset of its partition from passing it until it is released.
+    """
+
+    def __init__(self, name: str, batch_size: int, interval_sec: float) -> None:
+        self.name = name
+        self.batch_size = batch_size
+        self.interval_sec = interval_sec
+        self._consumer: Any = None
+        self._pending: dict[TopicPartition, int] = {}
+        self._pending_count = 0
+        self._held: dict[TopicPartition, set[int]] = {}
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self._closed = False
+
+    async def processed(self, message: KafkaMessage) -> None:
+        """Records the message (or the batch) as processed, committing when the policy says so."""
+        self._consumer = message.consumer
+        records = message.raw_message if isinstance(message.raw_message, tuple) else (message.raw_message,)
+        # FastStream must not commit the message on its own
+        message.committed = AckStatus.acked
+        await self._done(records)
+
+    def hold(self, record: Any) -> None:
+        """Keeps the offsets of the partition of the record below it until it is released."""
+        self._held.setdefault(TopicPartition(record.topic, record.partition), set()).add(record.offset)
+
+    async def release(self, record: Any) -> None:
+        """Records a held record as processed."""
+        partition = TopicPartition(record.topic, record.partition)
+        held = self._held.get(partition)
+        if held is not None:
+            held.discard(record.offset)
+            if not held:
+                del self._held[partition]
+        await self._done((record,))
+
+    async def _done(self, records: tuple) -> None:
+        for record in records:
+            partition = TopicPartition(record.topic, record.partition)
+            self._pending[partition] = max(self._pending.get(partition, 0), record.offset + 1)
+        self._pending_count += len(records)
+        metrics.set_gauge("async_bg_offsets_uncommitted", self._pending_count, subscriber=self.name)
+
+        if self._closed or self._pending_count >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+    async def flush(self) -> None:
+        """Commits the offsets of all processed messages, up to the first held one."""
+        async with self._lock:
+            if self._timer is not None and self._timer is not asyncio.current_task():
+                self._timer.cancel()
+            self._timer = None
+            if not self._pending or self._consumer is None:
+                return
+            offsets, count = self._pending, self._pending_count
+            self._pending, self._pending_count = {}, 0
+            for partition, held in self._held.items():
+                if partition in offsets and min(held) < offsets[partition]:
+                    # Committed once the held record is released
+                    self._pending[partition] = offsets[partition]
+                    offsets[partition] = min(held)
+            metrics.set_gauge("async_bg_offsets_uncommitted", self._pending_count, subscriber=self.name)
+
+            # Partitions revoked meanwhile are committed by their new owner
+            assignment = self._consumer.assignment()
+            offsets = {partition: offset for partition, offset in offsets.items() if partition in assignment}
+            for partition in self._pending.keys() - assignment:
+                del self._pending[partition]
+            if not offsets:
+                return
+            started = time.perf_counter()
+            try:
+                await self._consumer.commit(offsets)
+            except Exception:
+                # The messages are redelivered after a restart or a rebalance
+                metrics.inc("async_bg_offset_commit_failed_total", subscriber=self.name)
+                logger.warning("Failed to commit offsets of %s messages of %s", count, self.name, exc_info=True)
+            else:
+                metrics.observe("async_bg_offset_commit_sec", time.perf_counter() - started, subscriber=self.name)
+                metrics.inc("async_bg_offset_commits_total", subscriber=self.name)
+
+    async def close(self) -> None:
+        """Flushes the processed offsets; messages processed afterwards are committed one by one."""
+        self._closed = True
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval_sec)
+        await self.flush()
+
+
+class CommitOnRevokeListener(ConsumerRebalanceListener):
+    """Flushes the offsets of a committer before its partitions are handed to another consumer."""
+
+    def __init__(self, committer: OffsetCommitter, listener: ConsumerRebalanceListener | None = None) -> None:
+        self.committer = committer
+        self.listener = listener
+
+    async def on_partitions_revoked(self, revoked: set[TopicPartition]) -> None:
+        await self.committer.flush()
+        if self.listener is not None:
+            result = self.listener.on_partitions_revoked(revoked)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def on_partitions_assigned(self, assigned: set[TopicPartition]) -> None:
+        if self.listener is not None:
+            result = self.listener.on_partitions_assigned(assigned)
+            if asyncio.iscoroutine(result):
+                await result
+
+
+_committers: list[OffsetCommitter] = []
+
+
+def build_offset_committer(name: str) -> OffsetCommitter:
+    """The committer of a subscriber, flushed by `close_offset_committers` at shutdown."""
+    committer = OffsetCommitter(
+        name, settings.KAFKA_COMMIT_BATCH_SIZE, settings.KAFKA_COMMIT_INTERVAL_MS / 1000
+    )
+    _committers.append(committer)
+    return committer
+
+
+async def close_offset_committers() -> None:
+    """Flushes all committers before the subscribers stop (a FastStream on_shutdown hook)."""
+    for committer in _committers:
+        await committer.close()
@@ -0,0 +1,128 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from functools import partial
+from uuid import uuid4
+
+from django.db import transaction
+
+from pydantic import BaseModel
+
+from bazis.contrib.async_background.context import get_deadline, get_task_type, task_headers
+from bazis.contrib.async_background.models import OutboxTask
+from bazis.contrib.async_background.schemas import KafkaTask, TaskStatus
+from bazis.contrib.async_background.utils import (
+    set_and_publish_status,
+    set_and_publish_status_many,
+    status_in,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_task_outbox[Payload: BaseModel](
+    *,
+    topic_name: str,
+    channel_name: str,
+    payload: Payload,
+    partition_marker: str | None = None,
+    deadline_sec: float | None = None,
+    using: str | None = None,
+) -> KafkaTask[Payload]:
+    """
+    Writes the task to the transactional outbox instead of publishing it to Kafka. Called inside
+    `transaction.atomic()`, the task exists only if the transaction commits; `kafka_outbox_relay`
+    publishes it afterwards, so no Kafka round trip is made while handling the request. The
+    deadline counts from the call, including the time the task waits in the outbox.
+    """
+    task_id = str(uuid4())
+    task_type = get_task_type(payload)
+    message = KafkaTask[Payload](
+        task_id=task_id,
+        channel_name=channel_name,
+        deadline=get_deadline(deadline_sec),
+        payload=payload,
+    )
+    OutboxTask.objects.using(using).create(
+        task_id=task_id,
+        topic_name=topic_name,
+        channel_name=channel_name,
+        partition_marker=partition_marker,
+        task_type=task_type,
+        message=message.model_dump(mode="json"),
+    )
+    # The relay may publish the task and a consumer start it before the hook runs
+    transaction.on_commit(
+        partial(
+            set_and_publish_status,
+            task_id,
+            channel_name,
+            TaskStatus.CREATED,
+            task_type=task_type,
+            condition=status_in(None),
+        ),
+        using=using,
+    )
+    return message
+
+
+async def _publish(tasks: list[OutboxTask]) -> list[BaseException | None]:
+    from bazis.contrib.async_background.producer import _get_kafka_producer
+
+    # Sent concurrently, the messages are batched by the producer
+    return await asyncio.gather(
+        *(
+            _get_kafka_producer(task.topic_name).send_one_message(
+                message=task.message,
+                partition_marker=task.partition_marker,
+                headers=task_headers(task.task_type, task.message.get("deadline")),
+            )
+            for task in tasks
+        ),
+        return_exceptions=True,
+    )
+
+
+def relay_outbox_batch(batch_size: int, using: str | None = None) -> int:
+    """
+    Publishes a batch of outbox tasks and deletes the published ones. Rows locked by another
+    relay are skipped, so several relays can run side by side. Returns the number of published
+    tasks; a task whose publication fails stays in the outbox and is retried with the next batch.
+    """
+    from bazis.contrib.async_background.background_loop import producer_loop
+
+    with transaction.atomic(using=using):
+        tasks = list(
+            OutboxTask.objects.using(using).select_for_update(skip_locked=True).order_by("id")[:batch_size]
+        )
+        if not tasks:
+            return 0
+        results = producer_loop.submit(_publish(tasks)).result()
+        published = [task for task, error in zip(tasks, results, strict=True) if error is None]
+        for task, error in zip(tasks, results, strict=True):
+            if error is not None:
+                logger.warning("Failed to publish outbox task %s: %s", task.task_id, error)
+        OutboxTask.objects.using(using).filter(id__in=[task.id for task in published]).delete()
+
+    # Delivery is at-least-once: a relay crashing before the commit publishes the batch again.
+    # A consumer may already have started a published task: only CREATED records become PENDING
+    set_and_publish_status_many(
+        ((task.task_id, task.channel_name, task.task_type) for task in published),
+        TaskStatus.PENDING,
+        condition=status_in(None, TaskStatus.CREATED),
+    )
+    return len(published)
@@ -0,0 +1,179 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from django.conf import settings
+
+from aiokafka.partitioner import murmur2
+
+from bazis.contrib.async_background.metrics import metrics
+
+
+class PartitionAssignment(NamedTuple):
+    """Where a message goes: a message key, an explicit partition, or neither."""
+
+    key: bytes | None = None
+    partition: int | None = None
+
+    def resolve(self, partitions: Sequence[int]) -> int | None:
+        """The partition Kafka will write the message to (None when it is chosen at random)."""
+        if self.partition is not None:
+            return self.partition
+        if self.key is None or not partitions:
+            return None
+        # The same murmur2 hashing as the default partitioner of the Kafka clients
+        return partitions[(murmur2(self.key) & 0x7FFFFFFF) % len(partitions)]
+
+
+class Partitioner:
+    """Base partitioning strategy of the task producer."""
+
+    def assign(self, partition_marker: str | None, partitions: Sequence[int]) -> PartitionAssignment:
+        raise NotImplementedError
+
+
+class KeyHashPartitioner(Partitioner):
+    """Keys messages by `partition_marker`: tasks of one marker keep their order."""
+
+    def assign(self, partition_marker: str | None, partitions: Sequence[int]) -> PartitionAssignment:
+        return PartitionAssignment(key=partition_marker.encode("utf-8") if partition_marker else None)
+
+
+class StickyPartitioner(KeyHashPartitioner):
+    """
+    Sends keyless tasks to one partition until `batch_size` of them have been sent, then moves
+    on to the next partition: the producer fills fewer, larger batches than with a random
+    partition per message while the partitions are still loaded evenly.
+    """
+
+    def __init__(self, batch_size: int) -> None:
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._partition_index = 0
+
+    def assign(self, partition_marker: str | None, partitions: Sequence[int]) -> PartitionAssignment:
+        if partition_marker or not partitions:
+            return super().assign(partition_marker, partitions)
+        with self._lock:
+            if self._sent >= self.batch_size:
+                self._sent = 0
+                self._partition_index += 1
+            self._sent += 1
+            return PartitionAssignment(partition=partitions[self._partition_index % len(partitions)])
+
+
+class SlidingWindowCounter:
+    """Approximate number of events per key over the last `window_sec` seconds."""
+
+    def __init__(self, window_sec: float, buckets: int = 10) -> None:
+        self.bucket_sec = window_sec / buckets
+        self._buckets: deque[tuple[int, Counter]] = deque(maxlen=buckets)
+
+    def add(self, key: str) -> int:
+        """Counts an event and returns the number of events of the key within the window."""
+        bucket_id = int(time.monotonic() / self.bucket_sec)
+        if not self._buckets or self._buckets[-1][0] != bucket_id:
+            self._buckets.append((bucket_id, Counter()))
+        self._buckets[-1][1][key] += 1
+        oldest = bucket_id - self._buckets.maxlen + 1
+        return sum(counter[key] for started, counter in self._buckets if started >= oldest)
+
+
+class HotKeyPartitioner(StickyPartitioner):
+    """
+    Sticky partitioner that spreads channels detected as hot over `salts` sub-keys
+    (`<marker>#<n>`), so one busy channel is processed by several partitions. Tasks of a hot
+    channel lose their relative order while it stays hot.
+    """
+
+    def __init__(self, batch_size: int, threshold: int, window_sec: float, salts: int) -> None:
+        super().__init__(batch_size)
+        self.threshold = threshold
+        self.salts = salts
+        self._counter = SlidingWindowCounter(window_sec)
+        self._salt_cursor = itertools.count()
+        self._hot_keys: set[str] = set()
+
+    def hot_keys(self) -> set[str]:
+        return set(self._hot_keys)
+
+    def assign(self, partition_marker: str | None, partitions: Sequence[int]) -> PartitionAssignment:
+        if not partition_marker:
+            return super().assign(partition_marker, partitions)
+        with self._lock:
+            is_hot = self._counter.add(partition_marker) > self.threshold
+            if not is_hot:
+                self._hot_keys.discard(partition_marker)
+                return super().assign(partition_marker, partitions)
+            if partition_marker not in self._hot_keys:
+                self._hot_keys.add(partition_marker)
+                metrics.inc("async_bg_hot_keys_detected_total")
+            salt = next(self._salt_cursor) % self.salts
+        return PartitionAssignment(key=f"{partition_marker}#{salt}".encode())
+
+
+class PartitionSkewStats:
+    """Number of produced messages by topic partition."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, Counter] = {}
+
+    def record(self, topic_name: str, partition: int | None) -> None:
+        if partition is None:
+            return
+        with self._lock:
+            counts = self._counts.setdefault(topic_name, Counter())
+            counts[partition] += 1
+            metrics.set_gauge(
+                "async_bg_partition_messages", counts[partition], topic=topic_name, partition=partition
+            )
+            metrics.set_gauge("async_bg_partition_skew", self._skew(counts), topic=topic_name)
+
+    @staticmethod
+    def _skew(counts: Counter) -> float:
+        # The busiest partition relative to the mean: 1.0 is a perfectly even spread
+        mean = sum(counts.values()) / len(counts)
+        return max(counts.values()) / mean if mean else 0.0
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                topic_name: {"partitions": dict(counts), "skew": self._skew(counts)}
+                for topic_name, counts in self._counts.items()
+            }
+
+
+partition_stats = PartitionSkewStats()
+
+
+def build_partitioner() -> Partitioner:
+    """The partitioner selected by KAFKA_PARTITIONER."""
+    if settings.KAFKA_PARTITIONER == "sticky":
+        return StickyPartitioner(settings.KAFKA_STICKY_BATCH_SIZE)
+    if settings.KAFKA_PARTITIONER == "hot_key":
+        return HotKeyPartitioner(
+            settings.KAFKA_STICKY_BATCH_SIZE,
+            threshold=settings.KAFKA_HOT_KEY_THRESHOLD,
+            window_sec=settings.KAFKA_HOT_KEY_WINDOW_SEC,
+            salts=settings.KAFKA_HOT_KEY_SALTS,
+        )
+    return KeyHashPartitioner()
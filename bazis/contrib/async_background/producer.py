@@ -15,17 +15,38 @@
 import asyncio
 import logging
 import threading
+import time
+from concurrent.futures import Future
 from uuid import uuid4
 
+from django.conf import settings
+
 from pydantic import BaseModel
 
-from bazis.contrib.async_background.broker import get_broker_for_async
+from faststream.kafka import KafkaBroker
+
+from bazis.contrib.async_background.admission import (
+    admit_enqueue,
+    guarded,
+    kafka_breaker,
+    redis_breaker,
+)
+from bazis.contrib.async_background.background_loop import producer_loop
+from bazis.contrib.async_background.broker import get_aiokafka_producer, start_broker_for_async
+from bazis.contrib.async_background.context import get_deadline, get_task_type, task_headers
+from bazis.contrib.async_background.partitioning import (
+    Partitioner,
+    build_partitioner,
+    partition_stats,
+)
 from bazis.contrib.async_background.schemas import KafkaTask, TaskStatus
-from bazis.contrib.async_background.utils import set_and_publish_status_async
+from bazis.contrib.async_background.utils import set_and_publish_status_async, status_in
 
 
 logger = logging.getLogger(__name__)
 
+PARTITIONS_REFRESH_SEC = 60
+
 
 async def enqueue_task_async[Payload: BaseModel](
     *,
@@ -33,25 +54,66 @@ async def enqueue_task_async[Payload: BaseModel](
     channel_name: str,
     payload: Payload,
     partition_marker: str | None = None,
+    deadline_sec: float | None = None,
 ) -> KafkaTask[Payload]:
-    task_id = str(uuid4())
+    """
+    Registers the task and sends it to Kafka. A task not started within `deadline_sec`
+    (KAFKA_TASK_DEADLINE_SEC by default) is marked EXPIRED by the consumer instead of being run.
+    Raises `admission.AdmissionError` at once, without waiting for Kafka or Redis, above
+    KAFKA_ENQUEUE_MAX_IN_FLIGHT or while a circuit is open.
+    """
     message = KafkaTask[Payload](
-        task_id=task_id,
+        task_id=str(uuid4()),
         channel_name=channel_name,
+        deadline=get_deadline(deadline_sec),
         payload=payload,
     )
+    async with admit_enqueue():
+        await send_task_async(topic_name, message, partition_marker)
+    return message
 
-    await set_and_publish_status_async(
-        task_id=task_id,
-        channel_name=channel_name,
-        status=TaskStatus.CREATED,
-    )
+
+async def send_task_async(
+    topic_name: str, message: KafkaTask, partition_marker: str | None = None, register: bool = True
+) -> None:
+    """
+    Sends a prepared task to Kafka, recording its CREATED and PENDING (or FAILED) statuses. A task
+    continuing an existing record (the reducer of a group) is sent with `register=False`: its
+    record is left as it is until a consumer takes the task.
+    """
+    task_id, channel_name = message.task_id, message.channel_name
+    task_type = get_task_type(message.payload)
+    producer = _get_kafka_producer(topic_name)
+    if not register:
+        await producer.send_one_message(
+            message=message.model_dump(),
+            partition_marker=partition_marker,
+            headers=task_headers(task_type, message.deadline),
+        )
+        return
+
+    # The publish is admitted before the record is written: a rejected task leaves no CREATED record
+    if kafka_breaker is not None:
+        kafka_breaker.before_call()
+    try:
+        async with guarded(redis_breaker):
+            await set_and_publish_status_async(
+                task_id=task_id,
+                channel_name=channel_name,
+                status=TaskStatus.CREATED,
+                task_type=task_type,
+            )
+    except BaseException:
+        if kafka_breaker is not None:
+            kafka_breaker.abandon_call()
+        raise
 
     try:
-        producer = _get_kafka_producer(topic_name)
         await producer.send_one_message(
             message=message.model_dump(),
             partition_marker=partition_marker,
+            headers=task_headers(task_type, message.deadline),
+            admitted=True,
         )
     except Exception as err:
         await set_and_publish_status_async(
@@ -59,74 +121,124 @@ async def enqueue_task_async[Payload: BaseModel](
             channel_name=channel_name,
             status=TaskStatus.FAILED,
             response={"error": str(err)},
+            task_type=task_type,
+            condition=status_in(TaskStatus.CREATED),
         )
         raise
     else:
-        await set_and_publish_status_async(
-            task_id=task_id,
+        # A consumer may have started the task already: only a CREATED record becomes PENDING
+        async with guarded(redis_breaker):
+            await set_and_publish_status_async(
+                task_id=task_id,
+                channel_name=channel_name,
+                status=TaskStatus.PENDING,
+                task_type=task_type,
+                condition=status_in(TaskStatus.CREATED),
+            )
+
+
+def enqueue_task[Payload: BaseModel](
+    *,
+    topic_name: str,
+    channel_name: str,
+    payload: Payload,
+    partition_marker: str | None = None,
+    deadline_sec: float | None = None,
+) -> Future[KafkaTask[Payload]]:
+    """
+    Sync counterpart of `enqueue_task_async` for WSGI views, admin actions and other threads
+    without an event loop. The task is sent by the process-wide producer loop, so all threads
+    share one Kafka connection and their messages are batched together; call `.result()` on
+    the returned future to wait for the delivery (never from the producer loop itself).
+    """
+    return producer_loop.submit(
+        enqueue_task_async(
+            topic_name=topic_name,
             channel_name=channel_name,
-            status=TaskStatus.PENDING,
+            payload=payload,
+            partition_marker=partition_marker,
+            deadline_sec=deadline_sec,
         )
-    return message
+    )
 
 
 class _KafkaProducer:
-    """FastStream Kafka producer with reusable connection lifecycle."""
+    """
+    FastStream Kafka producer of a topic. The connection belongs to the broker of the running
+    event loop, so one producer serves every loop of the process.
+    """
 
-    def __init__(self, topic_name: str) -> None:
+    def __init__(self, topic_name: str, partitioner: Partitioner | None = None) -> None:
         self.topic_name = topic_name
-        self._start_lock = threading.Lock()
-        self._started = False
-        self._loop_id: int | None = None
-        self._broker = None
-
-    async def ensure_started(self) -> None:
-        current_loop_id = id(asyncio.get_running_loop())
-        if self._started and self._loop_id == current_loop_id:
-            return
-        with self._start_lock:
-            current_loop_id = id(asyncio.get_running_loop())
-            if self._started and self._loop_id == current_loop_id:
-                return
-            if self._started and self._loop_id != current_loop_id:
-                self._started = False
-                self._loop_id = None
-                self._broker = None
-            if self._broker is None:
-                self._broker = get_broker_for_async()
-            await self._broker.start()
-            self._started = True
-            self._loop_id = current_loop_id
+        self.partitioner = partitioner or build_partitioner()
+        self._partitions: list[int] = []
+        self._partitions_fetched_at = 0.0
+
+    async def ensure_started(self) -> KafkaBroker:
+        return await start_broker_for_async()
+
+    async def get_partitions(self, broker: KafkaBroker) -> list[int]:
+        """Partitions of the topic, refreshed from the cluster metadata every minute."""
+        if time.monotonic() - self._partitions_fetched_at < PARTITIONS_REFRESH_SEC:
+            return self._partitions
+        self._partitions_fetched_at = time.monotonic()
+        producer = get_aiokafka_producer(broker)
+        if producer is None:
+            # Keyless tasks are then spread by Kafka itself
+            logger.warning("Partitions of topic %s are not available from the broker", self.topic_name)
+            return self._partitions
+        try:
+            partitions = await producer.partitions_for(self.topic_name)
+        except Exception:
+            logger.warning("Failed to fetch partitions of topic %s", self.topic_name, exc_info=True)
+        else:
+            self._partitions = sorted(partitions or ())
+        return self._partitions
 
     async def send_one_message(
         self,
         message: dict,
         partition_marker: str | None = None,
+        headers: dict[str, str] | None = None,
+        admitted: bool = False,
     ) -> None:
-        """Sends a single message to Kafka."""
-        await self.ensure_started()
-        try:
-            await self._broker.publish(
-                message,
-                self.topic_name,
-                key=partition_marker.encode("utf-8") if partition_marker else None,
-            )
-        except Exception:
-            logger.exception("Kafka publish failed.")
-            raise
+        """
+        Sends a single message to Kafka within KAFKA_PUBLISH_TIMEOUT_SEC, connecting included;
+        `admitted` if the Kafka circuit breaker has let the call through already.
+        """
+        async with guarded(kafka_breaker, admitted):
+            try:
+                partition = await asyncio.wait_for(
+                    self._publish(message, partition_marker, headers), settings.KAFKA_PUBLISH_TIMEOUT_SEC
+                )
+            except Exception:
+                logger.exception("Kafka publish failed.")
+                raise
+        partition_stats.record(self.topic_name, partition)
+
+    async def _publish(
+        self, message: dict, partition_marker: str | None, headers: dict[str, str] | None
+    ) -> int | None:
+        broker = await self.ensure_started()
+        partitions = await self.get_partitions(broker)
+        assignment = self.partitioner.assign(partition_marker, partitions)
+        await broker.publish(
+            message,
+            self.topic_name,
+            key=assignment.key,
+            partition=assignment.partition,
+            headers=headers,
+        )
+        return assignment.resolve(partitions)
 
 
-_producer_cache: dict[tuple[str | None, int], _KafkaProducer] = {}
+_producer_cache: dict[str, _KafkaProducer] = {}
+_producer_cache_lock = threading.Lock()
 
 
 def _get_kafka_producer(topic_name: str) -> _KafkaProducer:
-    try:
-        loop_id = id(asyncio.get_running_loop())
-    except RuntimeError:
-        loop_id = None
-    cache_key = (topic_name, loop_id if loop_id is not None else threading.get_ident())
-    producer = _producer_cache.get(cache_key)
+    producer = _producer_cache.get(topic_name)
     if producer is None:
-        producer = _KafkaProducer(topic_name)
-        _producer_cache[cache_key] = producer
+        with _producer_cache_lock:
+            producer = _producer_cache.setdefault(topic_name, _KafkaProducer(topic_name))
     return producer
@@ -0,0 +1,190 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+#: signal that makes a consumer profile itself
+PROFILE_SIGNAL = signal.SIGUSR1
+
+#: interval of sampling the stacks of the asyncio tasks
+TASK_SAMPLE_INTERVAL_SEC = 0.1
+
+
+def _frame_label(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def _collapse_stack(frame: FrameType | None) -> list[str]:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_chain(coro) -> list[str]:
+    # A suspended coroutine only knows its own frame: follow what it awaits down to the future
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+def _write_collapsed(path: Path, counts: Counter) -> None:
+    with path.open("w") as file:
+        for stack, count in counts.most_common():
+            file.write(f"{stack} {count}\n")
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads of the process (wall-clock: a thread waiting in select
+    is sampled too) and the await chains of the asyncio tasks of the loop for `duration_sec`,
+    then writes them in the collapsed-stack format of flame graph tools:
+    `consumer-<pid>-<time>.cpu.collapsed` and `consumer-<pid>-<time>.tasks.collapsed`.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, duration_sec: float, interval_sec: float, output_dir: str
+    ) -> None:
+        self.loop = loop
+        self.duration_sec = duration_sec
+        self.interval_sec = interval_sec
+        self.output_dir = Path(output_dir)
+        self._stacks: Counter = Counter()
+        self._tasks: Counter = Counter()
+        self._tasks_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="async-background-profiler", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        own_thread_id = threading.get_ident()
+        started = time.monotonic()
+        tasks_sampled_at = 0.0
+        while (now := time.monotonic()) - started < self.duration_sec:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread_id:
+                    thread_name = thread_names.get(thread_id, str(thread_id))
+                    self._stacks[";".join([thread_name, *_collapse_stack(frame)])] += 1
+            if now - tasks_sampled_at >= TASK_SAMPLE_INTERVAL_SEC:
+                tasks_sampled_at = now
+                # The tasks can only be inspected from their loop; a blocked loop skips samples
+                try:
+                    self.loop.call_soon_threadsafe(self._sample_tasks)
+                except RuntimeError:
+                    break  # the loop is closed
+            time.sleep(self.interval_sec)
+        self._write()
+
+    def _sample_tasks(self) -> None:
+        chains = [_await_chain(task.get_coro()) for task in asyncio.all_tasks(self.loop)]
+        with self._tasks_lock:
+            for chain in chains:
+                if chain:
+                    self._tasks[";".join(chain)] += 1
+
+    def _write(self) -> None:
+        prefix = self.output_dir / f"consumer-{os.getpid()}-{int(time.time())}"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            _write_collapsed(Path(f"{prefix}.cpu.collapsed"), self._stacks)
+            with self._tasks_lock:
+                _write_collapsed(Path(f"{prefix}.tasks.collapsed"), self._tasks)
+        except OSError:
+            logger.exception("Failed to write the profile to %s", self.output_dir)
+        else:
+            logger.warning("Profile written to %s.{cpu,tasks}.collapsed", prefix)
+
+
+_profiler: SamplingProfiler | None = None
+
+
+def start_profiling(loop: asyncio.AbstractEventLoop) -> None:
+    """Profiles the process for KAFKA_PROFILE_DURATION_SEC, unless a profile is already running."""
+    global _profiler
+    if _profiler is not None and _profiler.running:
+        logger.warning("Profiling of the consumer is already running")
+        return
+    _profiler = SamplingProfiler(
+        loop,
+        settings.KAFKA_PROFILE_DURATION_SEC,
+        settings.KAFKA_PROFILE_INTERVAL_MS / 1000,
+        settings.KAFKA_PROFILE_DIR or tempfile.gettempdir(),
+    )
+    _profiler.start()
+    logger.warning("Profiling the consumer for %ss", settings.KAFKA_PROFILE_DURATION_SEC)
+
+
+_profiled_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _on_profile_signal(signum: int, frame: FrameType | None) -> None:
+    loop = _profiled_loop
+    if loop is None:
+        logger.warning("Profiling signal received before the consumer started, ignored")
+        return
+    try:
+        loop.call_soon_threadsafe(start_profiling, loop)
+    except RuntimeError:
+        logger.warning("Profiling signal received after the consumer stopped, ignored")
+
+
+def install_profile_signal() -> None:
+    """
+    Makes PROFILE_SIGNAL profile the loop set by `profile_running_loop`. Called at the start of
+    the consumer process: the default action of SIGUSR1 terminates it.
+    """
+    try:
+        signal.signal(PROFILE_SIGNAL, _on_profile_signal)
+    except ValueError:
+        # Not the main thread
+        logger.debug("Profiling signal is not available in this process")
+
+
+def profile_running_loop() -> None:
+    """Makes PROFILE_SIGNAL profile the running event loop."""
+    global _profiled_loop
+    _profiled_loop = asyncio.get_running_loop()
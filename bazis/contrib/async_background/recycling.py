@@ -0,0 +1,103 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+from typing import NamedTuple
+
+import psutil
+
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class ResourceSample(NamedTuple):
+    """Resource usage of a consumer process at a moment (monotonic time)."""
+
+    at: float
+    rss_mb: float
+    cpu_percent: float
+
+
+class ChildResources:
+    """Samples the memory and CPU usage of a consumer process started by the supervisor."""
+
+    def __init__(self, process: psutil.Process, warmup_sec: float) -> None:
+        self.process = process
+        self.warmup_sec = warmup_sec
+        self.started_at = time.monotonic()
+        #: first sample after the warm-up, the growth of the process is measured from it
+        self.baseline: ResourceSample | None = None
+        self.last: ResourceSample | None = None
+        # The first call only starts measuring the CPU time
+        self._cpu_percent()
+
+    def sample(self) -> ResourceSample | None:
+        """Takes a sample; None if the process is gone."""
+        try:
+            with self.process.oneshot():
+                sample = ResourceSample(time.monotonic(), self.process.memory_info().rss / MB, self._cpu_percent())
+        except psutil.Error:
+            return None
+        if self.baseline is None and sample.at - self.started_at >= self.warmup_sec:
+            self.baseline = sample
+        self.last = sample
+        return sample
+
+    def _cpu_percent(self) -> float:
+        try:
+            return self.process.cpu_percent(None)
+        except psutil.Error:
+            return 0.0
+
+
+class RecyclePolicy:
+    """
+    Decides when a consumer process is replaced: its RSS exceeds `max_rss_mb`, or it has grown
+    faster than `max_growth_mb_per_hour` since the end of its warm-up, measured over at least
+    `growth_window_sec` so that caches filling up after the start are not taken for a leak.
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: float | None = None,
+        max_growth_mb_per_hour: float | None = None,
+        growth_window_sec: float = 600,
+    ) -> None:
+        self.max_rss_mb = max_rss_mb
+        self.max_growth_mb_per_hour = max_growth_mb_per_hour
+        self.growth_window_sec = growth_window_sec
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rss_mb is not None or self.max_growth_mb_per_hour is not None
+
+    def reason(self, resources: ChildResources) -> str | None:
+        """Why the process should be recycled, None if it is healthy."""
+        sample, baseline = resources.last, resources.baseline
+        if sample is None:
+            return None
+        if self.max_rss_mb is not None and sample.rss_mb > self.max_rss_mb:
+            return f"RSS {sample.rss_mb:.0f}MB exceeds {self.max_rss_mb:.0f}MB"
+        if self.max_growth_mb_per_hour is None or baseline is None:
+            return None
+        elapsed_sec = sample.at - baseline.at
+        if elapsed_sec < self.growth_window_sec:
+            return None
+        growth = (sample.rss_mb - baseline.rss_mb) * 3600 / elapsed_sec
+        if growth > self.max_growth_mb_per_hour:
+            return f"RSS grows by {growth:.0f}MB/h, above {self.max_growth_mb_per_hour:.0f}MB/h"
+        return None
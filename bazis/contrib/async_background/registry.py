@@ -0,0 +1,166 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import threading
+import weakref
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+Closer = Callable[[Any], Awaitable[None]]
+
+
+#: attribute of an event loop holding its clients
+_CLIENTS_ATTRIBUTE = "_async_background_clients"
+
+_LoopClients = dict[str, tuple[Any, Closer | None]]
+
+
+class LoopClientRegistry:
+    """
+    Clients bound to an event loop (Kafka brokers, Redis pools): a client and its connections
+    cannot be shared between loops. Their clients are closed when the loop is closed, so
+    short-lived loops (asgiref, test harnesses) neither leak connections nor hand a dead client
+    to a new loop. The clients are stored on the loop itself: they refer to their loop (futures,
+    connections), so a mapping owned by the registry would keep a dropped loop alive. Loops
+    implemented in C (uvloop) take no attributes: the registry keeps their clients until the
+    loop is closed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._c_loop_clients: dict[asyncio.AbstractEventLoop, _LoopClients] = {}
+
+    def get[Client](
+        self,
+        name: str,
+        factory: Callable[[], Client],
+        closer: Callable[[Client], Awaitable[None]] | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Client:
+        """Returns the `name` client of the loop (the running one by default), creating it once."""
+        loop = loop or asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients(loop)
+            if clients is None:
+                clients = self._add_loop(loop)
+            entry = clients.get(name)
+            if entry is None:
+                entry = clients[name] = (factory(), closer)
+        return entry[0]
+
+    def discard(self, name: str, client: Any, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Forgets the `name` client of the loop if it is still `client`, without closing it."""
+        loop = loop or asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients(loop) or {}
+            if name in clients and clients[name][0] is client:
+                del clients[name]
+
+    async def aclose(self) -> None:
+        """Closes the clients of the running loop, the most recently created first."""
+        with self._lock:
+            clients = self._pop_loop(asyncio.get_running_loop())
+        for name, (client, closer) in reversed(list(clients.items())):
+            if closer is None:
+                continue
+            try:
+                await closer(client)
+            except Exception:
+                logger.warning("Failed to close %s client", name, exc_info=True)
+
+    def _clients(self, loop: asyncio.AbstractEventLoop) -> _LoopClients | None:
+        clients = getattr(loop, _CLIENTS_ATTRIBUTE, None)
+        return clients if clients is not None else self._c_loop_clients.get(loop)
+
+    def _add_loop(self, loop: asyncio.AbstractEventLoop) -> _LoopClients:
+        clients: _LoopClients = {}
+        try:
+            setattr(loop, _CLIENTS_ATTRIBUTE, clients)
+        except AttributeError:
+            self._drop_closed_loops()
+            self._c_loop_clients[loop] = clients
+        self._hook_close(loop)
+        return clients
+
+    def _pop_loop(self, loop: asyncio.AbstractEventLoop) -> _LoopClients:
+        clients = self._c_loop_clients.pop(loop, None)
+        if clients is not None:
+            return clients
+        clients = getattr(loop, _CLIENTS_ATTRIBUTE, None) or {}
+        if hasattr(loop, _CLIENTS_ATTRIBUTE):
+            delattr(loop, _CLIENTS_ATTRIBUTE)
+        return clients
+
+    def _hook_close(self, loop: asyncio.AbstractEventLoop) -> None:
+        original_close = loop.close
+        loop_ref = weakref.ref(loop)
+
+        def close() -> None:
+            closing_loop = loop_ref()
+            if closing_loop is not None and not closing_loop.is_closed() and not closing_loop.is_running():
+                try:
+                    closing_loop.run_until_complete(self.aclose())
+                except Exception:
+                    logger.warning("Failed to close clients of an event loop", exc_info=True)
+            original_close()
+
+        try:
+            loop.close = close
+        except AttributeError:
+            # Loops implemented in C (uvloop) do not accept the hook: their clients are dropped
+            # by `_drop_closed_loops` once the loop is closed
+            pass
+
+    def _drop_closed_loops(self) -> None:
+        for loop in [loop for loop in self._c_loop_clients if loop.is_closed()]:
+            del self._c_loop_clients[loop]
+
+
+loop_clients = LoopClientRegistry()
+
+
+async def prewarm_clients() -> None:
+    """Connects the Kafka producer and the Redis pools of the running loop ahead of the first task."""
+    from bazis.contrib.async_background.broker import start_broker_for_async
+    from bazis.contrib.async_background.storage import task_storage
+
+    await start_broker_for_async()
+    await asyncio.gather(*(client.ping() for client in task_storage.nodes_async()))
+    logger.info("Kafka producer and Redis pools are connected")
+
+
+def install_lifespan(app) -> None:
+    """Wraps the lifespan of a FastAPI application to pre-warm the clients at startup and close them at shutdown."""
+    original_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(lifespan_app):
+        async with original_lifespan(lifespan_app) as state:
+            try:
+                await prewarm_clients()
+            except Exception:
+                # The application still starts: the clients connect again on the first task
+                logger.exception("Failed to pre-warm background task clients")
+            try:
+                yield state
+            finally:
+                await loop_clients.aclose()
+
+    app.router.lifespan_context = lifespan
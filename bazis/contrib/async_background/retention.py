@@ -0,0 +1,38 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.conf import settings
+
+from bazis.contrib.async_background.schemas import TERMINAL_STATUSES, TaskStatus
+
+
+def record_hold_sec(status: TaskStatus, size: int) -> int:
+    """Time to hold a task record of the status and size (in bytes)."""
+    hold_sec = settings.KAFKA_STATUS_HOLD_SEC.get(status.value, settings.KAFKA_RESPONSE_HOLD_SEC)
+    if settings.KAFKA_LARGE_RECORD_BYTES is not None and size > settings.KAFKA_LARGE_RECORD_BYTES:
+        hold_sec = min(hold_sec, settings.KAFKA_LARGE_RECORD_HOLD_SEC)
+    return hold_sec
+
+
+def unread_hold_sec(status: TaskStatus, hold_sec: int) -> int | None:
+    """
+    Shorter time to hold a terminal record whose status was published to a channel without
+    subscribers: nobody is waiting for it, so it is kept only for a late poll. None - keep `hold_sec`.
+    Off unless KAFKA_UNREAD_HOLD_SEC is set, since a client polling over HTTP is never a subscriber.
+    """
+    if status not in TERMINAL_STATUSES or settings.KAFKA_UNREAD_HOLD_SEC is None:
+        return None
+    if settings.KAFKA_UNREAD_HOLD_SEC >= hold_sec:
+        return None
+    return settings.KAFKA_UNREAD_HOLD_SEC
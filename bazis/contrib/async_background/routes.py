@@ -13,16 +13,28 @@
 # limitations under the License.
 
 import json
+from collections.abc import AsyncIterator
 
 from django.utils.translation import gettext_lazy as _
 
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
+from asgiref.sync import sync_to_async
+
+from bazis.contrib.async_background.cancellation import cancel_task_async
+from bazis.contrib.async_background.index import INDEXED_STATUSES, index_stats, stuck_tasks
+from bazis.contrib.async_background.metrics import PROMETHEUS_CONTENT_TYPE, metrics
+from bazis.contrib.async_background.schemas import TERMINAL_STATUSES, TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.streams import iter_result_chunks
 from bazis.contrib.async_background.utils import (
     ChannelNameError,
-    get_redis_async,
+    get_token_from_request,
     resolve_channel_name_async,
+    version_key,
 )
+from bazis.contrib.ws.utils import UserError, get_user_from_token_async
 from bazis.core.errors import JsonApi401Exception, JsonApi403Exception
 from bazis.core.routing import BazisRouter
 
@@ -30,15 +42,14 @@ from bazis.core.routing import BazisRouter
 router = BazisRouter(tags=[_("Async requests")])
 
 
-@router.get("/async_background_response/{task_id}/", response_model=dict)
-async def get_async_background_response(request: Request, task_id: str, full_response: bool = False) -> dict:
-    """Returns the result of a background task by its identifier."""
+async def _get_channel_name(request: Request) -> str:
     try:
-        channel_name = await resolve_channel_name_async(request)
+        return await resolve_channel_name_async(request)
     except ChannelNameError as err:
         raise JsonApi401Exception from err
 
-    redis_data_raw = await get_redis_async().get(task_id)
+
+def _parse_task_record(redis_data_raw: bytes | None, channel_name: str) -> dict:
     if not redis_data_raw:
         raise HTTPException(status_code=404, detail=_("Unknown task ID"))
     try:
@@ -48,10 +59,131 @@ async def get_async_background_response(request: Request, task_id: str, full_res
 
     if channel_name != redis_data["channel_name"]:
         raise JsonApi403Exception
+    return redis_data
+
+
+async def _get_task_record(request: Request, task_id: str) -> dict:
+    """Reads the task record from Redis, checking that it belongs to the channel of the request."""
+    channel_name = await _get_channel_name(request)
+    return _parse_task_record(await task_storage.for_task_async(task_id).get(task_id), channel_name)
+
+
+def _etag(version: bytes, full_response: bool) -> str:
+    # The full record and the bare response are different representations of a version
+    return f'"{version.decode()}{".full" if full_response else ""}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/async_background_response/{task_id}/", response_model=dict)
+async def get_async_background_response(
+    request: Request, response: Response, task_id: str, full_response: bool = False
+) -> dict | Response:
+    """
+    Returns the result of a background task by its identifier, with the version of the task
+    record as its ETag. A poll with `If-None-Match` of an unchanged task gets 304 Not Modified
+    after reading only the version.
+    """
+    channel_name = await _get_channel_name(request)
+    client = task_storage.for_task_async(task_id)
+
+    if if_none_match := request.headers.get("if-none-match"):
+        version, owner = await client.hmget(version_key(task_id), "version", "channel_name")
+        # A foreign task falls through to the full read, which rejects it
+        if version is not None and owner is not None and owner.decode() == channel_name:
+            etag = _etag(version, full_response)
+            if _etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+    pipeline = client.pipeline(transaction=False)
+    pipeline.get(task_id)
+    pipeline.hget(version_key(task_id), "version")
+    redis_data_raw, version = await pipeline.execute()
+    redis_data = _parse_task_record(redis_data_raw, channel_name)
+    if version is not None:
+        response.headers["ETag"] = _etag(version, full_response)
 
     if full_response:
         return redis_data
 
-    response = redis_data.get("response")
-    return response if response is not None else {"status": "not ready"}
+    result = redis_data.get("response")
+    return result if result is not None else {"status": "not ready"}
+
+
+@router.post("/async_background_response/{task_id}/cancel/", response_model=dict)
+async def cancel_async_background_task(request: Request, task_id: str) -> dict:
+    """
+    Cancels a background task of the channel of the request. A queued task is skipped by the
+    consumer; a running one is notified and stops as soon as its handler checks for it.
+    """
+    redis_data = await _get_task_record(request, task_id)
+    # Checked again when the status is written: the task may finish meanwhile
+    if TaskStatus(redis_data["status"]) in TERMINAL_STATUSES or not await cancel_task_async(
+        task_id, redis_data["channel_name"], redis_data.get("task_type")
+    ):
+        raise HTTPException(status_code=409, detail=_("The task is already finished"))
+    return {"status": TaskStatus.CANCELLED.value}
+
+
+@router.get("/async_background_response/{task_id}/stream/")
+async def stream_async_background_response(
+    request: Request, task_id: str, last_id: str = "0"
+) -> StreamingResponse:
+    """
+    Streams the partial results of a background task as newline-delimited JSON, one
+    `{"id", "kind", "data"}` entry per line, until the task is finished. A client that lost
+    the connection resumes with `last_id` of the last entry it received.
+    """
+    await _get_task_record(request, task_id)
+
+    async def lines() -> AsyncIterator[str]:
+        async for entry in iter_result_chunks(task_id, last_id):
+            yield json.dumps(entry, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def _check_staff_user(request: Request) -> None:
+    token = get_token_from_request(request)
+    if not token:
+        raise JsonApi401Exception
+    try:
+        user = await get_user_from_token_async(token)
+    except UserError as err:
+        raise JsonApi401Exception from err
+    if not getattr(user, "is_staff", False):
+        raise JsonApi403Exception
+
+
+def _collect_stats(stuck_sec: float | None, limit: int) -> dict:
+    stats: dict = {"statuses": index_stats()}
+    if stuck_sec is not None:
+        stats["stuck"] = [
+            {"task_id": task_id, "status": status.value, "age_sec": age_sec}
+            for status in INDEXED_STATUSES
+            for task_id, age_sec in stuck_tasks(status, stuck_sec, limit)
+        ]
+    return stats
+
+
+@router.get("/async_background_tasks/stats/", response_model=dict)
+async def get_async_background_stats(request: Request, stuck_sec: float | None = None, limit: int = 100) -> dict:
+    """
+    Returns the number of unfinished background tasks by status with the percentiles of their age
+    and, with `stuck_sec`, the tasks in a status for longer than that. Available to staff users only.
+    """
+    await _check_staff_user(request)
+    return await sync_to_async(_collect_stats, thread_sensitive=False)(stuck_sec, limit)
+
 
+@router.get("/async_background_tasks/metrics/", response_class=PlainTextResponse)
+async def get_async_background_metrics(request: Request) -> PlainTextResponse:
+    """
+    Returns the metrics of the serving process (enqueue admission and circuit breakers) in the
+    Prometheus text format. Available to staff users only; consumers log theirs instead.
+    """
+    await _check_staff_user(request)
+    return PlainTextResponse(metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
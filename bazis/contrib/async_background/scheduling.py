@@ -0,0 +1,227 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterable
+
+from bazis.contrib.async_background.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, at most `burst` accumulated."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def delay(self) -> float:
+        """Takes a token and returns 0, or returns the seconds until a token is available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def reserve(self) -> float:
+        """Takes the next token even if it is not available yet; returns the seconds until it is."""
+        self._refill()
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+
+class ChannelRateLimiter:
+    """Per-channel token buckets; the least recently used buckets are dropped past `max_channels`."""
+
+    def __init__(self, rate: float, burst: int, max_channels: int = 10000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_channels = max_channels
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def _bucket(self, channel_name: str) -> TokenBucket:
+        bucket = self._buckets.get(channel_name)
+        if bucket is None:
+            bucket = self._buckets[channel_name] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_channels:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(channel_name)
+        return bucket
+
+    def delay(self, channel_name: str) -> float:
+        """Takes a token of the channel and returns 0, or returns the seconds until one is available."""
+        wait = self._bucket(channel_name).delay()
+        if wait > 0:
+            metrics.inc("async_bg_channel_throttled_total")
+        return wait
+
+    def reserve(self, channel_name: str) -> float:
+        """Takes the next token of the channel; returns the seconds until it is due."""
+        wait = self._bucket(channel_name).reserve()
+        if wait > 0:
+            metrics.inc("async_bg_channel_throttled_total")
+        return wait
+
+
+class ThrottledTasks:
+    """
+    Runs the tasks of a channel over its rate when their token is due instead of making the
+    consumer wait for it, so the tasks of other channels behind them are not held up. At most
+    `max_deferred` tasks wait at a time; past that the consumer itself waits for the token.
+    """
+
+    def __init__(self, rate_limiter: ChannelRateLimiter, max_deferred: int) -> None:
+        self.rate_limiter = rate_limiter
+        self.max_deferred = max_deferred
+        self._deferred: set[asyncio.Task] = set()
+
+    def deferred(self) -> int:
+        return len(self._deferred)
+
+    async def submit(
+        self,
+        channel_name: str,
+        job: Job,
+        hold: Callable[[], None] | None = None,
+        release: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """
+        Runs the job now if its channel has a token, otherwise schedules it for when the token
+        is due. A deferred job calls `hold` when it is scheduled and `release` once it is done,
+        e.g. to keep the offset of its message from being committed meanwhile.
+        """
+        wait = self.rate_limiter.reserve(channel_name)
+        if wait <= 0:
+            await job()
+            return
+        if len(self._deferred) >= self.max_deferred:
+            await asyncio.sleep(wait)
+            await job()
+            return
+        if hold is not None:
+            hold()
+        deferred = asyncio.create_task(self._run_later(wait, job, release))
+        self._deferred.add(deferred)
+        deferred.add_done_callback(self._done)
+        metrics.set_gauge("async_bg_tasks_deferred", len(self._deferred))
+
+    def _done(self, deferred: asyncio.Task) -> None:
+        self._deferred.discard(deferred)
+        metrics.set_gauge("async_bg_tasks_deferred", len(self._deferred))
+
+    @staticmethod
+    async def _run_later(wait: float, job: Job, release: Callable[[], Awaitable[None]] | None) -> None:
+        try:
+            await asyncio.sleep(wait)
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Deferred task failed")
+        finally:
+            if release is not None:
+                await release()
+
+
+class FairScheduler:
+    """
+    Runs a window of jobs round-robin across channels instead of in arrival order, so one
+    channel's burst cannot hold back the others. Reordering is bounded by the window passed
+    to `run`. Jobs of channels over their rate are not waited for: once only they are left,
+    `run` returns them.
+    """
+
+    def __init__(self, concurrency: int, rate_limiter: ChannelRateLimiter | None = None) -> None:
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = rate_limiter
+        self._backlog: dict[str, int] = {}
+
+    def backlog(self) -> dict[str, int]:
+        """Number of jobs waiting to be started, by channel."""
+        return dict(self._backlog)
+
+    def _set_backlog(self, channel_name: str, size: int) -> None:
+        if size:
+            self._backlog[channel_name] = size
+            metrics.set_gauge("async_bg_channel_backlog", size, channel=channel_name)
+        else:
+            self._backlog.pop(channel_name, None)
+            metrics.clear_gauge("async_bg_channel_backlog", channel=channel_name)
+
+    async def run(self, jobs: Iterable[tuple[str, Job]]) -> list[tuple[str, Job]]:
+        """
+        Runs the jobs; the first job error is raised once every started job has finished.
+        Returns the jobs left when all channels with jobs are over their rate.
+        """
+        queues: dict[str, deque[Job]] = {}
+        for channel_name, job in jobs:
+            queues.setdefault(channel_name, deque()).append(job)
+        for channel_name, queue in queues.items():
+            self._set_backlog(channel_name, len(queue))
+
+        ring = deque(queues)
+        running: set[asyncio.Task] = set()
+        errors: list[BaseException] = []
+
+        while ring or running:
+            wait = self._dispatch(ring, queues, running)
+            if not running:
+                break
+            done, running = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            errors.extend(task.exception() for task in done if task.exception())
+
+        if errors:
+            raise errors[0]
+        left = [(channel_name, job) for channel_name in ring for job in queues[channel_name]]
+        for channel_name in ring:
+            self._set_backlog(channel_name, 0)
+        return left
+
+    def _dispatch(
+        self, ring: deque[str], queues: dict[str, deque[Job]], running: set[asyncio.Task]
+    ) -> float | None:
+        """Starts jobs one channel at a time; returns the shortest rate-limit wait, if any."""
+        wait: float | None = None
+        skipped = 0
+        while ring and len(running) < self.concurrency and skipped < len(ring):
+            channel_name = ring[0]
+            ring.rotate(-1)
+            channel_wait = self.rate_limiter.delay(channel_name) if self.rate_limiter else 0.0
+            if channel_wait > 0:
+                wait = channel_wait if wait is None else min(wait, channel_wait)
+                skipped += 1
+                continue
+            skipped = 0
+            queue = queues[channel_name]
+            running.add(asyncio.create_task(queue.popleft()()))
+            if not queue:
+                # The channel has just been rotated to the end of the ring
+                ring.pop()
+            self._set_backlog(channel_name, len(queue))
+        return wait
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from enum import Enum
 
 from pydantic import BaseModel, Field
@@ -25,6 +26,14 @@ class TaskStatus(str, Enum):
     PROCESSING = "processing"  # The consumer has started processing
     COMPLETED = "completed"  # The task has completed successfully
     FAILED = "failed"  # An error occurred during execution
+    CANCELLED = "cancelled"  # Cancelled by the client before it was completed
+    EXPIRED = "expired"  # The deadline passed before a consumer started it
+
+
+#: statuses after which a task does not change anymore
+TERMINAL_STATUSES = frozenset(
+    {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED, TaskStatus.EXPIRED}
+)
 
 
 class KafkaTask[Payload: BaseModel](BaseModel):
@@ -32,5 +41,30 @@ class KafkaTask[Payload: BaseModel](BaseModel):
 
     task_id: str = Field(..., description="Background task identifier")
     channel_name: str = Field(..., description="Channel name for status updates")
+    deadline: float | None = Field(None, description="Unix time after which the task is not started")
+    group_id: str | None = Field(None, description="Task ID of the group the task is a subtask of")
+    group_index: int | None = Field(None, description="Position of the subtask in its group")
     payload: Payload
 
+    def remaining_time(self) -> float | None:
+        """Seconds left until the deadline (negative once it has passed), None without a deadline."""
+        return None if self.deadline is None else self.deadline - time.time()
+
+
+class TaskEnvelope(BaseModel):
+    """Fields of a task message read without validating its payload."""
+
+    task_id: str
+    channel_name: str
+    deadline: float | None = None
+    group_id: str | None = None
+    group_index: int | None = None
+
+
+class GroupResults(BaseModel):
+    """Payload of the reducer task of a group: the outcome of the subtasks in their order."""
+
+    params: dict = Field(default_factory=dict, description="Parameters of the reducer given at enqueue")
+    statuses: list[TaskStatus] = Field(..., description="Final status of every subtask")
+    results: list[dict | None] = Field(..., description="Response of every subtask")
+
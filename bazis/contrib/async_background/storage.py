@@ -0,0 +1,120 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import hashlib
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+from django.conf import settings
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from bazis.contrib.async_background.registry import loop_clients
+
+
+class HashRing:
+    """Consistent hashing ring: adding or removing a node moves only ~1/N of the keys."""
+
+    def __init__(self, nodes: list[str], replicas: int = 160) -> None:
+        self.nodes = nodes
+        self._points: list[int] = []
+        self._nodes_by_point: dict[int, str] = {}
+        for node in nodes:
+            for replica in range(replicas):
+                point = self._hash(f"{node}#{replica}")
+                self._points.append(point)
+                self._nodes_by_point[point] = node
+        self._points.sort()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def node_for(self, key: str) -> str:
+        if len(self.nodes) == 1:
+            return self.nodes[0]
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._nodes_by_point[self._points[index]]
+
+
+async def _close_redis_async(client: AsyncRedis) -> None:
+    await client.aclose()
+
+
+class TaskStorage:
+    """
+    Redis nodes of the background tasks. Task records (and everything keyed by a task) are
+    sharded across KAFKA_REDIS_NODES by consistent hashing of task_id; status notifications are
+    published to the KAFKA_REDIS_PUBSUB_NODES node chosen by hashing the channel name. Every
+    node has its own sync connection pool and one asyncio pool per event loop.
+    """
+
+    def __init__(self, urls: list[str], pubsub_urls: list[str]) -> None:
+        self.ring = HashRing(urls)
+        self.pubsub_ring = HashRing(pubsub_urls)
+        self._sync_clients = {url: Redis.from_url(url) for url in {*urls, *pubsub_urls}}
+
+    @classmethod
+    def from_settings(cls) -> "TaskStorage":
+        default_url = settings.CACHES['default']['LOCATION']
+        return cls(
+            settings.KAFKA_REDIS_NODES or [default_url],
+            settings.KAFKA_REDIS_PUBSUB_NODES or [default_url],
+        )
+
+    def _async_client(self, url: str) -> AsyncRedis:
+        return loop_clients.get(f"redis:{url}", lambda: AsyncRedis.from_url(url), closer=_close_redis_async)
+
+    def for_task(self, task_id: str) -> Redis:
+        return self._sync_clients[self.ring.node_for(task_id)]
+
+    def for_task_async(self, task_id: str) -> AsyncRedis:
+        return self._async_client(self.ring.node_for(task_id))
+
+    def for_channel(self, channel_name: str) -> Redis:
+        return self._sync_clients[self.pubsub_ring.node_for(channel_name)]
+
+    def for_channel_async(self, channel_name: str) -> AsyncRedis:
+        return self._async_client(self.pubsub_ring.node_for(channel_name))
+
+    def nodes(self) -> list[Redis]:
+        """Sync clients of all task record nodes, e.g. to scan or aggregate them."""
+        return [self._sync_clients[url] for url in self.ring.nodes]
+
+    def nodes_async(self) -> list[AsyncRedis]:
+        return [self._async_client(url) for url in self.ring.nodes]
+
+    def group_by_task[Item](
+        self, items: Iterable[Item], task_id_of: Callable[[Item], str]
+    ) -> list[tuple[Redis, list[Item]]]:
+        """Groups items by the node of their task, to send one pipeline per node."""
+        return self._group(self.ring, items, task_id_of)
+
+    def group_by_channel[Item](
+        self, items: Iterable[Item], channel_name_of: Callable[[Item], str]
+    ) -> list[tuple[Redis, list[Item]]]:
+        return self._group(self.pubsub_ring, items, channel_name_of)
+
+    def _group[Item](
+        self, ring: HashRing, items: Iterable[Item], key_of: Callable[[Item], str]
+    ) -> list[tuple[Redis, list[Item]]]:
+        groups: dict[str, list[Item]] = defaultdict(list)
+        for item in items:
+            groups[ring.node_for(key_of(item))].append(item)
+        return [(self._sync_clients[url], group) for url, group in groups.items()]
+
+
+task_storage = TaskStorage.from_settings()
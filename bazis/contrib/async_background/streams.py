@@ -0,0 +1,92 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections.abc import AsyncIterator
+
+from django.conf import settings
+
+from bazis.contrib.async_background.schemas import TERMINAL_STATUSES, TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+
+
+STREAM_KEY_PREFIX = "async_bg:stream:"
+READ_BLOCK_MS = 1000
+READ_COUNT = 100
+
+
+def _stream_key(task_id: str) -> str:
+    return f"{STREAM_KEY_PREFIX}{task_id}"
+
+
+def _entry_fields(data: dict, kind: str) -> dict[str, str]:
+    return {"kind": kind, "data": json.dumps(data, ensure_ascii=False)}
+
+
+def append_result_chunk(task_id: str, data: dict, kind: str = "chunk") -> None:
+    """
+    Appends a partial result (`kind="chunk"`) or a progress record (`kind="progress"`) to the
+    result stream of the task. The stream keeps the last KAFKA_RESULT_STREAM_MAXLEN entries and
+    expires KAFKA_RESULT_STREAM_TTL_SEC after the last append.
+    """
+    key = _stream_key(task_id)
+    pipeline = task_storage.for_task(task_id).pipeline(transaction=False)
+    pipeline.xadd(key, _entry_fields(data, kind), maxlen=settings.KAFKA_RESULT_STREAM_MAXLEN, approximate=True)
+    pipeline.expire(key, settings.KAFKA_RESULT_STREAM_TTL_SEC)
+    pipeline.execute()
+
+
+async def append_result_chunk_async(task_id: str, data: dict, kind: str = "chunk") -> None:
+    key = _stream_key(task_id)
+    pipeline = task_storage.for_task_async(task_id).pipeline(transaction=False)
+    pipeline.xadd(key, _entry_fields(data, kind), maxlen=settings.KAFKA_RESULT_STREAM_MAXLEN, approximate=True)
+    pipeline.expire(key, settings.KAFKA_RESULT_STREAM_TTL_SEC)
+    await pipeline.execute()
+
+
+async def _is_finished(task_id: str) -> bool:
+    record = await task_storage.for_task_async(task_id).get(task_id)
+    if not record:
+        return True
+    return TaskStatus(json.loads(record)["status"]) in TERMINAL_STATUSES
+
+
+async def iter_result_chunks(task_id: str, last_id: str = "0") -> AsyncIterator[dict]:
+    """
+    Yields `{"id", "kind", "data"}` entries of the result stream after `last_id` as they are
+    appended, until the task reaches a terminal status and the stream is drained. At most
+    READ_COUNT entries are held in memory at a time.
+    """
+    # The stream lives on the node of the task record
+    client = task_storage.for_task_async(task_id)
+    key = _stream_key(task_id)
+    finished = False
+    while True:
+        # Entries appended before the task finished are read without blocking once it has
+        block = None if finished else READ_BLOCK_MS
+        response = await client.xread({key: last_id}, count=READ_COUNT, block=block)
+        if not response:
+            if finished:
+                return
+            # Nothing new within the block time: the last entries may be appended right before
+            # the terminal status, so the stream is read once more after it is seen
+            finished = await _is_finished(task_id)
+            continue
+        for entry_id, fields in response[0][1]:
+            last_id = entry_id.decode()
+            yield {
+                "id": last_id,
+                "kind": fields[b"kind"].decode(),
+                "data": json.loads(fields[b"data"]),
+            }
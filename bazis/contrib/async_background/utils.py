@@ -12,35 +12,86 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import asyncio
 import json
 import logging
+import time
+import warnings
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
 
 from django.conf import settings
 
-from fastapi import Request
+from .cancellation import CANCELLABLE_STATUSES, is_cancelled
+from .context import current_group, current_task_id, current_task_type
+from .index import index_status
+from .notifier import StatusNotifier
+from .retention import record_hold_sec, unread_hold_sec
+from .schemas import TERMINAL_STATUSES, TaskStatus
+from .storage import task_storage
 
-from redis import Redis
-from redis.asyncio import Redis as AsyncRedis
 
-from bazis.contrib.ws.utils import UserError, get_user_from_token_async
+if TYPE_CHECKING:
+    # Consumers import this module: they should not pay for importing the web stack
+    from fastapi import Request
 
-from .schemas import TaskStatus
+    from redis.client import Pipeline
 
 
 logger = logging.getLogger(__name__)
 
-redis = Redis.from_url(settings.CACHES['default']['LOCATION'])
-_redis_async_by_loop: dict[int, AsyncRedis] = {}
+VERSION_KEY_PREFIX = "async_bg:version:"
 
+#: statuses whose notification carries a small response (KAFKA_INLINE_RESPONSE_MAX_BYTES)
+INLINE_RESPONSE_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
 
-def get_redis_async() -> AsyncRedis:
-    loop_id = id(asyncio.get_running_loop())
-    client = _redis_async_by_loop.get(loop_id)
-    if client is None:
-        client = AsyncRedis.from_url(settings.CACHES['default']['LOCATION'])
-        _redis_async_by_loop[loop_id] = client
-    return client
+
+def _get_redis_async():
+    return task_storage.nodes_async()[0]
+
+
+_DEPRECATED_CLIENTS = {
+    "redis": ("task_storage.for_task(task_id)", lambda: task_storage.nodes()[0]),
+    "get_redis_async": ("task_storage.for_task_async(task_id)", lambda: _get_redis_async),
+}
+
+
+def __getattr__(name: str):
+    # The clients of the default cache from before the task records were sharded: they are the
+    # first task node, which is the only one unless KAFKA_REDIS_NODES lists several
+    if name not in _DEPRECATED_CLIENTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    replacement, get_client = _DEPRECATED_CLIENTS[name]
+    warnings.warn(
+        f"utils.{name} is deprecated, use storage.{replacement}", DeprecationWarning, stacklevel=2
+    )
+    return get_client()
+
+
+def version_key(task_id: str) -> str:
+    """Hash of the version of the task record and its channel, read by conditional requests."""
+    return f"{VERSION_KEY_PREFIX}{task_id}"
+
+
+def _bump_version(pipeline, task_id: str, channel_name: str, hold_sec: int) -> None:
+    key = version_key(task_id)
+    pipeline.hincrby(key, "version", 1)
+    pipeline.hset(key, "channel_name", channel_name)
+    pipeline.expire(key, hold_sec)
+
+
+def _publish_many(messages: list[tuple[str, str]]) -> None:
+    for client, node_messages in task_storage.group_by_channel(messages, lambda message: message[0]):
+        pipeline = client.pipeline(transaction=False)
+        for channel_name, message in node_messages:
+            pipeline.publish(channel_name, message)
+        pipeline.execute()
+
+
+status_notifier = StatusNotifier(
+    _publish_many,
+    delay_sec=settings.KAFKA_STATUS_COALESCE_MS / 1000,
+    max_events=settings.KAFKA_STATUS_COALESCE_MAX_EVENTS,
+).install()
 
 
 class StatusStorageError(Exception):
@@ -51,40 +102,145 @@ class ChannelNameError(Exception):
     """Error when resolving channel name."""
 
 
-def set_and_publish_status(
-    task_id: str, channel_name: str, status: TaskStatus, response: dict | None = None
+def _dump_record(status: TaskStatus, channel_name: str, response: dict | None, task_type: str | None) -> str:
+    return json.dumps(
+        {
+            "status": status.value,
+            "channel_name": channel_name,
+            "task_type": task_type,
+            "response": response,
+        },
+        ensure_ascii=False,
+    )
+
+
+#: check of a conditional status write: gets the pipeline watching the task record (commands
+#: run at once on it) and the stored record, None if there is none
+RecordCondition = Callable[["Pipeline", dict | None], bool]
+
+
+def status_in(*statuses: TaskStatus | None) -> RecordCondition:
+    """Condition of a conditional status write: the stored status is one of `statuses` (None - no record)."""
+    values = {None if status is None else status.value for status in statuses}
+
+    def condition(pipeline: "Pipeline", record: dict | None) -> bool:
+        return (record["status"] if record else None) in values
+
+    return condition
+
+
+def _while_unfinished(condition: RecordCondition | None) -> RecordCondition:
+    unfinished = status_in(*CANCELLABLE_STATUSES)
+    if condition is None:
+        return unfinished
+    return lambda pipeline, record: unfinished(pipeline, record) and condition(pipeline, record)
+
+
+def _stored_record(raw_record: bytes | None) -> dict | None:
+    return json.loads(raw_record) if raw_record else None
+
+
+def _queue_record(
+    pipeline: "Pipeline",
+    task_id: str,
+    channel_name: str,
+    status: TaskStatus,
+    record: str,
+    hold_sec: int,
+    now: float | None = None,
 ) -> None:
-    """Saves the task status in Redis and publishes a minimal status to the WS channel."""
+    # The record, its version and its status index change in one transaction
+    pipeline.set(task_id, record, ex=hold_sec)
+    _bump_version(pipeline, task_id, channel_name, hold_sec)
+    index_status(pipeline, task_id, status, now)
+
+
+def _inline_response(
+    status: TaskStatus, response: dict | None, record_size: int, channel_name: str, task_type: str | None
+) -> dict | None:
+    """The response if it is small enough to be sent in the notification of a finished task."""
+    max_bytes = settings.KAFKA_INLINE_RESPONSE_MAX_BYTES
+    if not max_bytes or response is None or status not in INLINE_RESPONSE_STATUSES:
+        return None
+    # The record differs from the record without a response only by the response in place of
+    # "null": measuring it takes serializing that small record, not a separate dump of the
+    # response (an inlined response is still serialized again as part of the notification)
+    response_size = record_size - len(_dump_record(status, channel_name, None, task_type).encode("utf-8")) + 4
+    return response if response_size <= max_bytes else None
+
+
+def set_and_publish_status(
+    task_id: str,
+    channel_name: str,
+    status: TaskStatus,
+    response: dict | None = None,
+    task_type: str | None = None,
+    condition: RecordCondition | None = None,
+) -> bool:
+    """
+    Saves the task status in Redis and publishes a minimal status to the WS channel. The task type
+    defaults to the type of the task processed by the current handler. With `condition` the
+    status is written only if the condition holds for the stored record at the moment of the
+    write (e.g. `status_in(TaskStatus.CREATED)`), so that a concurrent write is not overwritten.
+    Returns whether the status was written. The task of the running handler is written only while
+    it is unfinished, so a handler never overwrites its CANCELLED or another final status.
+    """
+    if task_id == current_task_id.get():
+        if is_cancelled():
+            # Fast path: the cancellation has reached this process
+            logger.info("Not setting %s status of cancelled task %s", status.value, task_id)
+            return False
+        # The cancellation listener may have missed it (pub/sub is best-effort): Redis decides
+        condition = _while_unfinished(condition)
+
+    task_type = task_type or current_task_type.get()
+    record = _dump_record(status, channel_name, response, task_type)
+    record_size = len(record.encode("utf-8"))
+    hold_sec = record_hold_sec(status, record_size)
+    client = task_storage.for_task(task_id)
+
+    def write(pipeline: "Pipeline") -> bool:
+        if condition is not None and not condition(pipeline, _stored_record(pipeline.get(task_id))):
+            return False
+        pipeline.multi()
+        _queue_record(pipeline, task_id, channel_name, status, record, hold_sec)
+        return True
+
     try:
         # Save the full status in Redis (for subsequent retrieval of the result by task_id)
-        redis.set(
-            task_id,
-            json.dumps(
-                {
-                    "status": status.value,
-                    "channel_name": channel_name,
-                    "response": response,
-                },
-                ensure_ascii=False,
-            ),
-            ex=settings.KAFKA_RESPONSE_HOLD_SEC,
-        )
+        if condition is None:
+            pipeline = client.pipeline(transaction=True)
+            _queue_record(pipeline, task_id, channel_name, status, record, hold_sec)
+            pipeline.execute()
+        elif not client.transaction(write, task_id, value_from_callable=True):
+            logger.info("Not setting %s status of task %s: its stored status does not allow it", status.value, task_id)
+            return False
     except Exception as err:
         logger.exception("Failed to set task %s in Redis", task_id)
         raise StatusStorageError(f"Redis set failed: {err}") from err
 
+    if status in TERMINAL_STATUSES and task_id == current_task_id.get() and (group := current_group.get()):
+        _finish_subtask(task_id, group, status, response)
+
+    # A small result is sent with the notification, so that the client does not have to fetch it
+    inline_response = _inline_response(status, response, record_size, channel_name, task_type)
+
+    if settings.KAFKA_STATUS_COALESCE_MS:
+        # Published with the other statuses of the channel a few milliseconds later
+        status_notifier.notify(channel_name, task_id, status, inline_response)
+        return True
+
     try:
         # Prepare a lightweight payload for publication via WebSocket
-        redis.publish(
-            channel_name,
-            json.dumps(
-                {
-                    "status": status.value,
-                    "task_id": task_id,
-                    "action": "async_bg",
-                },
-                ensure_ascii=False,
-            ),
+        message = {
+            "status": status.value,
+            "task_id": task_id,
+            "action": "async_bg",
+        }
+        if inline_response is not None:
+            message["response"] = inline_response
+        receivers = task_storage.for_channel(channel_name).publish(
+            channel_name, json.dumps(message, ensure_ascii=False)
         )
 
         logger.info(
@@ -97,29 +253,130 @@ def set_and_publish_status(
         logger.exception("Failed to publish to channel for task %s", task_id)
         raise StatusStorageError(f"Redis publish failed: {err}") from err
 
+    if not receivers and (unread_sec := unread_hold_sec(status, hold_sec)):
+        try:
+            pipeline = client.pipeline(transaction=False)
+            pipeline.expire(task_id, unread_sec)
+            pipeline.expire(version_key(task_id), unread_sec)
+            pipeline.execute()
+        except Exception:
+            # The record just stays for the regular time
+            logger.warning("Failed to shorten the hold time of task %s", task_id, exc_info=True)
+    return True
+
+
+def _finish_subtask(task_id: str, group: tuple[str, int], status: TaskStatus, response: dict | None) -> None:
+    from .groups import finish_subtask
+
+    try:
+        finish_subtask(*group, status, response)
+    except Exception as err:
+        # Raised so that the subtask is retried: its outcome is counted once
+        logger.exception("Failed to record subtask %s in group %s", task_id, group[0])
+        raise StatusStorageError(f"Group update failed: {err}") from err
+
+
+def set_and_publish_status_many(
+    tasks: Iterable[tuple[str, str, str | None]], status: TaskStatus, condition: RecordCondition | None = None
+) -> list[tuple[str, str, str | None]]:
+    """
+    Saves and publishes one status of many `(task_id, channel_name, task_type)` tasks in one
+    round trip per Redis node. With `condition` only the tasks whose stored record satisfies it
+    are written. Returns the written tasks.
+    """
+    tasks = list(tasks)
+    written: list[tuple[str, str, str | None]] = []
+    now = time.time()
+
+    def queue(pipeline: "Pipeline", node_tasks: list[tuple[str, str, str | None]]) -> None:
+        for task_id, channel_name, task_type in node_tasks:
+            record = _dump_record(status, channel_name, None, task_type)
+            hold_sec = record_hold_sec(status, len(record.encode("utf-8")))
+            _queue_record(pipeline, task_id, channel_name, status, record, hold_sec, now)
+
+    try:
+        for client, node_tasks in task_storage.group_by_task(tasks, lambda task: task[0]):
+            if condition is None:
+                pipeline = client.pipeline(transaction=True)
+                queue(pipeline, node_tasks)
+                pipeline.execute()
+                written.extend(node_tasks)
+                continue
+
+            def write(pipeline: "Pipeline", node_tasks=node_tasks) -> list[tuple[str, str, str | None]]:
+                records = pipeline.mget([task[0] for task in node_tasks])
+                allowed = [
+                    task
+                    for task, raw_record in zip(node_tasks, records, strict=True)
+                    if condition(pipeline, _stored_record(raw_record))
+                ]
+                pipeline.multi()
+                queue(pipeline, allowed)
+                return allowed
+
+            written.extend(
+                client.transaction(write, *(task[0] for task in node_tasks), value_from_callable=True)
+            )
+    except Exception as err:
+        logger.exception("Failed to set %s status of tasks", status.value)
+        raise StatusStorageError(f"Redis pipeline failed: {err}") from err
+
+    if settings.KAFKA_STATUS_COALESCE_MS:
+        for task_id, channel_name, _ in written:
+            status_notifier.notify(channel_name, task_id, status)
+        return written
+    try:
+        _publish_many(
+            [
+                (
+                    channel_name,
+                    json.dumps({"status": status.value, "task_id": task_id, "action": "async_bg"}, ensure_ascii=False),
+                )
+                for task_id, channel_name, _ in written
+            ]
+        )
+    except Exception as err:
+        logger.exception("Failed to publish %s status of tasks", status.value)
+        raise StatusStorageError(f"Redis publish failed: {err}") from err
+    return written
+
 
 async def set_and_publish_status_async(
-    task_id: str, channel_name: str, status: TaskStatus, response: dict | None = None
-) -> None:
+    task_id: str,
+    channel_name: str,
+    status: TaskStatus,
+    response: dict | None = None,
+    task_type: str | None = None,
+    condition: RecordCondition | None = None,
+) -> bool:
     from asgiref.sync import sync_to_async
 
-    await sync_to_async(set_and_publish_status)(
+    # Status writes run in the default executor instead of queueing for the single thread of
+    # thread-sensitive code: they do not touch the ORM or other thread-bound state (the Redis
+    # clients and the notifier are thread-safe), and a group completion blocks its thread until
+    # the producer loop has sent the reducer
+    return await sync_to_async(set_and_publish_status, thread_sensitive=False)(
         task_id,
         channel_name,
         status,
         response,
+        task_type,
+        condition,
     )
 
 
-def _get_token_from_request(request: Request) -> str | None:
+def get_token_from_request(request: "Request") -> str | None:
+    """The bearer token of the request, None without one."""
     authorization = request.headers.get("authorization")
     if not authorization or not authorization.lower().startswith("bearer "):
         return None
     return authorization.split(" ")[1].strip()
 
 
-async def resolve_channel_name_async(request: Request) -> str:
-    token = _get_token_from_request(request)
+async def resolve_channel_name_async(request: "Request") -> str:
+    from bazis.contrib.ws.utils import UserError, get_user_from_token_async
+
+    token = get_token_from_request(request)
 
     if token and token.count('.') == 2:
         try:
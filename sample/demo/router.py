@@ -16,6 +16,7 @@ from django.conf import settings
 
 from fastapi import Request
 
+from bazis.contrib.async_background.admission import AdmissionError
 from bazis.contrib.async_background.producer import enqueue_task_async
 from bazis.contrib.async_background.utils import ChannelNameError, resolve_channel_name_async
 from bazis.core.errors import JsonApi401Exception
@@ -34,10 +35,14 @@ async def enqueue_demo(request: Request, payload: DemoPayload) -> dict:
     except ChannelNameError as err:
         raise JsonApi401Exception from err
 
-    message = await enqueue_task_async(
-        topic_name=settings.KAFKA_TOPIC_ASYNC_BG,
-        channel_name=channel_name,
-        payload=payload,
-        partition_marker=channel_name,
-    )
+    try:
+        message = await enqueue_task_async(
+            topic_name=settings.KAFKA_TOPIC_ASYNC_BG,
+            channel_name=channel_name,
+            payload=payload,
+            partition_marker=channel_name,
+        )
+    except AdmissionError as err:
+        # 429 or 503 with Retry-After instead of holding the worker while Kafka or Redis is degraded
+        raise err.to_http_exception() from err
     return {"data": None, "meta": {"task_id": message.task_id}}
@@ -16,8 +16,9 @@ import logging
 
 from django.conf import settings
 
-from bazis.contrib.async_background.broker import get_broker_for_consumer
+from bazis.contrib.async_background.consumer import task_subscriber
 from bazis.contrib.async_background.schemas import KafkaTask, TaskStatus
+from bazis.contrib.async_background.streams import append_result_chunk_async
 from bazis.contrib.async_background.utils import set_and_publish_status_async
 
 from .schemas import DemoPayload
@@ -26,16 +27,7 @@ from .schemas import DemoPayload
 logger = logging.getLogger(__name__)
 
 
-_subscriber_kwargs: dict[str, object] = {
-    "auto_offset_reset": settings.KAFKA_AUTO_OFFSET_RESET,
-    "auto_commit": settings.KAFKA_ENABLE_AUTO_COMMIT,
-    "auto_commit_interval_ms": settings.KAFKA_AUTO_COMMIT_INTERVAL_MS,
-}
-if settings.KAFKA_GROUP_ID:
-    _subscriber_kwargs["group_id"] = settings.KAFKA_GROUP_ID
-
-
-@get_broker_for_consumer().subscriber(settings.KAFKA_TOPIC_ASYNC_BG, **_subscriber_kwargs)
+@task_subscriber(settings.KAFKA_TOPIC_ASYNC_BG)
 async def consumer_demo_tasks(task: KafkaTask[DemoPayload]):
     await set_and_publish_status_async(
         task_id=task.task_id,
@@ -43,6 +35,8 @@ async def consumer_demo_tasks(task: KafkaTask[DemoPayload]):
         status=TaskStatus.PROCESSING,
     )
 
+    await append_result_chunk_async(task.task_id, {"echo": task.payload.model_dump()})
+
     response = {
         "task_id": task.task_id,
         "status": 200,
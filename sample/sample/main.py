@@ -18,6 +18,8 @@ import os
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sample.settings")
 
 from bazis.core.app import app
+from bazis.contrib.async_background.registry import install_lifespan
 
+install_lifespan(app)
 
 
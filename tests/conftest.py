@@ -18,7 +18,7 @@ import time
 
 import pytest
 
-from bazis.contrib.async_background.utils import redis
+from bazis.contrib.async_background.storage import task_storage
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -33,7 +33,7 @@ def ensure_docker_stack_only():
 def process_async_response():
     def _run(task_id: str, timeout: int = 45) -> dict:
         for _ in range(timeout):
-            if redis_data := redis.get(task_id):
+            if redis_data := task_storage.for_task(task_id).get(task_id):
                 data_dict = json.loads(redis_data.decode("utf-8"))
                 if data_dict.get("status") == "completed":
                     return data_dict
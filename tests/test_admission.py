@@ -0,0 +1,111 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+import pytest
+
+from bazis.contrib.async_background import producer
+from bazis.contrib.async_background.admission import (
+    CircuitBreaker,
+    CircuitOpenError,
+    InFlightLimiter,
+    OverloadedError,
+)
+from bazis.contrib.async_background.metrics import metrics
+from bazis.contrib.async_background.schemas import KafkaTask
+from bazis.contrib.async_background.storage import task_storage
+
+
+class AdmissionPayload(BaseModel):
+    message: str
+
+
+def _open_breaker(name: str) -> CircuitBreaker:
+    breaker = CircuitBreaker(name, failure_threshold=1, slow_call_sec=10, reset_sec=0)
+    breaker.before_call()
+    breaker.after_call(0, failed=True)
+    return breaker
+
+
+def test_circuit_breaker_opens_on_slow_calls_and_closes_after_probe():
+    breaker = CircuitBreaker("slow-test", failure_threshold=2, slow_call_sec=0.5, reset_sec=60)
+
+    breaker.before_call()
+    breaker.after_call(1.0, failed=False)
+    breaker.before_call()
+    breaker.after_call(0.1, failed=True)
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.check()
+    assert exc_info.value.to_http_exception().headers["Retry-After"] == "60"
+    exposition = metrics.render_prometheus()
+    assert 'async_bg_circuit_open{name="slow-test"} 1' in exposition
+    assert 'async_bg_circuit_failed_calls_total{name="slow-test"} 2' in exposition
+
+    breaker.reset_sec = 0
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.after_call(0.1, failed=False)
+    assert not breaker.is_open
+
+
+def test_in_flight_limiter_rejects_above_limit():
+    limiter = InFlightLimiter(limit=1, retry_after_sec=1)
+
+    async def run() -> None:
+        async with limiter.admit():
+            with pytest.raises(OverloadedError):
+                async with limiter.admit():
+                    pass
+        async with limiter.admit():
+            pass
+
+    asyncio.run(run())
+
+
+def test_enqueue_rejected_by_circuit_leaves_no_record(monkeypatch):
+    breaker = _open_breaker("kafka-probing-test")
+    breaker.before_call()  # a probe of another enqueue is in flight
+    monkeypatch.setattr(producer, "kafka_breaker", breaker)
+    message = KafkaTask[AdmissionPayload](
+        task_id=str(uuid4()), channel_name="admission-test", payload=AdmissionPayload(message="rejected")
+    )
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(producer.send_task_async("admission-test", message))
+
+    assert task_storage.for_task(message.task_id).get(message.task_id) is None
+    breaker.abandon_call()
+    breaker.before_call()  # the probe slot is free again
+
+
+def test_hanging_broker_start_is_timed_out(monkeypatch, settings):
+    settings.KAFKA_PUBLISH_TIMEOUT_SEC = 0.05
+    breaker = CircuitBreaker("kafka-start-test", failure_threshold=1, slow_call_sec=10, reset_sec=60)
+    monkeypatch.setattr(producer, "kafka_breaker", breaker)
+    kafka_producer = producer._KafkaProducer("admission-test")
+
+    async def hanging_start():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(kafka_producer, "ensure_started", hanging_start)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(kafka_producer.send_one_message({"task_id": "start-test"}))
+    assert breaker.is_open
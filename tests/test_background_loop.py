@@ -0,0 +1,48 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from pydantic import BaseModel
+
+from bazis.contrib.async_background import producer
+from bazis.contrib.async_background.background_loop import producer_loop
+
+
+class LoopPayload(BaseModel):
+    message: str
+
+
+def test_enqueue_task_is_sent_by_the_shared_producer_loop(monkeypatch):
+    loops: list[asyncio.AbstractEventLoop] = []
+    threads: list[str] = []
+
+    async def send_task_async(topic_name, message, partition_marker=None) -> None:
+        loops.append(asyncio.get_running_loop())
+        threads.append(threading.current_thread().name)
+
+    monkeypatch.setattr(producer, "send_task_async", send_task_async)
+
+    futures = [
+        producer.enqueue_task(topic_name="loop-test", channel_name="loop-test", payload=LoopPayload(message=str(index)))
+        for index in range(2)
+    ]
+
+    assert all(isinstance(future, Future) for future in futures)
+    tasks = [future.result(timeout=5) for future in futures]
+    assert [task.payload.message for task in tasks] == ["0", "1"]
+    assert loops[0] is loops[1] is producer_loop._loop
+    assert threads == [producer_loop.name, producer_loop.name]
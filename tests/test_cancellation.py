@@ -0,0 +1,86 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from uuid import uuid4
+
+from bazis.contrib.async_background.cancellation import (
+    CancellationListener,
+    cancel_task_async,
+    is_cancelled,
+    is_task_cancelled_async,
+)
+from bazis.contrib.async_background.context import current_task_id
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+def test_cancellation_interrupts_running_handler(settings):
+    settings.KAFKA_CANCEL_INTERRUPTS_HANDLERS = True
+    task_id = str(uuid4())
+
+    async def run() -> bool:
+        listener = CancellationListener()
+        await asyncio.wait_for(listener.subscribed.wait(), 10)
+        started = asyncio.Event()
+
+        async def handler() -> None:
+            started.set()
+            await asyncio.sleep(30)
+
+        async def cancel() -> None:
+            await started.wait()
+            await cancel_task_async(task_id, "cancel-test")
+
+        try:
+            completed, _ = await asyncio.gather(
+                asyncio.wait_for(listener.run(task_id, handler()), 10), cancel()
+            )
+        finally:
+            await listener.aclose()
+        assert await is_task_cancelled_async(task_id)
+        return completed
+
+    assert asyncio.run(run()) is False
+    token = current_task_id.set(task_id)
+    try:
+        assert is_cancelled()
+    finally:
+        current_task_id.reset(token)
+
+
+def test_cancellation_leaves_finished_task():
+    task_id = str(uuid4())
+    set_and_publish_status(task_id, "cancel-test", TaskStatus.COMPLETED, response={"ok": True})
+
+    assert asyncio.run(cancel_task_async(task_id, "cancel-test")) is False
+    record = json.loads(task_storage.for_task(task_id).get(task_id))
+    assert record["status"] == "completed"
+    assert record["response"] == {"ok": True}
+
+
+def test_handler_does_not_overwrite_missed_cancellation():
+    task_id = str(uuid4())
+    # Cancelled while no listener of this process was subscribed
+    set_and_publish_status(task_id, "cancel-test", TaskStatus.CANCELLED)
+
+    token = current_task_id.set(task_id)
+    try:
+        assert not is_cancelled()
+        assert not set_and_publish_status(task_id, "cancel-test", TaskStatus.COMPLETED, response={"ok": True})
+    finally:
+        current_task_id.reset(token)
+    assert json.loads(task_storage.for_task(task_id).get(task_id))["status"] == "cancelled"
@@ -0,0 +1,65 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from bazis.contrib.async_background.consumer import _expire_if_late
+from bazis.contrib.async_background.context import DEADLINE_HEADER, task_headers
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+def _record(task_id: str, deadline: float) -> SimpleNamespace:
+    value = json.dumps(
+        {"task_id": task_id, "channel_name": "deadline-test", "deadline": deadline, "payload": {"unused": 1}}
+    ).encode()
+    headers = [(key, value.encode()) for key, value in task_headers("DemoPayload", deadline).items()]
+    return SimpleNamespace(headers=headers, value=value, partition=0, offset=0)
+
+
+def test_consumer_expires_tasks_past_deadline():
+    late_task_id, timely_task_id = str(uuid4()), str(uuid4())
+
+    assert asyncio.run(_expire_if_late(_record(late_task_id, time.time() - 1)))
+    assert not asyncio.run(_expire_if_late(_record(timely_task_id, time.time() + 60)))
+
+    record = json.loads(task_storage.for_task(late_task_id).get(late_task_id))
+    assert record["status"] == "expired"
+    assert record["task_type"] == "DemoPayload"
+    assert task_storage.for_task(timely_task_id).get(timely_task_id) is None
+
+
+def test_consumer_ignores_malformed_deadline():
+    task_id = str(uuid4())
+    for malformed in (b"soon", b"nan", b"\xff"):
+        record = _record(task_id, time.time() - 1)
+        record.headers = [
+            (key, malformed if key == DEADLINE_HEADER else value) for key, value in record.headers
+        ]
+        assert not asyncio.run(_expire_if_late(record))
+    assert task_storage.for_task(task_id).get(task_id) is None
+
+
+def test_consumer_does_not_expire_finished_task():
+    task_id = str(uuid4())
+    set_and_publish_status(task_id, "deadline-test", TaskStatus.CANCELLED)
+
+    # A redelivered message of a cancelled task is skipped, its status stays
+    assert asyncio.run(_expire_if_late(_record(task_id, time.time() - 1)))
+    assert json.loads(task_storage.for_task(task_id).get(task_id))["status"] == "cancelled"
@@ -45,3 +45,30 @@ def test_demo_enqueue_and_result(sample_app, process_async_response):
     )
     assert response.status_code == 200
     assert response.json()["response"]["echo"] == payload
+
+
+@pytest.mark.run_with_consumer
+@pytest.mark.django_db(transaction=True)
+def test_demo_result_stream(sample_app, process_async_response):
+    channel_name = "test-channel"
+    payload = {"message": "stream me"}
+
+    response = get_api_client(sample_app).post(
+        "/api/v1/demo/enqueue/",
+        data=json.dumps(payload),
+        headers={
+            "Authorization": f"Bearer {channel_name}",
+            "Content-Type": "application/json",
+        },
+    )
+    task_id = response.json()["meta"]["task_id"]
+    process_async_response(task_id)
+
+    response = get_api_client(sample_app).get(
+        f"/api/v1/async_background_response/{task_id}/stream/",
+        headers={"Authorization": f"Bearer {channel_name}"},
+    )
+    assert response.status_code == 200
+    entries = [json.loads(line) for line in response.text.splitlines()]
+    assert [entry["kind"] for entry in entries] == ["chunk"]
+    assert entries[0]["data"]["echo"] == payload
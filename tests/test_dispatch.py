@@ -0,0 +1,138 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import ClassVar
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+import pytest
+
+from bazis.contrib.async_background import broker
+from bazis.contrib.async_background.consumer import TaskDispatcher, _run_task
+from bazis.contrib.async_background.context import (
+    TASK_TYPE_HEADER,
+    current_group,
+    current_task_id,
+    current_task_type,
+    task_type_of,
+)
+from bazis.contrib.async_background.schemas import KafkaTask
+from bazis.contrib.async_background.storage import task_storage
+
+
+class ReportPayload(BaseModel):
+    report_id: int
+
+
+class ExportPayload(BaseModel):
+    path: str
+
+
+@pytest.fixture(autouse=True)
+def local_consumer_broker(monkeypatch):
+    # The subscribers of the dispatchers of the tests must not reach the consumer broker of the process
+    monkeypatch.setattr(broker, "_consumer_broker", None)
+
+
+def _record(task_type: str | bytes | None, payload: dict, task_id: str = "task-1") -> SimpleNamespace:
+    value = json.dumps({"task_id": task_id, "channel_name": "channel", "payload": payload}).encode()
+    if isinstance(task_type, str):
+        task_type = task_type.encode()
+    headers = [(TASK_TYPE_HEADER, task_type)] if task_type else []
+    return SimpleNamespace(headers=headers, value=value, partition=0, offset=0)
+
+
+def test_dispatcher_routes_by_task_type_header():
+    dispatcher = TaskDispatcher("test-dispatch")
+
+    @dispatcher.handler(default=True)
+    async def consume_report(task: KafkaTask[ReportPayload]) -> None: ...
+
+    @dispatcher.handler
+    async def consume_export(task: KafkaTask[ExportPayload]) -> None: ...
+
+    export_type = task_type_of(ExportPayload)
+    assert export_type == f"{__name__}.ExportPayload"
+    handler, task = asyncio.run(dispatcher._resolve(_record(export_type, {"path": "/tmp/x"})))
+    assert handler is consume_export
+    assert task.payload == ExportPayload(path="/tmp/x")
+
+    handler, task = asyncio.run(dispatcher._resolve(_record(None, {"report_id": 1})))
+    assert handler is consume_report
+
+    # Messages sent with the bare schema name before the upgrade
+    handler, task = asyncio.run(dispatcher._resolve(_record("ExportPayload", {"path": "/tmp/x"})))
+    assert handler is consume_export
+
+
+def test_dispatcher_fails_unknown_task_type():
+    dispatcher = TaskDispatcher("test-dispatch-unknown")
+
+    @dispatcher.handler
+    async def consume_report(task: KafkaTask[ReportPayload]) -> None: ...
+
+    task_id = str(uuid4())
+    assert asyncio.run(dispatcher._resolve(_record("UnknownPayload", {"report_id": 1}, task_id))) is None
+
+    record = json.loads(task_storage.for_task(task_id).get(task_id))
+    assert record["status"] == "failed"
+    assert record["task_type"] == "UnknownPayload"
+    assert record["response"] == {"error": "Unknown task type: UnknownPayload"}
+
+
+def test_dispatcher_fails_malformed_task_type():
+    dispatcher = TaskDispatcher("test-dispatch-malformed")
+
+    @dispatcher.handler(default=True)
+    async def consume_report(task: KafkaTask[ReportPayload]) -> None: ...
+
+    task_id = str(uuid4())
+    assert asyncio.run(dispatcher._resolve(_record(b"Report\xff", {"report_id": 1}, task_id))) is None
+
+    record = json.loads(task_storage.for_task(task_id).get(task_id))
+    assert record["status"] == "failed"
+    assert record["task_type"] == "Report\ufffd"
+
+
+def test_unknown_task_type_does_not_inherit_the_previous_task():
+    dispatcher = TaskDispatcher("test-dispatch-context")
+
+    @dispatcher.handler
+    async def consume_report(task: KafkaTask[ReportPayload]) -> None: ...
+
+    task_id = str(uuid4())
+
+    async def main() -> None:
+        # Both messages are processed in the context of the subscriber
+        handler, task = await dispatcher._resolve(_record(task_type_of(ReportPayload), {"report_id": 1}))
+        await _run_task(handler, task)
+        assert (current_task_type.get(), current_task_id.get(), current_group.get()) == (None, None, None)
+        await dispatcher._resolve(_record(None, {"report_id": 2}, task_id))
+
+    asyncio.run(main())
+
+    record = json.loads(task_storage.for_task(task_id).get(task_id))
+    assert record["status"] == "failed"
+    assert record["task_type"] is None
+
+
+def test_explicit_task_type():
+    class NamedPayload(BaseModel):
+        __task_type__: ClassVar[str] = "named"
+
+    assert task_type_of(NamedPayload) == "named"
@@ -0,0 +1,50 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from uuid import uuid4
+
+from bazis_test_utils.utils import get_api_client
+
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+def test_result_polling_with_etag(sample_app):
+    channel_name, task_id = "etag-channel", str(uuid4())
+    url = f"/api/v1/async_background_response/{task_id}/"
+    auth = {"Authorization": f"Bearer {channel_name}"}
+    set_and_publish_status(task_id, channel_name, TaskStatus.PROCESSING)
+
+    response = get_api_client(sample_app).get(url, headers=auth)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = get_api_client(sample_app).get(url, headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    # Another channel does not learn anything from the version
+    response = get_api_client(sample_app).get(
+        url, headers={"Authorization": "Bearer other-channel", "If-None-Match": etag}
+    )
+    assert response.status_code == 403
+
+    set_and_publish_status(task_id, channel_name, TaskStatus.COMPLETED, response={"answer": 42})
+    response = get_api_client(sample_app).get(url, headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == {"answer": 42}
+    assert response.headers["ETag"] != etag
+
+    full = get_api_client(sample_app).get(f"{url}?full_response=true", headers=auth)
+    assert full.headers["ETag"] not in (etag, response.headers["ETag"])
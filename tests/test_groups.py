@@ -0,0 +1,183 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from demo.schemas import DemoPayload
+
+from bazis.contrib.async_background import producer, utils
+from bazis.contrib.async_background.cancellation import (
+    cancel_task_async,
+    get_cancellation_listener,
+    is_cancelled,
+)
+from bazis.contrib.async_background.consumer import _run_task
+from bazis.contrib.async_background.context import current_task_id
+from bazis.contrib.async_background.groups import _create_group, finish_subtask
+from bazis.contrib.async_background.schemas import KafkaTask, TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.utils import set_and_publish_status_async
+
+
+def _record(task_id: str) -> dict:
+    return json.loads(task_storage.for_task(task_id).get(task_id))
+
+
+def test_group_aggregates_subtasks_once():
+    group_id = str(uuid4())
+    _create_group(group_id, "group-test", 2, None, None)
+    assert _record(group_id)["response"] == {"total": 2, "done": 0, "failed": 0}
+
+    finish_subtask(group_id, 1, TaskStatus.FAILED, {"error": "boom"})
+    finish_subtask(group_id, 1, TaskStatus.FAILED, {"error": "boom"})  # redelivered
+    record = _record(group_id)
+    assert record["status"] == "processing"
+    assert record["response"] == {"total": 2, "done": 1, "failed": 1}
+
+    finish_subtask(group_id, 0, TaskStatus.COMPLETED, {"value": 42})
+    record = _record(group_id)
+    assert record["status"] == "failed"
+    assert record["response"]["statuses"] == ["completed", "failed"]
+    assert record["response"]["results"] == [{"value": 42}, {"error": "boom"}]
+
+
+def test_group_completion_is_retried_after_reducer_send_failure(monkeypatch):
+    group_id = str(uuid4())
+    _create_group(group_id, "group-test", 2, "group-test-reducer", {"mode": "sum"})
+    sent = []
+
+    async def send_task_async(topic_name, message, partition_marker=None, register=True):
+        assert not register  # the group record is not reset to CREATED
+        if not sent:
+            sent.append(None)
+            raise RuntimeError("broker unavailable")
+        sent.append(message)
+
+    monkeypatch.setattr(producer, "send_task_async", send_task_async)
+    finish_subtask(group_id, 0, TaskStatus.COMPLETED, {"value": 1})
+    with pytest.raises(RuntimeError):
+        finish_subtask(group_id, 1, TaskStatus.COMPLETED, {"value": 2})
+
+    finish_subtask(group_id, 1, TaskStatus.COMPLETED, {"value": 2})  # retried
+    reducer = sent[-1]
+    assert reducer.task_id == group_id
+    assert reducer.payload.params == {"mode": "sum"}
+    assert reducer.payload.results == [{"value": 1}, {"value": 2}]
+
+    finish_subtask(group_id, 1, TaskStatus.COMPLETED, {"value": 2})  # late duplicate
+    assert len(sent) == 2
+    assert _record(group_id)["status"] == "processing"
+
+
+def _delay_progress_write(monkeypatch, before_write) -> None:
+    """Runs `before_write` once, between counting a subtask and writing the group progress."""
+    original = utils.set_and_publish_status
+    pending = [before_write]
+
+    def set_and_publish_status(task_id, channel_name, status, *args, **kwargs):
+        if status == TaskStatus.PROCESSING and pending:
+            pending.pop()()
+        return original(task_id, channel_name, status, *args, **kwargs)
+
+    monkeypatch.setattr(utils, "set_and_publish_status", set_and_publish_status)
+
+
+def test_group_progress_does_not_reopen_completed_group(monkeypatch):
+    group_id = str(uuid4())
+    _create_group(group_id, "group-test", 2, None, None)
+    # The final subtask completes the group before the other one writes its progress
+    _delay_progress_write(monkeypatch, lambda: finish_subtask(group_id, 1, TaskStatus.COMPLETED, {"value": 2}))
+
+    finish_subtask(group_id, 0, TaskStatus.COMPLETED, {"value": 1})
+
+    record = _record(group_id)
+    assert record["status"] == "completed"
+    assert record["response"]["results"] == [{"value": 1}, {"value": 2}]
+
+
+def test_group_progress_never_goes_down(monkeypatch):
+    group_id = str(uuid4())
+    _create_group(group_id, "group-test", 3, None, None)
+    _delay_progress_write(monkeypatch, lambda: finish_subtask(group_id, 1, TaskStatus.COMPLETED, None))
+
+    finish_subtask(group_id, 0, TaskStatus.COMPLETED, None)
+
+    record = _record(group_id)
+    assert record["status"] == "processing"
+    assert record["response"] == {"total": 3, "done": 2, "failed": 0}
+
+
+def test_group_counts_subtask_stopped_by_cancellation():
+    group_id = str(uuid4())
+    _create_group(group_id, "group-test", 1, None, None)
+    task = KafkaTask[DemoPayload](
+        task_id=str(uuid4()),
+        channel_name="group-test",
+        group_id=group_id,
+        group_index=0,
+        payload=DemoPayload(message="cancel me"),
+    )
+
+    started = asyncio.Event()
+
+    async def handler(task: KafkaTask[DemoPayload]) -> None:
+        started.set()
+        while not is_cancelled():
+            await asyncio.sleep(0.05)
+        # Stops early: its final status is not written over the cancellation
+        await set_and_publish_status_async(task.task_id, task.channel_name, TaskStatus.COMPLETED)
+
+    async def cancel() -> None:
+        await started.wait()
+        await asyncio.wait_for(get_cancellation_listener().subscribed.wait(), 10)
+        await cancel_task_async(task.task_id, task.channel_name)
+
+    async def run() -> None:
+        await asyncio.wait_for(asyncio.gather(_run_task(handler, task), cancel()), 10)
+
+    asyncio.run(run())
+
+    assert _record(task.task_id)["status"] == "cancelled"
+    record = _record(group_id)
+    assert record["status"] == "failed"
+    assert record["response"]["statuses"] == ["cancelled"]
+
+
+def test_group_counts_subtask_whose_cancellation_was_missed():
+    group_id = str(uuid4())
+    _create_group(group_id, "group-test", 1, None, None)
+    task = KafkaTask[DemoPayload](
+        task_id=str(uuid4()),
+        channel_name="group-test",
+        group_id=group_id,
+        group_index=0,
+        payload=DemoPayload(message="cancelled unnoticed"),
+    )
+
+    async def handler(task: KafkaTask[DemoPayload]) -> None:
+        # Cancelled by the client without this process hearing of it
+        token = current_task_id.set(None)
+        try:
+            await set_and_publish_status_async(task.task_id, task.channel_name, TaskStatus.CANCELLED)
+        finally:
+            current_task_id.reset(token)
+        await set_and_publish_status_async(task.task_id, task.channel_name, TaskStatus.PROCESSING)
+
+    asyncio.run(_run_task(handler, task))
+
+    assert _record(task.task_id)["status"] == "cancelled"
+    assert _record(group_id)["response"]["statuses"] == ["cancelled"]
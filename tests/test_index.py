@@ -0,0 +1,66 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from uuid import uuid4
+
+from bazis.contrib.async_background.index import index_stats, reap_stuck_task, stuck_tasks
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+def _stuck_ids(status: TaskStatus) -> set[str]:
+    return {task_id for task_id, _ in stuck_tasks(status, older_than_sec=0, limit=10000)}
+
+
+def test_status_index_follows_task_transitions():
+    task_id = str(uuid4())
+
+    set_and_publish_status(task_id, "index-test", TaskStatus.PENDING)
+    assert task_id in _stuck_ids(TaskStatus.PENDING)
+    assert index_stats()["pending"]["depth"] >= 1
+
+    set_and_publish_status(task_id, "index-test", TaskStatus.PROCESSING)
+    assert task_id not in _stuck_ids(TaskStatus.PENDING)
+    assert task_id in _stuck_ids(TaskStatus.PROCESSING)
+
+    set_and_publish_status(task_id, "index-test", TaskStatus.COMPLETED)
+    assert task_id not in _stuck_ids(TaskStatus.PROCESSING)
+
+
+def _status(task_id: str) -> str:
+    return json.loads(task_storage.for_task(task_id).get(task_id))["status"]
+
+
+def test_reaper_fails_stuck_tasks():
+    task_id = str(uuid4())
+    set_and_publish_status(task_id, "index-test", TaskStatus.PROCESSING)
+
+    assert reap_stuck_task(task_id, TaskStatus.PROCESSING, older_than_sec=0)
+    assert _status(task_id) == "failed"
+    assert task_id not in _stuck_ids(TaskStatus.PROCESSING)
+
+
+def test_reaper_skips_tasks_that_moved_on():
+    task_id = str(uuid4())
+    set_and_publish_status(task_id, "index-test", TaskStatus.PROCESSING)
+    set_and_publish_status(task_id, "index-test", TaskStatus.COMPLETED)
+    assert not reap_stuck_task(task_id, TaskStatus.PROCESSING, older_than_sec=0)
+    assert _status(task_id) == "completed"
+
+    # Retried after being listed as stuck: in the status again, but not for long
+    set_and_publish_status(task_id, "index-test", TaskStatus.PROCESSING)
+    assert not reap_stuck_task(task_id, TaskStatus.PROCESSING, older_than_sec=60)
+    assert _status(task_id) == "processing"
@@ -0,0 +1,55 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+
+from bazis.contrib.async_background.loop_monitor import LoopMonitor, run_measured
+from bazis.contrib.async_background.metrics import metrics
+
+
+async def blocking_handler() -> str:
+    await asyncio.sleep(0.05)
+    time.sleep(0.3)  # a sync call made by mistake
+    await asyncio.sleep(0.05)
+    return "done"
+
+
+def test_blocking_handler_is_detected(settings, caplog):
+    settings.KAFKA_LOOP_BLOCK_THRESHOLD_SEC = 0.1
+
+    async def main() -> str:
+        monitor = LoopMonitor(interval_sec=0.02, block_threshold_sec=0.1).start()
+        try:
+            return await run_measured("blocking_handler", blocking_handler())
+        finally:
+            monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="bazis.contrib.async_background.loop_monitor"):
+        assert asyncio.run(main()) == "done"
+
+    snapshot = metrics.snapshot()
+    wall = snapshot['async_bg_handler_wall_sec_max{handler="blocking_handler"}']
+    blocked = snapshot['async_bg_handler_blocked_sec_max{handler="blocking_handler"}']
+    assert 0.3 <= blocked < wall
+    assert snapshot["async_bg_loop_lag_sec_max"] >= 0.2
+    assert snapshot["async_bg_loop_blocked_total"] >= 1
+    assert "async_bg_loop_lag_last_sec" in snapshot
+    exposition = metrics.render_prometheus()
+    assert "# TYPE async_bg_loop_lag_sec summary" in exposition
+    assert "# TYPE async_bg_loop_blocked_total counter" in exposition
+    # The watchdog points at the blocking line
+    assert any("time.sleep(0.3)" in record.getMessage() for record in caplog.records)
+    assert any("Handler blocking_handler blocked" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,53 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+from bazis.contrib.async_background.metrics import MetricsRegistry, metrics, start_metrics_log
+
+
+def test_metrics_are_rendered_in_prometheus_format():
+    registry = MetricsRegistry()
+    registry.set_gauge("async_bg_channel_backlog", 3, channel='say "hi"')
+    registry.inc("async_bg_tasks_expired_total")
+    registry.observe("async_bg_offset_commit_sec", 0.5, subscriber="consume")
+    registry.observe("async_bg_offset_commit_sec", 1.5, subscriber="consume")
+
+    assert registry.render_prometheus().splitlines() == [
+        "# TYPE async_bg_channel_backlog gauge",
+        'async_bg_channel_backlog{channel="say \\"hi\\""} 3',
+        "# TYPE async_bg_offset_commit_sec summary",
+        'async_bg_offset_commit_sec_count{subscriber="consume"} 2',
+        'async_bg_offset_commit_sec_sum{subscriber="consume"} 2.0',
+        "# TYPE async_bg_offset_commit_sec_max gauge",
+        'async_bg_offset_commit_sec_max{subscriber="consume"} 1.5',
+        "# TYPE async_bg_tasks_expired_total counter",
+        "async_bg_tasks_expired_total 1",
+    ]
+
+
+def test_metrics_are_logged_periodically(caplog):
+    metrics.inc("async_bg_tasks_expired_total")
+
+    async def main() -> None:
+        task = start_metrics_log(0.02)
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    with caplog.at_level(logging.INFO, logger="bazis.contrib.async_background.metrics"):
+        asyncio.run(main())
+
+    assert any("async_bg_tasks_expired_total=" in record.getMessage() for record in caplog.records)
+    assert start_metrics_log(None) is None
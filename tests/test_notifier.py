@@ -0,0 +1,69 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+from uuid import uuid4
+
+from bazis.contrib.async_background.notifier import StatusNotifier
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+def test_status_notifier_collapses_superseded_statuses():
+    published: list[tuple[str, str]] = []
+    notifier = StatusNotifier(published.extend, delay_sec=60, max_events=100)
+
+    notifier.notify("channel", "task-1", TaskStatus.CREATED)
+    notifier.notify("channel", "task-2", TaskStatus.CREATED)
+    notifier.notify("channel", "task-1", TaskStatus.PENDING)
+    notifier.notify("channel", "task-2", TaskStatus.FAILED)
+    notifier.notify("channel", "task-1", TaskStatus.COMPLETED)
+    notifier.flush()
+
+    assert len(published) == 1
+    channel_name, message = published[0]
+    assert channel_name == "channel"
+    assert json.loads(message) == {
+        "action": "async_bg_batch",
+        "events": [
+            {"task_id": "task-2", "status": "failed"},
+            {"task_id": "task-1", "status": "completed"},
+        ],
+    }
+
+
+def test_small_responses_are_inlined_in_notifications(settings):
+    settings.KAFKA_STATUS_COALESCE_MS = 0
+    settings.KAFKA_INLINE_RESPONSE_MAX_BYTES = 100
+    channel_name = f"inline-{uuid4()}"
+    small_task_id, large_task_id = str(uuid4()), str(uuid4())
+    pubsub = task_storage.for_channel(channel_name).pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(channel_name)
+    try:
+        set_and_publish_status(small_task_id, channel_name, TaskStatus.COMPLETED, response={"answer": 42})
+        set_and_publish_status(large_task_id, channel_name, TaskStatus.COMPLETED, response={"text": "x" * 200})
+        messages = []
+        deadline = time.monotonic() + 5
+        while len(messages) < 2 and time.monotonic() < deadline:
+            if message := pubsub.get_message(timeout=0.5):
+                messages.append(json.loads(message["data"]))
+    finally:
+        pubsub.close()
+
+    assert messages == [
+        {"status": "completed", "task_id": small_task_id, "action": "async_bg", "response": {"answer": 42}},
+        {"status": "completed", "task_id": large_task_id, "action": "async_bg"},
+    ]
@@ -0,0 +1,110 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+from aiokafka import TopicPartition
+
+from bazis.contrib.async_background.metrics import metrics
+from bazis.contrib.async_background.offsets import CommitOnRevokeListener, OffsetCommitter
+
+
+class FakeConsumer:
+    def __init__(self, *partitions: TopicPartition) -> None:
+        self.partitions = set(partitions)
+        self.commits: list[dict[TopicPartition, int]] = []
+
+    def assignment(self) -> set[TopicPartition]:
+        return self.partitions
+
+    async def commit(self, offsets: dict[TopicPartition, int]) -> None:
+        self.commits.append(offsets)
+
+
+def _message(consumer: FakeConsumer, partition: int, offset: int) -> SimpleNamespace:
+    record = SimpleNamespace(topic="tasks", partition=partition, offset=offset)
+    return SimpleNamespace(consumer=consumer, raw_message=record, committed=None)
+
+
+def test_offsets_are_committed_in_batches():
+    first, second = TopicPartition("tasks", 0), TopicPartition("tasks", 1)
+    consumer = FakeConsumer(first, second)
+    committer = OffsetCommitter("test", batch_size=3, interval_sec=60)
+
+    async def main() -> None:
+        await committer.processed(_message(consumer, 0, 10))
+        await committer.processed(_message(consumer, 1, 5))
+        assert consumer.commits == []
+        await committer.processed(_message(consumer, 0, 11))
+
+    asyncio.run(main())
+    assert consumer.commits == [{first: 12, second: 6}]
+    exposition = metrics.render_prometheus()
+    assert 'async_bg_offsets_uncommitted{subscriber="test"} 0' in exposition
+    assert 'async_bg_offset_commit_sec_count{subscriber="test"}' in exposition
+    assert 'async_bg_offset_commits_total{subscriber="test"}' in exposition
+
+
+def test_offsets_are_committed_after_interval():
+    partition = TopicPartition("tasks", 0)
+    consumer = FakeConsumer(partition)
+    committer = OffsetCommitter("test", batch_size=100, interval_sec=0.05)
+
+    async def main() -> None:
+        message = _message(consumer, 0, 7)
+        await committer.processed(message)
+        # FastStream does not commit the message itself
+        assert message.committed is not None
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert consumer.commits == [{partition: 8}]
+
+
+def test_offsets_are_flushed_on_revocation_and_close():
+    kept, revoked = TopicPartition("tasks", 0), TopicPartition("tasks", 1)
+    consumer = FakeConsumer(kept, revoked)
+    committer = OffsetCommitter("test", batch_size=100, interval_sec=60)
+    listener = CommitOnRevokeListener(committer)
+
+    async def main() -> None:
+        await committer.processed(_message(consumer, 1, 3))
+        await listener.on_partitions_revoked({revoked})
+        consumer.partitions = {kept}
+        # Offsets of a partition revoked meanwhile are left to its new owner
+        await committer.processed(_message(consumer, 1, 4))
+        await committer.processed(_message(consumer, 0, 1))
+        await committer.close()
+        await committer.processed(_message(consumer, 0, 2))
+
+    asyncio.run(main())
+    assert consumer.commits == [{revoked: 4}, {kept: 2}, {kept: 3}]
+
+
+def test_held_record_caps_the_committed_offset():
+    partition = TopicPartition("tasks", 0)
+    consumer = FakeConsumer(partition)
+    committer = OffsetCommitter("test", batch_size=1, interval_sec=60)
+
+    async def main() -> None:
+        held = _message(consumer, 0, 5)
+        committer.hold(held.raw_message)
+        await committer.processed(held)
+        await committer.processed(_message(consumer, 0, 6))
+        # The messages after the held one are committed once it is released
+        await committer.release(held.raw_message)
+
+    asyncio.run(main())
+    assert consumer.commits == [{partition: 5}, {partition: 5}, {partition: 7}]
@@ -0,0 +1,139 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from django.core.management import call_command
+from django.db import transaction
+
+import pytest
+from demo.schemas import DemoPayload
+
+from bazis.contrib.async_background import producer
+from bazis.contrib.async_background.models import OutboxTask
+from bazis.contrib.async_background.outbox import enqueue_task_outbox
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.storage import task_storage
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+CHANNEL_NAME = "outbox-test-channel"
+
+
+class FakeProducer:
+    """Stands in for the Kafka producer: records the sent tasks, fails or 'processes' some of them."""
+
+    def __init__(self, failing: set[str] = frozenset(), completed: set[str] = frozenset()) -> None:
+        self.failing = failing
+        self.completed = completed
+        self.sent: list[str] = []
+
+    async def send_one_message(self, message: dict, partition_marker=None, headers=None) -> None:
+        task_id = message["task_id"]
+        if task_id in self.failing:
+            raise RuntimeError("broker unavailable")
+        self.sent.append(task_id)
+        if task_id in self.completed:
+            # A consumer finishing the task before the relay has marked it PENDING
+            set_and_publish_status(task_id, CHANNEL_NAME, TaskStatus.COMPLETED, response={"ok": True})
+
+
+@pytest.fixture
+def fake_producer(monkeypatch):
+    def install(**kwargs) -> FakeProducer:
+        fake = FakeProducer(**kwargs)
+        monkeypatch.setattr(producer, "_get_kafka_producer", lambda topic_name: fake)
+        return fake
+
+    return install
+
+
+def _enqueue(message: str) -> str:
+    task = enqueue_task_outbox(
+        topic_name="outbox-test", channel_name=CHANNEL_NAME, payload=DemoPayload(message=message)
+    )
+    return task.task_id
+
+
+def _status(task_id: str) -> str | None:
+    raw_record = task_storage.for_task(task_id).get(task_id)
+    return json.loads(raw_record)["status"] if raw_record else None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_outbox_enqueue_in_transaction_then_relay(fake_producer):
+    fake = fake_producer()
+    with transaction.atomic():
+        task_id = _enqueue("relayed")
+        assert _status(task_id) is None  # written on commit
+    assert _status(task_id) == TaskStatus.CREATED.value
+    assert OutboxTask.objects.get(task_id=task_id).task_type == "demo.schemas.DemoPayload"
+
+    call_command("kafka_outbox_relay", "--once")
+
+    assert fake.sent == [task_id]
+    assert not OutboxTask.objects.filter(task_id=task_id).exists()
+    assert _status(task_id) == TaskStatus.PENDING.value
+    # The relay runs outside of any task context: the type comes from the outbox row
+    raw_record = task_storage.for_task(task_id).get(task_id)
+    assert json.loads(raw_record)["task_type"] == "demo.schemas.DemoPayload"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_outbox_relay_does_not_overwrite_started_task(fake_producer):
+    with transaction.atomic():
+        task_id = _enqueue("finished fast")
+    fake = fake_producer(completed={task_id})
+
+    call_command("kafka_outbox_relay", "--once")
+
+    assert fake.sent == [task_id]
+    assert _status(task_id) == TaskStatus.COMPLETED.value
+
+
+@pytest.mark.django_db(transaction=True)
+def test_outbox_rollback_leaves_nothing(fake_producer):
+    fake = fake_producer()
+    with pytest.raises(RuntimeError), transaction.atomic():
+        task_id = _enqueue("rolled back")
+        raise RuntimeError("request failed")
+
+    assert not OutboxTask.objects.filter(task_id=task_id).exists()
+    assert _status(task_id) is None
+    call_command("kafka_outbox_relay", "--once")
+    assert fake.sent == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_outbox_partial_publish_failure(fake_producer):
+    with transaction.atomic():
+        task_ids = [_enqueue(f"task {index}") for index in range(3)]
+    fake = fake_producer(failing={task_ids[1]})
+
+    call_command("kafka_outbox_relay", "--once")
+
+    assert fake.sent == [task_ids[0], task_ids[2]]
+    assert list(OutboxTask.objects.values_list("task_id", flat=True)) == [task_ids[1]]
+    assert [_status(task_id) for task_id in task_ids] == [
+        TaskStatus.PENDING.value,
+        TaskStatus.CREATED.value,
+        TaskStatus.PENDING.value,
+    ]
+
+    # The failed task is published by the next batch
+    fake.failing = set()
+    call_command("kafka_outbox_relay", "--once")
+    assert fake.sent[-1] == task_ids[1]
+    assert not OutboxTask.objects.exists()
+    assert _status(task_ids[1]) == TaskStatus.PENDING.value
@@ -0,0 +1,37 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from bazis.contrib.async_background.partitioning import HotKeyPartitioner, StickyPartitioner
+
+
+def test_sticky_partitioner_switches_partition_per_batch():
+    partitioner = StickyPartitioner(batch_size=2)
+    partitions = [0, 1, 2]
+
+    assigned = [partitioner.assign(None, partitions).partition for _ in range(6)]
+
+    assert assigned == [0, 0, 1, 1, 2, 2]
+    assert partitioner.assign("channel", partitions).key == b"channel"
+
+
+def test_hot_key_partitioner_salts_only_hot_markers():
+    partitioner = HotKeyPartitioner(batch_size=10, threshold=2, window_sec=60, salts=3)
+    partitions = [0, 1]
+
+    keys = [partitioner.assign("noisy", partitions).key for _ in range(5)]
+
+    assert keys[:2] == [b"noisy", b"noisy"]
+    assert set(keys[2:]) == {b"noisy#0", b"noisy#1", b"noisy#2"}
+    assert partitioner.hot_keys() == {"noisy"}
+    assert partitioner.assign("quiet", partitions).key == b"quiet"
@@ -0,0 +1,109 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from django.core.management.base import CommandError
+
+import pytest
+
+from bazis.contrib.async_background import profiling
+from bazis.contrib.async_background.management.commands.kafka_consumer_profile import (
+    consumer_process,
+)
+from bazis.contrib.async_background.profiling import PROFILE_SIGNAL, SamplingProfiler
+
+
+def spin(duration_sec: float) -> None:
+    started = time.monotonic()
+    while time.monotonic() - started < duration_sec:
+        pass
+
+
+async def slow_handler() -> None:
+    for _ in range(10):
+        spin(0.03)
+        await asyncio.sleep(0.01)
+
+
+async def idle_handler() -> None:
+    await asyncio.sleep(30)
+
+
+def test_profile_captures_hotspots_and_task_stacks(tmp_path):
+    async def main() -> None:
+        idle = asyncio.ensure_future(idle_handler())
+        profiler = SamplingProfiler(asyncio.get_running_loop(), 0.5, 0.005, str(tmp_path))
+        profiler.start()
+        await slow_handler()
+        await asyncio.to_thread(profiler.join)
+        idle.cancel()
+
+    asyncio.run(main())
+
+    cpu_profile = next(tmp_path.glob("consumer-*.cpu.collapsed")).read_text().splitlines()
+    tasks_profile = next(tmp_path.glob("consumer-*.tasks.collapsed")).read_text().splitlines()
+    assert any(line.split(" ")[0].endswith(f"{__name__}:slow_handler;{__name__}:spin") for line in cpu_profile)
+    assert any(line.startswith(f"{__name__}:idle_handler;asyncio.tasks:sleep ") for line in tasks_profile)
+
+
+def test_profile_signal_before_and_after_the_loop_starts(monkeypatch):
+    profiled = []
+    monkeypatch.setattr(profiling, "start_profiling", profiled.append)
+    monkeypatch.setattr(profiling, "_profiled_loop", None)
+    previous_handler = signal.getsignal(PROFILE_SIGNAL)
+    profiling.install_profile_signal()
+    try:
+        # The consumer is still bootstrapping: the signal is ignored instead of terminating it
+        os.kill(os.getpid(), PROFILE_SIGNAL)
+
+        async def main() -> None:
+            profiling.profile_running_loop()
+            os.kill(os.getpid(), PROFILE_SIGNAL)
+            for _ in range(100):
+                if profiled:
+                    break
+                await asyncio.sleep(0.01)
+
+        asyncio.run(main())
+    finally:
+        signal.signal(PROFILE_SIGNAL, previous_handler)
+    assert len(profiled) == 1
+
+
+def test_profile_command_signals_only_consumers():
+    consumer = subprocess.Popen(
+        [sys.executable, "-c", "import time; print(flush=True); time.sleep(30)", "kafka_consumer_single"],
+        stdout=subprocess.PIPE,
+    )
+    try:
+        consumer.stdout.readline()  # started
+        assert consumer_process(consumer.pid, supervised=False).pid == consumer.pid
+        # Started by the tests, not by kafka_consumer_multiple
+        with pytest.raises(CommandError, match="not a consumer of kafka_consumer_multiple"):
+            consumer_process(consumer.pid, supervised=True)
+    finally:
+        consumer.kill()
+        consumer.wait()
+        consumer.stdout.close()
+    # A stale PID, or one reused by another process
+    with pytest.raises(CommandError, match="No consumer process"):
+        consumer_process(consumer.pid, supervised=False)
+    with pytest.raises(CommandError, match="is not a consumer"):
+        consumer_process(os.getpid(), supervised=False)
@@ -0,0 +1,53 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from types import SimpleNamespace
+
+import psutil
+
+from bazis.contrib.async_background.recycling import ChildResources, RecyclePolicy, ResourceSample
+
+
+def _resources(baseline_mb: float | None, last_mb: float, elapsed_sec: float) -> SimpleNamespace:
+    baseline = None if baseline_mb is None else ResourceSample(1000.0, baseline_mb, 0.0)
+    return SimpleNamespace(baseline=baseline, last=ResourceSample(1000.0 + elapsed_sec, last_mb, 0.0))
+
+
+def test_child_resources_are_sampled():
+    child = ChildResources(psutil.Process(os.getpid()), warmup_sec=0)
+
+    sample = child.sample()
+
+    assert sample is not None and sample.rss_mb > 0
+    assert child.baseline == sample == child.last
+
+
+def test_policy_recycles_above_rss_ceiling():
+    policy = RecyclePolicy(max_rss_mb=500)
+
+    assert policy.reason(_resources(None, 400, 0)) is None
+    assert "exceeds 500MB" in policy.reason(_resources(None, 600, 0))
+
+
+def test_policy_recycles_on_growth_after_window():
+    policy = RecyclePolicy(max_growth_mb_per_hour=100, growth_window_sec=600)
+
+    # Still in the warm-up or the window is too short to judge
+    assert policy.reason(_resources(None, 900, 3600)) is None
+    assert policy.reason(_resources(200, 260, 300)) is None
+    # 50MB in 1h, then 200MB in 1h
+    assert policy.reason(_resources(200, 250, 3600)) is None
+    assert "200MB/h" in policy.reason(_resources(200, 400, 3600))
+    assert not RecyclePolicy().enabled
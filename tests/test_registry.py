@@ -0,0 +1,60 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gc
+import weakref
+
+from bazis.contrib.async_background.registry import LoopClientRegistry
+
+
+def test_clients_are_isolated_per_loop():
+    registry = LoopClientRegistry()
+
+    async def client_pair() -> tuple[object, object]:
+        return registry.get("client", object), registry.get("client", object)
+
+    first, same = asyncio.run(client_pair())
+    other, _ = asyncio.run(client_pair())
+
+    assert first is same
+    assert other is not first
+
+
+def test_clients_are_closed_with_their_loop():
+    registry = LoopClientRegistry()
+    closed: list[object] = []
+
+    async def close(client: object) -> None:
+        closed.append(client)
+
+    loop = asyncio.new_event_loop()
+    client = registry.get("client", object, closer=close, loop=loop)
+    loop.close()
+
+    assert closed == [client]
+    assert registry._clients(loop) is None
+
+
+def test_dropped_loop_is_not_kept_alive_by_its_clients():
+    registry = LoopClientRegistry()
+    loop = asyncio.new_event_loop()
+    # A future refers to its loop, as connections and brokers do
+    registry.get("start", loop.create_future, loop=loop)
+    loop_ref = weakref.ref(loop)
+
+    del loop
+    gc.collect()
+
+    assert loop_ref() is None
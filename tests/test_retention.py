@@ -0,0 +1,31 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from bazis.contrib.async_background.retention import record_hold_sec, unread_hold_sec
+from bazis.contrib.async_background.schemas import TaskStatus
+
+
+def test_record_hold_sec_by_status_size_and_reader(settings):
+    settings.KAFKA_RESPONSE_HOLD_SEC = 86400
+    settings.KAFKA_STATUS_HOLD_SEC = {"created": 600}
+    settings.KAFKA_LARGE_RECORD_BYTES = 1000
+    settings.KAFKA_LARGE_RECORD_HOLD_SEC = 3600
+    settings.KAFKA_UNREAD_HOLD_SEC = 300
+
+    assert record_hold_sec(TaskStatus.CREATED, 100) == 600
+    assert record_hold_sec(TaskStatus.COMPLETED, 100) == 86400
+    assert record_hold_sec(TaskStatus.COMPLETED, 5000) == 3600
+    assert unread_hold_sec(TaskStatus.FAILED, 86400) == 300
+    assert unread_hold_sec(TaskStatus.PENDING, 86400) is None
+    assert unread_hold_sec(TaskStatus.FAILED, 60) is None
@@ -0,0 +1,91 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from bazis.contrib.async_background.scheduling import (
+    ChannelRateLimiter,
+    FairScheduler,
+    ThrottledTasks,
+)
+
+
+def test_fair_scheduler_round_robins_channels():
+    started: list[str] = []
+
+    def job(label: str):
+        async def _run() -> None:
+            started.append(label)
+
+        return _run
+
+    jobs = [("noisy", job(f"noisy-{i}")) for i in range(4)] + [("quiet", job("quiet-0"))]
+    asyncio.run(FairScheduler(concurrency=1).run(jobs))
+
+    assert started == ["noisy-0", "quiet-0", "noisy-1", "noisy-2", "noisy-3"]
+
+
+def test_channel_rate_limiter_throttles_only_the_burst_channel():
+    limiter = ChannelRateLimiter(rate=1, burst=2)
+
+    assert limiter.delay("noisy") == 0
+    assert limiter.delay("noisy") == 0
+    assert limiter.delay("noisy") > 0
+    assert limiter.delay("quiet") == 0
+
+
+def test_throttled_tasks_do_not_hold_up_other_channels():
+    started: list[str] = []
+    events: list[str] = []
+
+    def job(label: str):
+        async def _run() -> None:
+            started.append(label)
+
+        return _run
+
+    async def main() -> None:
+        throttled = ThrottledTasks(ChannelRateLimiter(rate=20, burst=1), max_deferred=10)
+        await throttled.submit("noisy", job("noisy-0"))
+        await throttled.submit(
+            "noisy",
+            job("noisy-1"),
+            hold=lambda: events.append("hold"),
+            release=lambda: asyncio.sleep(0, events.append("release")),
+        )
+        await throttled.submit("quiet", job("quiet-0"))
+        assert throttled.deferred() == 1
+        assert events == ["hold"]
+        await asyncio.sleep(0.1)
+        assert throttled.deferred() == 0
+
+    asyncio.run(main())
+    assert started == ["noisy-0", "quiet-0", "noisy-1"]
+    assert events == ["hold", "release"]
+
+
+def test_fair_scheduler_returns_jobs_of_throttled_channels():
+    started: list[str] = []
+
+    def job(label: str):
+        async def _run() -> None:
+            started.append(label)
+
+        return _run
+
+    jobs = [("noisy", job(f"noisy-{i}")) for i in range(3)] + [("quiet", job("quiet-0"))]
+    left = asyncio.run(FairScheduler(concurrency=2, rate_limiter=ChannelRateLimiter(rate=1, burst=1)).run(jobs))
+
+    assert sorted(started) == ["noisy-0", "quiet-0"]
+    assert [channel_name for channel_name, _ in left] == ["noisy", "noisy"]
@@ -0,0 +1,61 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+SAMPLE_DIR = Path(__file__).resolve().parents[1] / "sample"
+
+#: bootstraps a consumer of the sample project without consuming and prints the imported modules
+_BOOTSTRAP_SCRIPT = """
+import io
+import os
+import sys
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sample.settings")
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+
+call_command("kafka_consumer_single", "--profile-startup", *sys.argv[1:], stdout=io.StringIO())
+print("\\n".join(sys.modules))
+"""
+
+#: modules of the API application the slim bootstrap defers
+DEFERRED_MODULES = {"bazis.core.app", "bazis.core.router"}
+
+
+def _modules_after_bootstrap(*args: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", _BOOTSTRAP_SCRIPT, *args],
+        cwd=SAMPLE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.splitlines())
+
+
+def test_slim_consumer_bootstrap_defers_the_api_application():
+    # The default bootstrap is the baseline: the deferred modules are imported by it, not before it
+    full = _modules_after_bootstrap()
+    slim = _modules_after_bootstrap("--slim-bootstrap")
+
+    assert "demo.tasks" in slim
+    assert DEFERRED_MODULES <= full - slim, f"Imported by the slim bootstrap: {DEFERRED_MODULES & slim}"
@@ -0,0 +1,36 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from bazis.contrib.async_background import utils
+from bazis.contrib.async_background.storage import HashRing, task_storage
+
+
+def test_hash_ring_moves_few_keys_when_a_node_is_added():
+    keys = [f"task-{i}" for i in range(2000)]
+    ring = HashRing(["redis://a", "redis://b", "redis://c"])
+    grown = HashRing(["redis://a", "redis://b", "redis://c", "redis://d"])
+
+    before = {key: ring.node_for(key) for key in keys}
+    moved = [key for key in keys if grown.node_for(key) != before[key]]
+
+    assert {*before.values()} == {"redis://a", "redis://b", "redis://c"}
+    assert all(grown.node_for(key) == "redis://d" for key in moved)
+    assert len(moved) < len(keys) / 3
+
+
+def test_deprecated_redis_client_is_the_first_node():
+    with pytest.deprecated_call():
+        assert utils.redis is task_storage.nodes()[0]
@@ -0,0 +1,54 @@
+# Copyright 2026 EcoFuture Technology Services LLC and contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from uuid import uuid4
+
+from bazis.contrib.async_background import streams
+from bazis.contrib.async_background.schemas import TaskStatus
+from bazis.contrib.async_background.streams import append_result_chunk, iter_result_chunks
+from bazis.contrib.async_background.utils import set_and_publish_status
+
+
+async def _collect(task_id: str, last_id: str = "0") -> list[dict]:
+    return [entry async for entry in iter_result_chunks(task_id, last_id)]
+
+
+def test_result_stream_drains_finished_task(monkeypatch):
+    monkeypatch.setattr(streams, "READ_COUNT", 2)
+    task_id = str(uuid4())
+    for part in range(5):
+        append_result_chunk(task_id, {"part": part})
+    set_and_publish_status(task_id, "stream-test", TaskStatus.COMPLETED)
+
+    entries = asyncio.run(_collect(task_id))
+    assert [entry["data"] for entry in entries] == [{"part": part} for part in range(5)]
+    assert asyncio.run(_collect(task_id, entries[2]["id"]))[0]["data"] == {"part": 3}
+
+
+def test_result_stream_reads_chunks_appended_before_completion(monkeypatch):
+    task_id = str(uuid4())
+    set_and_publish_status(task_id, "stream-test", TaskStatus.PROCESSING)
+    append_result_chunk(task_id, {"part": 0})
+    is_finished = streams._is_finished
+
+    async def finish_after_empty_read(task_id: str) -> bool:
+        # The handler appends its last chunk and completes between an empty read and the check
+        append_result_chunk(task_id, {"part": 1})
+        set_and_publish_status(task_id, "stream-test", TaskStatus.COMPLETED)
+        return await is_finished(task_id)
+
+    monkeypatch.setattr(streams, "_is_finished", finish_after_empty_read)
+    entries = asyncio.run(_collect(task_id))
+    assert [entry["data"] for entry in entries] == [{"part": 0}, {"part": 1}]